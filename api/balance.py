@@ -0,0 +1,232 @@
+import asyncio
+from typing import Any, Optional
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from loguru import logger
+from redis.asyncio import Redis
+from web3 import AsyncWeb3
+from web3.exceptions import Web3RPCError
+
+from config import settings
+from core.block.balance import get_balance_by_block
+from core.block.head import check_block_not_past_head, get_tracked_head
+from core.block.limiter import upstream_slot
+from core.block.timestamps import get_block_by_timestamp
+from core.block.web3 import get_web3_clients
+from core.cache.http import is_finalized
+from core.cache.redis import get_redis_client
+from core.cache.disk import set_disk_cache
+from core.cache.utils import (
+    build_balance_cache_key,
+    cache_rpc_error,
+    get_cache_with_error,
+    get_disk_backed_cache,
+    set_many_cache,
+)
+from core.exceptions.block import BlockPastHead
+from core.exceptions.limiter import UpstreamOverloaded
+from core.exceptions.request import DeadlineExceeded
+from core.exceptions.timestamps import BlockTimestampNotFound
+from core.request import cancel_on_disconnect
+from schemas.balance import (
+    BalanceResponse,
+    ChainBalance,
+    MultiChainBalanceRequest,
+    MultiChainBalanceResponse,
+)
+
+router = APIRouter(
+    prefix="/balance",
+    tags=["balance"],
+)
+
+
+def _multichain_params(
+    address: str,
+    block: list[str] = Query(
+        default=[], description="chain_id:block_number, latest block otherwise"
+    ),
+    at_timestamp: Optional[int] = None,
+) -> MultiChainBalanceRequest:
+    return MultiChainBalanceRequest(
+        address=address, blocks=block, at_timestamp=at_timestamp
+    )
+
+
+async def _resolve_block(
+    cache: Redis,
+    chain_id: int,
+    web3: AsyncWeb3,
+    block_number: Optional[int],
+    at_timestamp: Optional[int],
+) -> int:
+    if block_number is not None:
+        return block_number
+
+    if at_timestamp is not None:
+        resolved: Optional[int] = await get_block_by_timestamp(
+            web3=web3, cache=cache, chain_id=chain_id, timestamp=at_timestamp
+        )
+        if resolved is None:
+            raise BlockTimestampNotFound(
+                f"No block at or before timestamp {at_timestamp}"
+            )
+        return resolved
+
+    head: Optional[int] = get_tracked_head(chain_id=chain_id)
+    if head is not None:
+        return head
+
+    async with upstream_slot(chain_id=chain_id, method="eth_blockNumber"):
+        return await web3.eth.get_block_number()
+
+
+async def _chain_balance(
+    cache: Redis,
+    chain_id: int,
+    web3: AsyncWeb3,
+    address: str,
+    block_number: Optional[int],
+    at_timestamp: Optional[int],
+    fresh: dict[str, bytes],
+) -> ChainBalance:
+    if block_number is not None:
+        check_block_not_past_head(chain_id=chain_id, block_number=block_number)
+
+    block_number = await _resolve_block(
+        cache=cache,
+        chain_id=chain_id,
+        web3=web3,
+        block_number=block_number,
+        at_timestamp=at_timestamp,
+    )
+    cache_key: str = build_balance_cache_key(
+        chain_id=chain_id, address=address, block_number=block_number
+    )
+
+    cached: Optional[bytes | str] = None
+    cached_error: Optional[dict[str, Any]] = None
+    try:
+        cached, cached_error = await get_cache_with_error(client=cache, key=cache_key)
+    except Exception as e:
+        logger.warning(f"Cache get failed for {cache_key}: {e}")
+
+    if cached_error:
+        return ChainBalance(
+            chain_id=chain_id, block_number=block_number, error=cached_error["detail"]
+        )
+
+    finalized: bool = is_finalized(chain_id=chain_id, block_number=block_number)
+    if not cached and finalized:
+        cached = await get_disk_backed_cache(client=cache, key=cache_key)
+
+    if cached:
+        balance: int = orjson.loads(cached)["balance"]
+        return ChainBalance(
+            chain_id=chain_id, block_number=block_number, balance=balance
+        )
+
+    try:
+        async with upstream_slot(chain_id=chain_id, method="eth_getBalance"):
+            balance = await get_balance_by_block(
+                web3=web3, address=address, block_number=block_number
+            )
+    except Web3RPCError as e:
+        # Same negative cache entry as /block/{block_number}/balance/
+        await cache_rpc_error(
+            client=cache,
+            key=cache_key,
+            error=e,
+            status_code=status.HTTP_502_BAD_GATEWAY,
+        )
+        raise
+
+    fresh[cache_key] = orjson.dumps(
+        BalanceResponse(address=address, balance=balance).model_dump()
+    )
+    if finalized:
+        await set_disk_cache({cache_key: fresh[cache_key]})
+    return ChainBalance(chain_id=chain_id, block_number=block_number, balance=balance)
+
+
+async def _chain_balance_or_error(chain_id: int, **kwargs: Any) -> ChainBalance:
+    try:
+        async with asyncio.timeout(settings.fanout_chain_timeout):
+            return await _chain_balance(chain_id=chain_id, **kwargs)
+    except TimeoutError:
+        error = f"Timed out after {settings.fanout_chain_timeout}s"
+    except Web3RPCError as e:
+        error = e.message
+    except (
+        UpstreamOverloaded,
+        BlockTimestampNotFound,
+        BlockPastHead,
+        DeadlineExceeded,
+    ) as e:
+        error = e.message
+    except Exception as e:
+        # Transport errors (connection refused, HTTP 429/5xx) must not fail other chains
+        error = str(e) or type(e).__name__
+
+    logger.warning(f"Balance on chain {chain_id} failed: {error}")
+    return ChainBalance(chain_id=chain_id, error=error)
+
+
+async def _fan_out(
+    cache: Redis, clients: dict[int, AsyncWeb3], params: MultiChainBalanceRequest
+) -> list[ChainBalance]:
+    fresh: dict[str, bytes] = {}
+
+    balances: list[ChainBalance] = await asyncio.gather(
+        *(
+            _chain_balance_or_error(
+                chain_id=chain_id,
+                cache=cache,
+                web3=web3,
+                address=params.address,
+                block_number=params.blocks.get(chain_id),
+                at_timestamp=params.at_timestamp,
+                fresh=fresh,
+            )
+            for chain_id, web3 in sorted(clients.items())
+        )
+    )
+
+    if fresh:
+        try:
+            await set_many_cache(client=cache, values=fresh, ttl=settings.cache_ttl)
+        except Exception as e:
+            logger.warning(f"Cache set failed for {list(fresh)}: {e}")
+
+    return balances
+
+
+@router.get("/{address}/", response_model=MultiChainBalanceResponse)
+async def balance_across_chains(
+    request: Request,
+    params: MultiChainBalanceRequest = Depends(_multichain_params),
+    cache: Redis = Depends(get_redis_client),
+):
+    """
+    Get native balance in WEI on every configured chain concurrently.
+    Chains failing or exceeding the per-chain timeout return an error instead of a balance
+    """
+    clients: dict[int, AsyncWeb3] = get_web3_clients()
+    unsupported = sorted(set(params.blocks) - set(clients))
+    if unsupported:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Chain ID {unsupported[0]} is not supported",
+        )
+
+    balances: list[ChainBalance] = await cancel_on_disconnect(
+        request=request,
+        work=_fan_out(cache=cache, clients=clients, params=params),
+        # Balances at the head are stale in seconds, not worth finishing
+        keep=all(
+            is_finalized(chain_id=chain_id, block_number=params.blocks.get(chain_id))
+            for chain_id in clients
+        ),
+    )
+    return MultiChainBalanceResponse(address=params.address, balances=balances)
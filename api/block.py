@@ -1,7 +1,7 @@
 from typing import Any, Optional
 
 import orjson
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Path, Request, status
 from loguru import logger
 from redis.asyncio import Redis
 from web3 import AsyncWeb3
@@ -9,10 +9,37 @@ from web3.exceptions import Web3RPCError
 
 from config import settings
 from core.block.balance import get_balance_by_block
-from core.block.web3 import get_web3_client
+from core.block.head import check_block_not_past_head
+from core.block.limiter import upstream_slot
+from core.block.timestamps import get_block_by_timestamp
+from core.block.tokens import get_token_balances_by_block
+from core.block.web3 import DEFAULT_CHAIN_ID, get_web3_client
+from core.cache.http import build_cache_control, cached_json_response, is_finalized
+from core.cache.disk import get_many_disk_cache, set_disk_cache
 from core.cache.redis import get_redis_client
-from core.cache.utils import build_get_query_cache_key, get_cache, set_cache
-from schemas.balance import BalanceRequest, BalanceResponse
+from core.cache.utils import (
+    build_balance_cache_key,
+    build_token_balance_cache_key,
+    build_token_balances_cache_key,
+    cache_rpc_error,
+    get_cache_with_error,
+    get_disk_backed_cache,
+    get_many_cache,
+    set_cache,
+    set_many_cache,
+)
+from core.exceptions.block import BlockPastHead
+from core.exceptions.timestamps import BlockTimestampNotFound
+from core.request import cancel_on_disconnect
+from schemas.balance import (
+    BalanceRequest,
+    BalanceResponse,
+    TimestampBalanceRequest,
+    TimestampBalanceResponse,
+    TokenBalance,
+    TokenBalancesRequest,
+    TokenBalancesResponse,
+)
 
 router = APIRouter(
     prefix="/block",
@@ -20,6 +47,94 @@ router = APIRouter(
 )
 
 
+async def _balance_at_block(
+    cache: Redis, chain_id: int, address: str, block_number: int
+) -> bytes | str:
+    """
+    Serialized BalanceResponse, from cache when possible
+    """
+    try:
+        check_block_not_past_head(chain_id=chain_id, block_number=block_number)
+    except BlockPastHead as e:
+        logger.warning(f"Rejected balance request: {e.message}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+
+    cache_key: str = build_balance_cache_key(
+        chain_id=chain_id, address=address, block_number=block_number
+    )
+
+    cached: Optional[str] = None
+    cached_error: Optional[dict[str, Any]] = None
+    try:
+        cached, cached_error = await get_cache_with_error(client=cache, key=cache_key)
+    except Exception as e:
+        logger.warning(f"Cache get failed for {cache_key}: {e}")
+
+    if cached:
+        logger.info(f"Cache HIT for {address} at block {block_number}")
+        return cached
+
+    if cached_error:
+        logger.info(f"Negative cache HIT for {address} at block {block_number}")
+        raise HTTPException(
+            status_code=cached_error["status_code"], detail=cached_error["detail"]
+        )
+
+    finalized: bool = is_finalized(chain_id=chain_id, block_number=block_number)
+    if finalized:
+        stored: Optional[bytes] = await get_disk_backed_cache(
+            client=cache, key=cache_key
+        )
+        if stored:
+            logger.info(f"Disk cache HIT for {address} at block {block_number}")
+            return stored
+
+    try:
+        web3: AsyncWeb3 = get_web3_client(chain_id=chain_id)
+    except ValueError as e:
+        msg = str(e)
+        logger.error(f"Failed to get web3 client: {msg}")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=msg)
+
+    try:
+        async with upstream_slot(chain_id=chain_id, method="eth_getBalance"):
+            result = await get_balance_by_block(
+                web3=web3, address=address, block_number=block_number
+            )
+    except Web3RPCError as e:
+        msg = e.message
+        logger.error(f"Rpc error occured: {msg}")
+        await cache_rpc_error(
+            client=cache,
+            key=cache_key,
+            error=e,
+            status_code=status.HTTP_502_BAD_GATEWAY,
+        )
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=msg)
+
+    logger.info(f"Block: {block_number} | address: {address}: {result}")
+
+    payload: bytes = orjson.dumps(
+        BalanceResponse(address=address, balance=result).model_dump()
+    )
+
+    try:
+        await set_cache(
+            client=cache,
+            key=cache_key,
+            value=payload,
+            ttl=settings.cache_ttl,
+        )
+        logger.debug(f"Cached balance for {address} at block {block_number}")
+    except Exception as e:
+        logger.warning(f"Cache set failed for {cache_key}: {e}")
+
+    if finalized:
+        await set_disk_cache({cache_key: payload})
+
+    return payload
+
+
 @router.get("/{block_number}/balance/{address}/", response_model=BalanceResponse)
 async def balance_by_block(
     request: Request,
@@ -29,53 +144,227 @@ async def balance_by_block(
     """
     Get native balance in WEI in specified block
     """
-    cache_key: str = build_get_query_cache_key(
-        prefix="balance_by_block", url=request.url
+    chain_id: int = params.chain_id or DEFAULT_CHAIN_ID
+    payload: bytes | str = await cancel_on_disconnect(
+        request=request,
+        work=_balance_at_block(
+            cache=cache,
+            chain_id=chain_id,
+            address=params.address,
+            block_number=params.block_number,
+        ),
+        keep=is_finalized(chain_id=chain_id, block_number=params.block_number),
+    )
+    return cached_json_response(
+        request=request,
+        payload=payload,
+        cache_control=build_cache_control(
+            chain_id=chain_id, block_number=params.block_number
+        ),
     )
 
+
+@router.get("/balance/{address}/", response_model=TimestampBalanceResponse)
+async def balance_at_timestamp(
+    request: Request,
+    params: TimestampBalanceRequest = Depends(),
+    cache: Redis = Depends(get_redis_client),
+):
+    """
+    Get native balance in WEI in the last block at or before `at_timestamp` (unix seconds)
+    """
+    chain_id: int = params.chain_id or DEFAULT_CHAIN_ID
+
     try:
-        cached: Optional[str] = await get_cache(client=cache, key=cache_key)
-        if cached:
-            logger.info(
-                f"Cache HIT for {params.address} at block {params.block_number}"
-            )
-            return orjson.loads(cached)
-    except Exception as e:
-        logger.warning(f"Cache get failed for {cache_key}: {e}")
+        web3: AsyncWeb3 = get_web3_client(chain_id=chain_id)
+    except ValueError as e:
+        msg = str(e)
+        logger.error(f"Failed to get web3 client: {msg}")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=msg)
 
     try:
-        web3: AsyncWeb3 = get_web3_client(chain_id=params.chain_id)
+        block_number: Optional[int] = await get_block_by_timestamp(
+            web3=web3, cache=cache, chain_id=chain_id, timestamp=params.at_timestamp
+        )
+    except (Web3RPCError, BlockTimestampNotFound) as e:
+        msg = e.message
+        logger.error(f"Timestamp resolution failed: {msg}")
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=msg)
+
+    if block_number is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No block at or before timestamp {params.at_timestamp}",
+        )
+
+    response: dict[str, Any] = orjson.loads(
+        await cancel_on_disconnect(
+            request=request,
+            work=_balance_at_block(
+                cache=cache,
+                chain_id=chain_id,
+                address=params.address,
+                block_number=block_number,
+            ),
+            keep=is_finalized(chain_id=chain_id, block_number=block_number),
+        )
+    )
+    return cached_json_response(
+        request=request,
+        payload=orjson.dumps({**response, "block_number": block_number}),
+        cache_control=build_cache_control(chain_id=chain_id, block_number=block_number),
+    )
+
+
+async def _fetch_token_balances(
+    cache: Redis,
+    chain_id: int,
+    pairs: list[tuple[str, str]],
+    block_number: int,
+    error_key: str,
+) -> list[Optional[int]]:
+    try:
+        web3: AsyncWeb3 = get_web3_client(chain_id=chain_id)
     except ValueError as e:
         msg = str(e)
         logger.error(f"Failed to get web3 client: {msg}")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=msg)
 
     try:
-        result = await get_balance_by_block(
-            web3=web3, address=params.address, block_number=params.block_number
+        # Limiter slots are taken per eth_call inside
+        fetched: list[Optional[int]] = await get_token_balances_by_block(
+            web3=web3, pairs=pairs, block_number=block_number
         )
     except Web3RPCError as e:
         msg = e.message
         logger.error(f"Rpc error occured: {msg}")
+        await cache_rpc_error(
+            client=cache,
+            key=error_key,
+            error=e,
+            status_code=status.HTTP_502_BAD_GATEWAY,
+        )
         raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=msg)
 
-    logger.info(f"Block: {params.block_number} | address: {params.address}: {result}")
+    values: dict[str, bytes] = {
+        build_token_balance_cache_key(
+            chain_id=chain_id, token=token, holder=holder, block_number=block_number
+        ): str(balance).encode()
+        for (token, holder), balance in zip(pairs, fetched)
+        if balance is not None
+    }
+    try:
+        await set_many_cache(client=cache, values=values, ttl=settings.cache_ttl)
+    except Exception as e:
+        logger.warning(f"Cache set failed for {len(values)} token balances: {e}")
+
+    if is_finalized(chain_id=chain_id, block_number=block_number):
+        await set_disk_cache(values)
+
+    return fetched
+
 
-    response: dict[str, Any] = BalanceResponse(
-        address=params.address, balance=result
-    ).model_dump()
+@router.post("/{block_number}/token-balances/", response_model=TokenBalancesResponse)
+async def token_balances_by_block(
+    request: Request,
+    body: TokenBalancesRequest,
+    block_number: int = Path(..., ge=0),
+    cache: Redis = Depends(get_redis_client),
+):
+    """
+    Get ERC-20 balances for (token, holder) pairs in specified block.
+    Uncached pairs are fetched with aggregated Multicall3 balanceOf calls
+    """
+    chain_id: int = body.chain_id or DEFAULT_CHAIN_ID
+    try:
+        check_block_not_past_head(chain_id=chain_id, block_number=block_number)
+    except BlockPastHead as e:
+        logger.warning(f"Rejected token balances request: {e.message}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+
+    pairs: list[tuple[str, str]] = list(
+        dict.fromkeys((pair.token, pair.holder) for pair in body.pairs)
+    )
+    keys: list[str] = [
+        build_token_balance_cache_key(
+            chain_id=chain_id, token=token, holder=holder, block_number=block_number
+        )
+        for token, holder in pairs
+    ]
 
+    balances: dict[tuple[str, str], Optional[int]] = {}
     try:
-        await set_cache(
-            client=cache,
-            key=cache_key,
-            value=orjson.dumps(response),
-            ttl=settings.cache_ttl,
+        cached: list[Optional[str]] = await get_many_cache(client=cache, keys=keys)
+    except Exception as e:
+        logger.warning(f"Cache get failed for {len(keys)} token balances: {e}")
+        cached = [None] * len(keys)
+
+    for pair, value in zip(pairs, cached):
+        if value is not None:
+            balances[pair] = int(value)
+
+    if len(balances) < len(pairs) and is_finalized(
+        chain_id=chain_id, block_number=block_number
+    ):
+        missing_keys: dict[str, tuple[str, str]] = {
+            key: pair for key, pair in zip(keys, pairs) if pair not in balances
+        }
+        stored: dict[str, bytes] = {
+            key: value
+            for key, value in zip(
+                missing_keys, await get_many_disk_cache(list(missing_keys))
+            )
+            if value is not None
+        }
+        for key, value in stored.items():
+            balances[missing_keys[key]] = int(value)
+        try:
+            await set_many_cache(client=cache, values=stored, ttl=settings.cache_ttl)
+        except Exception as e:
+            logger.warning(f"Cache set failed for {len(stored)} token balances: {e}")
+
+    missing: list[tuple[str, str]] = [pair for pair in pairs if pair not in balances]
+    logger.info(
+        f"Token balances at {block_number}: {len(pairs) - len(missing)} cached, {len(missing)} to fetch"
+    )
+
+    if missing:
+        error_key: str = build_token_balances_cache_key(
+            chain_id=chain_id, block_number=block_number
         )
-        logger.debug(
-            f"Cached balance for {params.address} at block {params.block_number}"
+        cached_error: Optional[dict[str, Any]] = None
+        try:
+            _, cached_error = await get_cache_with_error(client=cache, key=error_key)
+        except Exception as e:
+            logger.warning(f"Cache get failed for {error_key}: {e}")
+
+        if cached_error:
+            logger.info(f"Negative cache HIT for token balances at {block_number}")
+            raise HTTPException(
+                status_code=cached_error["status_code"], detail=cached_error["detail"]
+            )
+
+        fetched: list[Optional[int]] = await cancel_on_disconnect(
+            request=request,
+            work=_fetch_token_balances(
+                cache=cache,
+                chain_id=chain_id,
+                pairs=missing,
+                block_number=block_number,
+                error_key=error_key,
+            ),
+            keep=is_finalized(chain_id=chain_id, block_number=block_number),
         )
-    except Exception as e:
-        logger.warning(f"Cache set failed for {cache_key}: {e}")
+        balances.update(zip(missing, fetched))
 
-    return response
+    return TokenBalancesResponse(
+        block_number=block_number,
+        balances=[
+            TokenBalance(
+                token=pair.token,
+                holder=pair.holder,
+                balance=balances[(pair.token, pair.holder)],
+            )
+            for pair in body.pairs
+        ],
+    )
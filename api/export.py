@@ -0,0 +1,103 @@
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, Path, status
+from fastapi.responses import FileResponse
+from loguru import logger
+
+from core.block.export import (
+    get_export_file,
+    load_export_job,
+    resume_export_job,
+    submit_export_job,
+)
+from core.block.head import check_block_not_past_head
+from core.block.web3 import DEFAULT_CHAIN_ID
+from core.exceptions.block import BlockPastHead
+from core.exceptions.export import ExportJobNotFound
+from schemas.export import ExportJob, ExportRequest
+
+router = APIRouter(
+    prefix="/export",
+    tags=["export"],
+)
+
+JOB_ID = Path(..., pattern=r"^[0-9a-f]{32}$")
+
+
+def _load_job(job_id: str) -> dict[str, Any]:
+    try:
+        return load_export_job(job_id)
+    except ExportJobNotFound as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.message)
+
+
+@router.post("/logs/", response_model=ExportJob, status_code=status.HTTP_202_ACCEPTED)
+async def submit_logs_export(params: ExportRequest):
+    """
+    Start a background export of contract logs in [from_block, to_block] to gzip NDJSON.
+    Poll the returned job, then download it once done
+    """
+    try:
+        check_block_not_past_head(
+            chain_id=DEFAULT_CHAIN_ID, block_number=params.to_block
+        )
+    except BlockPastHead as e:
+        logger.warning(f"Rejected export request: {e.message}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+
+    job: dict[str, Any] = submit_export_job(
+        from_block=params.from_block, to_block=params.to_block
+    )
+    logger.info(
+        f"Export {job['id']} queued for blocks {params.from_block} - {params.to_block}"
+    )
+    return job
+
+
+@router.get("/logs/{job_id}", response_model=ExportJob)
+async def logs_export_status(job_id: str = JOB_ID):
+    """
+    Export job state and progress
+    """
+    return _load_job(job_id)
+
+
+@router.post(
+    "/logs/{job_id}/resume",
+    response_model=ExportJob,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def resume_logs_export(job_id: str = JOB_ID):
+    """
+    Retry a failed export from its last checkpoint
+    """
+    try:
+        job: dict[str, Any] = resume_export_job(job_id)
+    except ExportJobNotFound as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.message)
+
+    if job["status"] == "done":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Export job {job_id} is done",
+        )
+    return job
+
+
+@router.get("/logs/{job_id}/download")
+async def download_logs_export(job_id: str = JOB_ID):
+    """
+    Exported logs, one JSON object per line, gzip-compressed
+    """
+    job: dict[str, Any] = _load_job(job_id)
+    if job["status"] != "done":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Export job {job_id} is {job['status']}",
+        )
+
+    return FileResponse(
+        get_export_file(job_id),
+        media_type="application/gzip",
+        filename=f"logs-{job['from_block']}-{job['to_block']}.ndjson.gz",
+    )
@@ -1,19 +1,52 @@
-from typing import Any, Optional
+import asyncio
+import bisect
+from typing import Any, AsyncIterator, Optional
 
 import orjson
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from loguru import logger
 from redis.asyncio import Redis
 from web3 import AsyncWeb3
+from web3.exceptions import Web3RPCError
 from web3.types import LogReceipt
 
 from config import settings
+from core.block.head import check_block_not_past_head
 from core.block.logs import get_logs_by_block_period
-from core.block.web3 import get_web3_client
+from core.block.stream import subscribe_logs, unsubscribe_logs
+from core.block.timestamps import get_block_by_timestamp
+from core.block.web3 import DEFAULT_CHAIN_ID, get_web3_client
+from core.cache.http import build_cache_control, cached_json_response, is_finalized
+from core.cache.disk import set_disk_cache
+from core.cache.logs import (
+    get_log_segments,
+    get_logs_chunk,
+    log_position,
+    set_log_segments,
+)
 from core.cache.redis import get_redis_client
-from core.cache.utils import build_get_query_cache_key, get_cache, set_cache
+from core.cache.utils import (
+    build_logs_aggregate_cache_key,
+    build_logs_cache_key,
+    cache_rpc_error,
+    get_cache,
+    get_cache_with_error,
+    get_disk_backed_cache,
+    set_cache,
+)
+from core.exceptions.block import BlockPastHead
 from core.exceptions.logs import MaxBlockRangeLimit
-from schemas.logs import LogRequest, LogResponse
+from core.exceptions.timestamps import BlockTimestampNotFound
+from core.request import cancel_on_disconnect
+from schemas.logs import (
+    LogAggregateRequest,
+    LogAggregateResponse,
+    LogCursor,
+    LogPage,
+    LogRequest,
+    LogResponse,
+)
 
 router = APIRouter(
     prefix="/logs",
@@ -21,26 +54,70 @@ router = APIRouter(
 )
 
 
-@router.get("/", response_model=LogResponse)
-async def logs_by_block_period(
-    request: Request,
-    cache: Redis = Depends(get_redis_client),
-    params: LogRequest = Depends(),
-):
+async def _resolve_time_range(
+    cache: Redis, params: LogRequest
+) -> Optional[tuple[int, Optional[int]]]:
     """
-    Get 0x66357dCaCe80431aee0A7507e2E361B7e2402370 logs from X to Y blocks range on Avalanche
+    Blocks for from_time/to_time (first block at or after from_time, last block at or
+    before to_time). None when the window contains no blocks.
     """
-    cache_key: str = build_get_query_cache_key(
-        prefix="logs_by_block_period", url=request.url
-    )
     try:
-        cached: Optional[str] = await get_cache(client=cache, key=cache_key)
-        if cached:
-            logger.info(f"Cache HIT for blocks {params.from_block} - {params.to_block}")
-            return orjson.loads(cached)
-    except Exception as e:
-        logger.warning(f"Cache get failed for {cache_key}: {e}")
+        web3: AsyncWeb3 = get_web3_client()  # Default Avalanche
+    except ValueError as e:
+        msg = str(e)
+        logger.error(f"Failed to get web3 client: {msg}")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=msg)
+
+    from_block, to_block = params.from_block, params.to_block
+    try:
+        if params.from_time is not None:
+            from_block = await get_block_by_timestamp(
+                web3=web3,
+                cache=cache,
+                chain_id=DEFAULT_CHAIN_ID,
+                timestamp=params.from_time,
+                mode="after",
+            )
+            if from_block is None:
+                return None
 
+        if params.to_time is not None:
+            to_block = await get_block_by_timestamp(
+                web3=web3,
+                cache=cache,
+                chain_id=DEFAULT_CHAIN_ID,
+                timestamp=params.to_time,
+                mode="before",
+            )
+            if to_block is None or to_block < from_block:
+                return None
+    except (Web3RPCError, BlockTimestampNotFound) as e:
+        msg = e.message
+        logger.error(f"Timestamp resolution failed: {msg}")
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=msg)
+
+    return from_block, to_block
+
+
+def _paginate(
+    logs: list[dict[str, Any]], remaining: int, anchor: int, limit: int
+) -> bytes:
+    """
+    Page of the first `limit` of `logs`, `remaining` being the logs left in the
+    range from the first one
+    """
+    page = logs[:limit]
+    next_cursor: Optional[str] = None
+    if remaining > limit:
+        block_number, log_index = log_position(page[-1])
+        next_cursor = LogCursor(anchor, block_number, log_index).encode()
+
+    return orjson.dumps({"logs": page, "next_cursor": next_cursor})
+
+
+async def _fetch_logs_payload(
+    cache: Redis, cache_key: str, from_block: int, to_block: Optional[int]
+) -> bytes:
     try:
         web3: AsyncWeb3 = get_web3_client()  # Default Avalanche
     except ValueError as e:
@@ -52,31 +129,371 @@ async def logs_by_block_period(
         result: list[LogReceipt] = await get_logs_by_block_period(
             web3=web3,
             address=settings.CONTRACT_ADDRESS,
-            from_block=params.from_block,
-            to_block=params.to_block,
+            from_block=from_block,
+            to_block=to_block,
         )
     except MaxBlockRangeLimit as e:
         msg = e.message
         logger.error(f"MaxBlockRangeLimit error occured: {msg}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=msg)
+    except Web3RPCError as e:
+        msg = e.message
+        logger.error(f"Rpc error occured: {msg}")
+        await cache_rpc_error(
+            client=cache,
+            key=cache_key,
+            error=e,
+            status_code=status.HTTP_502_BAD_GATEWAY,
+        )
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=msg)
 
     logger.info(
-        f"Contract logs from {params.from_block} to {params.to_block} returned: {len(result)} log receipt"
+        f"Contract logs from {from_block} to {to_block} returned: {len(result)} log receipt"
     )
 
-    response: dict[str, Any] = LogResponse(logs=result).model_dump()
+    # Cached in its final (aliased) form, so hits are served without re-serializing
+    payload: bytes = orjson.dumps(LogResponse(logs=result).model_dump(by_alias=True))
 
     try:
         await set_cache(
             client=cache,
             key=cache_key,
-            value=orjson.dumps(response),
+            value=payload,
             ttl=settings.cache_ttl,
         )
-        logger.debug(
-            f"Cached result for blocks {params.from_block} - {params.to_block}"
+        logger.debug(f"Cached result for blocks {from_block} - {to_block}")
+    except Exception as e:
+        logger.warning(f"Cache set failed for {cache_key}: {e}")
+
+    if is_finalized(chain_id=DEFAULT_CHAIN_ID, block_number=to_block):
+        await set_disk_cache({cache_key: payload})
+
+    return payload
+
+
+@router.get("/", response_model=LogPage)
+async def logs_by_block_period(
+    request: Request,
+    cache: Redis = Depends(get_redis_client),
+    params: LogRequest = Depends(),
+):
+    """
+    Get 0x66357dCaCe80431aee0A7507e2E361B7e2402370 logs from X to Y blocks range on Avalanche.
+    The range can also be given as unix timestamps (from_time / to_time).
+    With `limit` the logs are paged: pass `next_cursor` back as `cursor` for the next page.
+    Pages are read from page-sized cached segments of the range
+    """
+    from_block, to_block = params.from_block, params.to_block
+    if params.from_time is not None or params.to_time is not None:
+        block_range = await _resolve_time_range(cache=cache, params=params)
+        if block_range is None:
+            return cached_json_response(
+                request=request,
+                payload=orjson.dumps(LogResponse(logs=[]).model_dump()),
+                cache_control=build_cache_control(
+                    chain_id=DEFAULT_CHAIN_ID, block_number=None
+                ),
+            )
+        from_block, to_block = block_range
+
+    cursor: Optional[LogCursor] = (
+        LogCursor.decode(params.cursor) if params.cursor is not None else None
+    )
+    if cursor is not None and (
+        cursor.anchor < from_block
+        or (to_block is not None and cursor.block_number > to_block)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor does not belong to this block range",
+        )
+    # Pages are cut from the range cached by the first page
+    anchor: int = from_block if cursor is None else cursor.anchor
+
+    try:
+        check_block_not_past_head(
+            chain_id=DEFAULT_CHAIN_ID,
+            block_number=from_block if to_block is None else to_block,
+        )
+    except BlockPastHead as e:
+        logger.warning(f"Rejected logs request: {e.message}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+
+    cache_key: str = build_logs_cache_key(
+        chain_id=DEFAULT_CHAIN_ID,
+        address=settings.CONTRACT_ADDRESS,
+        from_block=anchor,
+        to_block=to_block,
+    )
+    cache_control: str = build_cache_control(
+        chain_id=DEFAULT_CHAIN_ID, block_number=to_block
+    )
+
+    limit: Optional[int] = params.limit or settings.logs_default_page_size
+    if cursor is not None:
+        limit = limit or settings.logs_max_page_size
+    after: Optional[tuple[int, int]] = (
+        None if cursor is None else (cursor.block_number, cursor.log_index)
+    )
+    if limit is not None:
+        segments = await get_log_segments(cache=cache, cache_key=cache_key, after=after)
+        if segments is not None:
+            logger.info(f"Cache HIT for page of blocks {anchor} - {to_block}")
+            logs, remaining = segments
+            return cached_json_response(
+                request=request,
+                payload=_paginate(
+                    logs=logs, remaining=remaining, anchor=anchor, limit=limit
+                ),
+                cache_control=cache_control,
+            )
+
+    cached: Optional[str] = None
+    cached_error: Optional[dict[str, Any]] = None
+    try:
+        cached, cached_error = await get_cache_with_error(client=cache, key=cache_key)
+    except Exception as e:
+        logger.warning(f"Cache get failed for {cache_key}: {e}")
+
+    if not cached and not cached_error:
+        if is_finalized(chain_id=DEFAULT_CHAIN_ID, block_number=to_block):
+            cached = await get_disk_backed_cache(client=cache, key=cache_key)
+
+    if cached:
+        logger.info(f"Cache HIT for blocks {anchor} - {to_block}")
+        payload: bytes | str = cached
+    elif cached_error:
+        logger.info(f"Negative cache HIT for blocks {anchor} - {to_block}")
+        raise HTTPException(
+            status_code=cached_error["status_code"], detail=cached_error["detail"]
+        )
+    else:
+        if cursor is not None:
+            # The range expired between pages: fetch only what is left after the cursor
+            anchor = cursor.block_number
+            cache_key = build_logs_cache_key(
+                chain_id=DEFAULT_CHAIN_ID,
+                address=settings.CONTRACT_ADDRESS,
+                from_block=anchor,
+                to_block=to_block,
+            )
+        payload = await cancel_on_disconnect(
+            request=request,
+            work=_fetch_logs_payload(
+                cache=cache, cache_key=cache_key, from_block=anchor, to_block=to_block
+            ),
+            keep=is_finalized(chain_id=DEFAULT_CHAIN_ID, block_number=to_block),
+        )
+
+    if limit is not None:
+        # Split the range once, later pages read only their segments
+        logs: list[dict[str, Any]] = orjson.loads(payload)["logs"]
+        await set_log_segments(cache=cache, cache_key=cache_key, logs=logs)
+        start: int = (
+            0 if after is None else bisect.bisect_right(logs, after, key=log_position)
+        )
+        payload = _paginate(
+            logs=logs[start:], remaining=len(logs) - start, anchor=anchor, limit=limit
+        )
+
+    return cached_json_response(
+        request=request, payload=payload, cache_control=cache_control
+    )
+
+
+async def _chunk_columns(
+    web3: AsyncWeb3, cache: Redis, from_block: int, to_block: int, group_by: str
+) -> tuple[list[int], Optional[list[str]]]:
+    """
+    Block numbers and group keys of one cached /logs chunk. Only the columns the
+    grouping needs outlive the call, not the decoded log dicts.
+    """
+    logs: list[dict[str, Any]] = await get_logs_chunk(
+        web3=web3,
+        cache=cache,
+        address=settings.CONTRACT_ADDRESS,
+        from_block=from_block,
+        to_block=to_block,
+    )
+    blocks: list[int] = [log["blockNumber"] for log in logs]
+    if group_by == "topic0":
+        return blocks, [log["topics"][0] if log["topics"] else "" for log in logs]
+    if group_by == "address":
+        return blocks, [log["address"] for log in logs]
+    return blocks, None
+
+
+async def _aggregate_range(
+    cache: Redis, cache_key: str, params: LogAggregateRequest
+) -> bytes:
+    """
+    Aggregate the range chunk by chunk, through the cached /logs chunks.
+    Chunks are aligned to max_block_range, so other queries reuse them.
+    """
+    # numpy is only loaded once an aggregation actually runs, not at app start
+    from core.block.aggregate import aggregate_groups, aggregate_logs, merge_aggregates
+
+    try:
+        web3: AsyncWeb3 = get_web3_client()  # Default Avalanche
+    except ValueError as e:
+        msg = str(e)
+        logger.error(f"Failed to get web3 client: {msg}")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=msg)
+
+    step: int = settings.max_block_range
+    chunks: list[tuple[int, int]] = [
+        (max(start, params.from_block), min(start + step - 1, params.to_block))
+        for start in range(
+            params.from_block - params.from_block % step, params.to_block + 1, step
+        )
+    ]
+
+    parts: list = []
+    try:
+        for offset in range(0, len(chunks), settings.logs_aggregate_concurrency):
+            window = chunks[offset : offset + settings.logs_aggregate_concurrency]
+            for blocks, keys in await asyncio.gather(
+                *(
+                    _chunk_columns(
+                        web3=web3,
+                        cache=cache,
+                        from_block=from_block,
+                        to_block=to_block,
+                        group_by=params.group_by,
+                    )
+                    for from_block, to_block in window
+                )
+            ):
+                parts.append(
+                    aggregate_logs(
+                        blocks=blocks,
+                        keys=keys,
+                        group_by=params.group_by,
+                        bucket_size=params.bucket_size,
+                    )
+                )
+    except Web3RPCError as e:
+        msg = e.message
+        logger.error(f"Rpc error occured: {msg}")
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=msg)
+
+    aggregate = merge_aggregates(parts=parts, group_by=params.group_by)
+    groups: list[dict[str, Any]] = aggregate_groups(aggregate)
+    logger.info(
+        f"Aggregated logs from {params.from_block} to {params.to_block} "
+        f"by {params.group_by}: {len(groups)} groups"
+    )
+
+    payload: bytes = orjson.dumps(
+        LogAggregateResponse(
+            from_block=params.from_block,
+            to_block=params.to_block,
+            group_by=params.group_by,
+            total=sum(group["count"] for group in groups),
+            groups=groups,
+        ).model_dump()
+    )
+
+    try:
+        await set_cache(
+            client=cache, key=cache_key, value=payload, ttl=settings.cache_ttl
         )
     except Exception as e:
         logger.warning(f"Cache set failed for {cache_key}: {e}")
 
-    return response
+    if is_finalized(chain_id=DEFAULT_CHAIN_ID, block_number=params.to_block):
+        await set_disk_cache({cache_key: payload})
+
+    return payload
+
+
+@router.get("/aggregate", response_model=LogAggregateResponse)
+async def logs_aggregate(
+    request: Request,
+    cache: Redis = Depends(get_redis_client),
+    params: LogAggregateRequest = Depends(),
+):
+    """
+    Count 0x66357dCaCe80431aee0A7507e2E361B7e2402370 logs in a block range, grouped by
+    block bucket (`bucket_size`), topic0 or emitting address, with min/max block per group
+    """
+    try:
+        check_block_not_past_head(
+            chain_id=DEFAULT_CHAIN_ID, block_number=params.to_block
+        )
+    except BlockPastHead as e:
+        logger.warning(f"Rejected logs aggregation: {e.message}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+
+    cache_key: str = build_logs_aggregate_cache_key(
+        chain_id=DEFAULT_CHAIN_ID,
+        address=settings.CONTRACT_ADDRESS,
+        from_block=params.from_block,
+        to_block=params.to_block,
+        group_by=params.group_by,
+        bucket_size=params.bucket_size,
+    )
+    cache_control: str = build_cache_control(
+        chain_id=DEFAULT_CHAIN_ID, block_number=params.to_block
+    )
+    finalized: bool = is_finalized(
+        chain_id=DEFAULT_CHAIN_ID, block_number=params.to_block
+    )
+
+    cached: Optional[bytes | str] = None
+    try:
+        cached = await get_cache(client=cache, key=cache_key)
+    except Exception as e:
+        logger.warning(f"Cache get failed for {cache_key}: {e}")
+
+    if not cached and finalized:
+        cached = await get_disk_backed_cache(client=cache, key=cache_key)
+
+    if cached:
+        logger.info(f"Cache HIT for aggregation {cache_key}")
+        payload: bytes | str = cached
+    else:
+        payload = await cancel_on_disconnect(
+            request=request,
+            work=_aggregate_range(cache=cache, cache_key=cache_key, params=params),
+            keep=finalized,
+        )
+
+    return cached_json_response(
+        request=request, payload=payload, cache_control=cache_control
+    )
+
+
+async def _log_events(request: Request, queue: asyncio.Queue) -> AsyncIterator[bytes]:
+    try:
+        while not await request.is_disconnected():
+            try:
+                event: Optional[bytes] = await asyncio.wait_for(
+                    queue.get(), timeout=settings.logs_stream_heartbeat
+                )
+            except TimeoutError:
+                event = b": ping\n\n"
+
+            if event is None:
+                break
+            yield event
+    finally:
+        unsubscribe_logs(queue)
+
+
+@router.get("/stream")
+async def logs_stream(request: Request):
+    """
+    Server-Sent Events stream of new contract logs, one event per new head with logs
+    """
+    if not settings.logs_stream_enabled:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Log stream is disabled"
+        )
+
+    queue = subscribe_logs()
+    return StreamingResponse(
+        _log_events(request=request, queue=queue),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
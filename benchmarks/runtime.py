@@ -0,0 +1,126 @@
+"""
+Runtime configuration benchmark.
+
+Starts gunicorn with each configuration below and loads /health (no RPC or Redis)
+with a fixed number of concurrent keep-alive connections, then reports throughput
+and latency percentiles.
+
+    python benchmarks/runtime.py [--duration 10] [--concurrency 64]
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parents[1]
+PORT = 8921
+
+CONFIGS: dict[str, dict[str, str]] = {
+    "1 worker, asyncio + h11": {
+        "GUNICORN_WORKERS": "1",
+        "UVICORN_LOOP": "asyncio",
+        "UVICORN_HTTP": "h11",
+    },
+    "1 worker, uvloop + httptools": {
+        "GUNICORN_WORKERS": "1",
+        "UVICORN_LOOP": "uvloop",
+        "UVICORN_HTTP": "httptools",
+    },
+    "2 workers, uvloop + httptools": {
+        "GUNICORN_WORKERS": "2",
+        "UVICORN_LOOP": "uvloop",
+        "UVICORN_HTTP": "httptools",
+    },
+    "auto workers, uvloop + httptools": {
+        "UVICORN_LOOP": "uvloop",
+        "UVICORN_HTTP": "httptools",
+    },
+}
+
+
+def _start(overrides: dict[str, str]) -> subprocess.Popen:
+    env = {
+        "AVAX_RPC": "http://localhost:8545",
+        "REDIS_URL": "redis://localhost:6379/0",
+        "LOG_LEVEL": "WARNING",
+        **os.environ,
+        **overrides,
+        "GUNICORN_BIND": f"127.0.0.1:{PORT}",
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "--config", "gunicorn.conf.py", "main:app"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+async def _wait_ready(url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(url)).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError("gunicorn did not become ready")
+
+
+async def _load(url: str, duration: float, concurrency: int) -> list[float]:
+    latencies: list[float] = []
+    deadline = time.monotonic() + duration
+
+    async def _client() -> None:
+        async with httpx.AsyncClient() as client:
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                response = await client.get(url)
+                if response.status_code == 200:
+                    latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(_client() for _ in range(concurrency)))
+    return latencies
+
+
+async def run(duration: float, concurrency: int) -> None:
+    url = f"http://127.0.0.1:{PORT}/health"
+    print(f"{'configuration':36} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+
+    for name, overrides in CONFIGS.items():
+        process = _start(overrides)
+        try:
+            await _wait_ready(url)
+            latencies = await _load(url, duration=duration, concurrency=concurrency)
+        finally:
+            process.send_signal(signal.SIGTERM)
+            process.wait()
+
+        quantiles = statistics.quantiles(latencies, n=100)
+        print(
+            f"{name:36} {len(latencies) / duration:9.0f} "
+            f"{quantiles[49] * 1000:8.1f} {quantiles[98] * 1000:8.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    asyncio.run(run(duration=args.duration, concurrency=args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Worker startup benchmark.
+
+Compares a cold worker (fresh interpreter importing the app, i.e. no --preload)
+with a worker forked from a master that already imported it (--preload).
+
+    python benchmarks/startup.py [--runs 5] [--top 10]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+ENV = {
+    "AVAX_RPC": "http://localhost:8545",
+    "REDIS_URL": "redis://localhost:6379/0",
+    **os.environ,
+}
+
+COLD_SNIPPET = """
+import time
+start = time.perf_counter()
+import main  # noqa: F401
+print(time.perf_counter() - start)
+"""
+
+FORK_SNIPPET = """
+import os, time
+import main  # noqa: F401
+import gc
+gc.freeze()
+samples = []
+for _ in range({runs}):
+    read_fd, write_fd = os.pipe()
+    start = time.perf_counter()
+    pid = os.fork()
+    if pid == 0:
+        from main import app  # already in sys.modules, as in a forked worker
+        os.write(write_fd, b"1")
+        os._exit(0)
+    os.read(read_fd, 1)
+    samples.append(time.perf_counter() - start)
+    os.waitpid(pid, 0)
+print(" ".join(map(str, samples)))
+"""
+
+
+def _run(code: str, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args, "-c", code],
+        cwd=ROOT,
+        env=ENV,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def cold_start(runs: int) -> list[float]:
+    return [float(_run(COLD_SNIPPET).stdout) for _ in range(runs)]
+
+
+def preloaded_fork(runs: int) -> list[float]:
+    return [
+        float(value) for value in _run(FORK_SNIPPET.format(runs=runs)).stdout.split()
+    ]
+
+
+def top_imports(top: int) -> list[tuple[int, str]]:
+    stderr = _run("import main", "-X", "importtime").stderr
+    rows: list[tuple[int, str]] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[12:].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth <= 1:  # the app modules and what they import directly
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def _fmt(samples: list[float]) -> str:
+    return (
+        f"median {statistics.median(samples) * 1000:8.1f} ms | "
+        f"min {min(samples) * 1000:8.1f} ms | max {max(samples) * 1000:8.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"cold worker (no preload)  {_fmt(cold_start(args.runs))}")
+    print(f"forked worker (preload)   {_fmt(preloaded_fork(args.runs))}")
+
+    print(f"\nTop {args.top} app-level imports by cumulative time:")
+    for cumulative, name in top_imports(args.top):
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
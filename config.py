@@ -1,6 +1,8 @@
-from pydantic import field_validator
+from typing import Literal
+
+from eth_utils import is_address, to_checksum_address
+from pydantic import field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from web3 import AsyncWeb3
 
 
 class Settings(BaseSettings):
@@ -21,15 +23,158 @@ class Settings(BaseSettings):
     # RPC Limitation: https://www.ankr.com/docs/rpc-service/service-plans/#block-range--batch-size-limits
     max_block_range: int = 3000
 
+    # eth_getLogs chunks are resized to keep roughly this many results per call
+    logs_target_results: int = 2000
+    # ...but never below this span, a dense range fails instead of going block by block
+    logs_min_block_span: int = 10
+
+    # Upstream RPC concurrency (AIMD) and provider plan rate limits (req/s per chain)
+    rpc_initial_concurrency: int = 8
+    rpc_min_concurrency: int = 1
+    rpc_max_concurrency: int = 64
+    rpc_queue_size: int = 200
+    rpc_queue_timeout: float = 5.0
+    # Plan-wide limits, split evenly between the web_concurrency worker processes
+    rpc_rate_limits: dict[int, float] = {}
+    rpc_burst: int | None = None
+    # Worker processes of this host (set by gunicorn.conf.py, or WEB_CONCURRENCY)
+    web_concurrency: int = 1
+
+    # ERC-20 balanceOf calls per Multicall3 eth_call, and pairs per request
+    token_balances_chunk_size: int = 500
+    # balanceOf calls in flight per request where Multicall3 isn't deployed yet
+    token_balances_fallback_concurrency: int = 8
+    max_token_pairs: int = 5000
+
+    # eth_getBlockByNumber probes allowed per timestamp resolution, and samples kept
+    # per chain (every other one is dropped past that)
+    block_time_max_probes: int = 64
+    block_time_max_samples: int = 10_000
+
+    # /logs page size cap (limit), also the page size when only a cursor is given
+    # and the size of the cached page segments
+    logs_max_page_size: int = 1000
+    # Page size of /logs requests without limit; unset serves the whole range
+    logs_default_page_size: int | None = None
+
+    # /logs/aggregate: blocks per request, eth_getLogs chunks in flight
+    logs_aggregate_max_range: int = 500_000
+    logs_aggregate_concurrency: int = 4
+
+    # Per-chain timeout of /balance fan-out legs
+    fanout_chain_timeout: float = 3.0
+
+    # Blocks behind the head after which data never changes, per chain
+    finality_depth: dict[int, int] = {1: 64, 43114: 1}
+    default_finality_depth: int = 64
+
+    # HTTP Cache-Control max-age for finalized blocks and for data near the head
+    http_finalized_max_age: int = 31_536_000
+    http_head_max_age: int = 2
+
+    # Blocks past the tracked head accepted before rejecting a request,
+    # unless the head hasn't been confirmed for head_max_age seconds (RPC outage)
+    future_block_tolerance: int = 5
+    head_max_age: float = 30.0
+
+    # TTLs of cached deterministic RPC failures, by kind (core/block/errors.py)
+    negative_cache_ttls: dict[str, int] = {
+        "pruned": 3600,
+        "unknown_block": 5,
+        "invalid": 300,
+    }
+
+    # Request deadline in seconds, per path prefix (longest wins, 0 disables).
+    # Clients may only shorten it with the request_timeout_header
+    request_timeouts: dict[str, float] = {
+        "/logs/stream": 0,
+        # Up to logs_aggregate_max_range / max_block_range chunks (~170 by default)
+        "/logs/aggregate": 120.0,
+        "/logs": 15.0,
+        "/balance": 5.0,
+        "/block": 10.0,
+    }
+    default_request_timeout: float = 10.0
+    request_timeout_header: str = "X-Request-Timeout"
+
+    # How often in-flight upstream work checks for client disconnect
+    disconnect_poll_interval: float = 0.5
+
     # Redis cache TTL
     cache_ttl: int = 180
 
+    # Persistent SQLite tier below Redis for finalized results (empty disables it)
+    disk_cache_path: str = "data/cache.sqlite3"
+    disk_cache_max_bytes: int = 1 << 30
+
+    # Redis connection pool
+    redis_max_connections: int = 50
+    # Wait for a free pooled connection this long, then skip the cache for the call
+    redis_pool_timeout: float = 0.2
+    redis_socket_timeout: float = 0.5
+    redis_socket_connect_timeout: float = 0.5
+    redis_health_check_interval: int = 30
+
+    # Redis circuit breaker
+    redis_breaker_failure_threshold: int = 5
+    redis_breaker_reset_timeout: float = 10.0
+
+    # Runtime (gunicorn.conf.py). Workers default to CPUs (or cgroup quota) * per-core
+    gunicorn_bind: str = "0.0.0.0:8021"
+    gunicorn_workers: int | None = None
+    gunicorn_workers_per_core: float = 1.0
+    gunicorn_max_workers: int | None = None
+    gunicorn_worker_connections: int = 1000
+    gunicorn_max_requests: int = 10_000
+    gunicorn_max_requests_jitter: int = 1_000
+    gunicorn_timeout: int = 30
+    gunicorn_graceful_timeout: int = 30
+    gunicorn_keepalive: int = 5
+    gunicorn_preload: bool = True
+    uvicorn_loop: Literal["auto", "asyncio", "uvloop"] = "auto"
+    uvicorn_http: Literal["auto", "h11", "httptools"] = "auto"
+
+    # LRU of validated/checksummed addresses on the request path
+    address_cache_size: int = 10_000
+
+    # Head tracking and cache warming
+    head_poll_interval: float = 2.0
+    warm_addresses: list[str] = []
+    warm_logs: bool = False
+    warm_logs_bucket_size: int = 100
+
+    # /logs/stream (SSE)
+    logs_stream_enabled: bool = True
+    logs_stream_queue_size: int = 100
+    logs_stream_heartbeat: float = 15.0
+
+    # Bulk log exports (gzip NDJSON on local disk)
+    export_dir: str = "exports"
+    export_max_jobs: int = 2  # running jobs per worker, the rest wait
+    export_concurrency: int = 4  # eth_getLogs chunks in flight per job
+    export_retries: int = 3
+
     @field_validator("CONTRACT_ADDRESS")
     @classmethod
     def validate_contract_address(cls, value: str) -> str:
-        if not AsyncWeb3.is_address(value):
+        if not is_address(value):
             raise ValueError(f"Invalid Ethereum address: {value}")
-        return AsyncWeb3.to_checksum_address(value)
+        return to_checksum_address(value)
+
+    @field_validator("warm_addresses")
+    @classmethod
+    def validate_warm_addresses(cls, value: list[str]) -> list[str]:
+        return [cls.validate_contract_address(address) for address in value]
+
+    @model_validator(mode="after")
+    def validate_warm_logs_bucket_size(self) -> "Settings":
+        # A warm log bucket is fetched as one range, capped like /logs ranges
+        if self.warm_logs_bucket_size > self.max_block_range:
+            raise ValueError(
+                f"warm_logs_bucket_size ({self.warm_logs_bucket_size}) must not "
+                f"exceed max_block_range ({self.max_block_range})"
+            )
+        return self
 
     model_config = SettingsConfigDict(env_file=".env")
 
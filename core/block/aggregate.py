@@ -0,0 +1,80 @@
+from typing import Any, Literal, Optional, Sequence
+
+import numpy as np
+
+GroupBy = Literal["block", "topic0", "address"]
+
+# Columns of a (partial) aggregate: group keys, log counts, min and max block
+Aggregate = tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+def _empty(group_by: GroupBy) -> Aggregate:
+    empty = np.empty(0, dtype=np.int64)
+    keys = empty if group_by == "block" else np.empty(0, dtype=str)
+    return keys, empty, empty, empty
+
+
+def _reduce(
+    keys: np.ndarray, counts: np.ndarray, min_blocks: np.ndarray, max_blocks: np.ndarray
+) -> Aggregate:
+    """
+    Collapse rows with equal keys: sum counts, min of min_blocks, max of max_blocks.
+    """
+    groups, inverse = np.unique(keys, return_inverse=True)
+    order = np.argsort(inverse, kind="stable")
+    sizes = np.bincount(inverse, minlength=len(groups))
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+
+    return (
+        groups,
+        np.add.reduceat(counts[order], starts),
+        np.minimum.reduceat(min_blocks[order], starts),
+        np.maximum.reduceat(max_blocks[order], starts),
+    )
+
+
+def aggregate_logs(
+    blocks: Sequence[int],
+    keys: Optional[Sequence[str]],
+    group_by: GroupBy,
+    bucket_size: int,
+) -> Aggregate:
+    """
+    Aggregate one chunk of logs given as columns: block numbers and, unless grouping
+    by block bucket, the topic0 or address of each log.
+    """
+    if not blocks:
+        return _empty(group_by)
+
+    block_column = np.fromiter(blocks, dtype=np.int64, count=len(blocks))
+    if group_by == "block":
+        key_column = block_column - block_column % bucket_size
+    else:
+        key_column = np.array(keys)
+
+    return _reduce(
+        key_column,
+        np.ones(len(blocks), dtype=np.int64),
+        block_column,
+        block_column,
+    )
+
+
+def merge_aggregates(parts: Sequence[Aggregate], group_by: GroupBy) -> Aggregate:
+    parts = [part for part in parts if len(part[0])]
+    if not parts:
+        return _empty(group_by)
+    if len(parts) == 1:
+        return parts[0]
+
+    return _reduce(*(np.concatenate(column) for column in zip(*parts)))
+
+
+def aggregate_groups(aggregate: Aggregate) -> list[dict[str, Any]]:
+    keys, counts, min_blocks, max_blocks = aggregate
+    return [
+        {"key": key, "count": count, "min_block": low, "max_block": high}
+        for key, count, low, high in zip(
+            keys.tolist(), counts.tolist(), min_blocks.tolist(), max_blocks.tolist()
+        )
+    ]
@@ -0,0 +1,53 @@
+from typing import Optional
+
+from web3.exceptions import Web3RPCError
+
+from config import settings
+
+# Deterministic provider errors: the same request fails the same way for a while
+DETERMINISTIC_ERROR_MARKERS: dict[str, tuple[str, ...]] = {
+    # State is gone from this (non-archive or pruned) node
+    "pruned": (
+        "missing trie node",
+        "state not available",
+        "historical state",
+        "state is not available",
+        "pruned",
+    ),
+    # Block not produced yet (or not seen by this node yet)
+    "unknown_block": (
+        "header not found",
+        "unknown block",
+        "block not found",
+        "future block",
+        "cannot query unfinalized data",
+    ),
+    # Request the provider will never accept
+    "invalid": (
+        "invalid argument",
+        "invalid params",
+        "out of range",
+        "not supported",
+    ),
+}
+
+
+def classify_rpc_error(exc: BaseException) -> Optional[str]:
+    if not isinstance(exc, Web3RPCError):
+        return None
+
+    message = (exc.message or "").lower()
+    for kind, markers in DETERMINISTIC_ERROR_MARKERS.items():
+        if any(marker in message for marker in markers):
+            return kind
+    return None
+
+
+def negative_cache_ttl(exc: BaseException) -> Optional[int]:
+    """
+    How long a failed RPC result may be cached, None if the failure is transient.
+    """
+    kind: Optional[str] = classify_rpc_error(exc)
+    if kind is None:
+        return None
+    return settings.negative_cache_ttls.get(kind)
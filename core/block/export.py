@@ -0,0 +1,280 @@
+import asyncio
+import fcntl
+import gzip
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Optional
+
+import orjson
+from aiohttp import ClientError
+from loguru import logger
+from redis.asyncio import Redis
+from web3 import AsyncWeb3
+from web3.exceptions import Web3RPCError
+
+from config import settings
+from core.block.web3 import DEFAULT_CHAIN_ID, get_web3_client
+from core.cache.logs import get_logs_chunk
+from core.cache.redis import get_redis_client
+from core.exceptions.export import ExportJobNotFound
+from core.exceptions.limiter import UpstreamOverloaded
+from core.request import clear_request_deadline
+
+# Jobs are files in settings.export_dir:
+#   <id>.json        manifest and checkpoint (next_block, logs, size)
+#   <id>.ndjson.gz   output, one gzip member per checkpoint
+#   <id>.lock        flock held by the worker running the job
+UNFINISHED_STATUSES = ("queued", "running")
+# Failed jobs keep their checkpoint and continue from it when resumed
+RESUMABLE_STATUSES = (*UNFINISHED_STATUSES, "failed")
+# Retried with backoff: RPC errors and network blips (OSError covers ConnectionError)
+TRANSIENT_ERRORS = (Web3RPCError, ClientError, TimeoutError, OSError)
+
+_tasks: dict[str, asyncio.Task] = {}
+_job_slots: Optional[asyncio.Semaphore] = None
+
+
+def _job_path(job_id: str, suffix: str) -> Path:
+    return Path(settings.export_dir) / f"{job_id}{suffix}"
+
+
+def get_export_file(job_id: str) -> Path:
+    return _job_path(job_id, ".ndjson.gz")
+
+
+def _save_job(job: dict[str, Any]) -> None:
+    job["updated_at"] = time.time()
+    path = _job_path(job["id"], ".json")
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_bytes(orjson.dumps(job))
+    os.replace(tmp, path)
+
+
+def load_export_job(job_id: str) -> dict[str, Any]:
+    try:
+        return orjson.loads(_job_path(job_id, ".json").read_bytes())
+    except FileNotFoundError:
+        raise ExportJobNotFound(f"Export job {job_id} not found")
+
+
+def _claim(job_id: str) -> Optional[int]:
+    """
+    Lock the job for this process. The lock dies with the process,
+    so a job left behind by a killed worker can be claimed again.
+    """
+    fd = os.open(_job_path(job_id, ".lock"), os.O_CREAT | os.O_RDWR, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _truncate(path: Path, size: int) -> None:
+    """
+    Drop whatever was written after the last checkpoint.
+    """
+    with open(path, "ab") as output:
+        output.truncate(size)
+
+
+def _append_logs(path: Path, logs: list[dict[str, Any]]) -> int:
+    with open(path, "ab") as output:
+        if logs:
+            with gzip.GzipFile(fileobj=output, mode="wb") as compressed:
+                compressed.writelines(
+                    orjson.dumps(log, option=orjson.OPT_APPEND_NEWLINE) for log in logs
+                )
+            output.flush()
+            os.fsync(output.fileno())
+        return output.tell()
+
+
+async def _fetch_chunk(
+    web3: AsyncWeb3, cache: Redis, address: str, from_block: int, to_block: int
+) -> list[dict[str, Any]]:
+    attempt = 0
+    while True:
+        try:
+            return await get_logs_chunk(
+                web3=web3,
+                cache=cache,
+                address=address,
+                from_block=from_block,
+                to_block=to_block,
+                write_disk=False,
+            )
+        except UpstreamOverloaded as e:
+            # Load shedding is expected during a backfill, wait without giving up
+            await asyncio.sleep(e.retry_after)
+        except TRANSIENT_ERRORS as e:
+            if attempt >= settings.export_retries:
+                raise
+            attempt += 1
+            logger.warning(
+                f"Export chunk {from_block} - {to_block} failed "
+                f"({getattr(e, 'message', None) or e!r}), "
+                f"retry {attempt}/{settings.export_retries}"
+            )
+            await asyncio.sleep(2**attempt)
+
+
+async def _export(job: dict[str, Any]) -> None:
+    """
+    Fetch `export_concurrency` chunks at a time, append them in block order
+    and checkpoint after each window.
+    """
+    web3: AsyncWeb3 = get_web3_client()
+    cache: Redis = await get_redis_client()
+    output: Path = get_export_file(job["id"])
+    step: int = settings.max_block_range
+
+    await asyncio.to_thread(_truncate, output, job["size"])
+
+    while job["next_block"] <= job["to_block"]:
+        window_end = min(
+            job["to_block"],
+            job["next_block"] + step * settings.export_concurrency - 1,
+        )
+        chunks = await asyncio.gather(
+            *(
+                _fetch_chunk(
+                    web3=web3,
+                    cache=cache,
+                    address=job["address"],
+                    from_block=start,
+                    to_block=min(start + step - 1, window_end),
+                )
+                for start in range(job["next_block"], window_end + 1, step)
+            )
+        )
+        logs = [log for chunk in chunks for log in chunk]
+
+        job["size"] = await asyncio.to_thread(_append_logs, output, logs)
+        job["logs"] += len(logs)
+        job["next_block"] = window_end + 1
+        _save_job(job)
+
+
+def _get_job_slots() -> asyncio.Semaphore:
+    global _job_slots
+    if _job_slots is None:
+        _job_slots = asyncio.Semaphore(settings.export_max_jobs)
+    return _job_slots
+
+
+async def _run_job(job_id: str) -> None:
+    clear_request_deadline()
+
+    fd: Optional[int] = _claim(job_id)
+    if fd is None:
+        return
+
+    try:
+        async with _get_job_slots():
+            job = load_export_job(job_id)
+            if job["status"] not in RESUMABLE_STATUSES:
+                return
+
+            job["status"] = "running"
+            job["error"] = None
+            _save_job(job)
+            logger.info(
+                f"Export {job_id} running from block {job['next_block']} "
+                f"to {job['to_block']}"
+            )
+
+            try:
+                await _export(job)
+            except asyncio.CancelledError:
+                logger.info(f"Export {job_id} paused at block {job['next_block']}")
+                raise
+            except Exception as e:
+                job["status"] = "failed"
+                job["error"] = getattr(e, "message", str(e))
+                _save_job(job)
+                logger.error(f"Export {job_id} failed: {job['error']}")
+                return
+
+            job["status"] = "done"
+            _save_job(job)
+            logger.info(f"Export {job_id} done: {job['logs']} logs")
+    finally:
+        os.close(fd)
+        _tasks.pop(job_id, None)
+
+
+def _schedule(job_id: str) -> None:
+    if job_id not in _tasks:
+        _tasks[job_id] = asyncio.create_task(_run_job(job_id))
+
+
+def submit_export_job(from_block: int, to_block: int) -> dict[str, Any]:
+    Path(settings.export_dir).mkdir(parents=True, exist_ok=True)
+
+    job: dict[str, Any] = {
+        "id": uuid.uuid4().hex,
+        "status": "queued",
+        "chain_id": DEFAULT_CHAIN_ID,
+        "address": settings.CONTRACT_ADDRESS,
+        "from_block": from_block,
+        "to_block": to_block,
+        "next_block": from_block,
+        "logs": 0,
+        "size": 0,
+        "error": None,
+        "created_at": time.time(),
+    }
+    _save_job(job)
+    _schedule(job["id"])
+    return job
+
+
+def resume_export_job(job_id: str) -> dict[str, Any]:
+    """
+    Queue a failed job again; it continues from its last checkpoint.
+    """
+    job: dict[str, Any] = load_export_job(job_id)
+    if job["status"] == "failed":
+        job["status"] = "queued"
+        job["error"] = None
+        _save_job(job)
+    if job["status"] in UNFINISHED_STATUSES:
+        _schedule(job_id)
+    return job
+
+
+async def start_export_workers() -> None:
+    """
+    Resume unfinished and failed jobs from their checkpoints. Every worker tries,
+    the job lock lets one of them run each job.
+    """
+    export_dir = Path(settings.export_dir)
+    if not export_dir.is_dir():
+        return
+
+    for path in export_dir.glob("*.json"):
+        try:
+            job = orjson.loads(path.read_bytes())
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning(f"Skipping unreadable export manifest {path}: {e}")
+            continue
+        if job["status"] in RESUMABLE_STATUSES:
+            _schedule(job["id"])
+
+
+async def stop_export_workers() -> None:
+    """
+    Cancel running jobs; they resume from the last checkpoint on next start.
+    """
+    global _job_slots
+
+    tasks = list(_tasks.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    _tasks.clear()
+    _job_slots = None
@@ -0,0 +1,115 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional
+
+from loguru import logger
+from web3 import AsyncWeb3
+
+from config import settings
+from core.block.limiter import upstream_slot
+from core.block.web3 import get_web3_clients
+from core.exceptions.block import BlockPastHead
+
+HeadListener = Callable[[int, int], Awaitable[None]]
+
+_heads: dict[int, int] = {}
+# time.monotonic() of the last successful head poll, per chain
+_head_updated: dict[int, float] = {}
+_listeners: list[HeadListener] = []
+_tasks: list[asyncio.Task] = []
+# Listener runs in flight, one per chain
+_notifying: dict[int, asyncio.Task] = {}
+
+
+def get_tracked_head(chain_id: int) -> Optional[int]:
+    return _heads.get(chain_id)
+
+
+def check_block_not_past_head(chain_id: int, block_number: int) -> None:
+    """
+    Reject blocks clearly past the tracked head before any RPC call.
+    The tolerance covers the head poll lag; a stale head (polling failing) is not trusted.
+    """
+    head: Optional[int] = _heads.get(chain_id)
+    if head is None or block_number <= head + settings.future_block_tolerance:
+        return
+
+    if time.monotonic() - _head_updated.get(chain_id, 0.0) <= settings.head_max_age:
+        raise BlockPastHead(f"Block {block_number} is past the chain head ({head})")
+
+
+def add_head_listener(listener: HeadListener) -> None:
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def notify_new_head(chain_id: int, block_number: int) -> None:
+    """
+    Record a polled head and hand new heads to the listeners in the background.
+    """
+    _head_updated[chain_id] = time.monotonic()
+    if block_number <= _heads.get(chain_id, -1):
+        return
+
+    _heads[chain_id] = block_number
+    if _listeners and chain_id not in _notifying:
+        _notifying[chain_id] = asyncio.create_task(_run_listeners(chain_id=chain_id))
+
+
+async def _run_listeners(chain_id: int) -> None:
+    """
+    Slow listeners don't hold up polling: heads that arrive meanwhile are
+    coalesced into one more run with the latest head.
+    """
+    notified: int = -1
+    try:
+        while (block_number := _heads.get(chain_id, -1)) > notified:
+            notified = block_number
+            results = await asyncio.gather(
+                *(listener(chain_id, block_number) for listener in _listeners),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.warning(
+                        f"Head listener failed for {chain_id}:{block_number}: {result}"
+                    )
+    finally:
+        _notifying.pop(chain_id, None)
+
+
+async def _poll_head(chain_id: int, web3: AsyncWeb3) -> None:
+    while True:
+        try:
+            async with upstream_slot(chain_id=chain_id, method="eth_blockNumber"):
+                block_number: int = await web3.eth.get_block_number()
+            notify_new_head(chain_id=chain_id, block_number=block_number)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Head poll failed for chain {chain_id}: {e}")
+
+        await asyncio.sleep(settings.head_poll_interval)
+
+
+async def start_head_tracker() -> None:
+    """
+    Poll every chain's head. Besides the listeners, finality (Cache-Control,
+    the disk tier) and past-head checks rely on the tracked head.
+    """
+    if _tasks:
+        return
+
+    for chain_id, web3 in get_web3_clients().items():
+        _tasks.append(asyncio.create_task(_poll_head(chain_id=chain_id, web3=web3)))
+    logger.info(f"Head tracker started for {len(_tasks)} chains")
+
+
+async def stop_head_tracker() -> None:
+    tasks = [*_tasks, *_notifying.values()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    _tasks.clear()
+    _heads.clear()
+    _head_updated.clear()
@@ -0,0 +1,204 @@
+import asyncio
+import math
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from aiohttp import ClientResponseError
+from loguru import logger
+from web3.exceptions import Web3RPCError
+
+from config import settings
+from core.exceptions.limiter import UpstreamOverloaded
+from core.request import request_deadline
+
+# Not a bare "exceeded": providers also use it for too many results / response size
+RATE_LIMIT_MARKERS = ("rate limit", "request limit", "too many requests", "429")
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    if isinstance(exc, ClientResponseError):
+        return exc.status == 429
+
+    if isinstance(exc, Web3RPCError):
+        message = (exc.message or "").lower()
+        return any(marker in message for marker in RATE_LIMIT_MARKERS)
+
+    return False
+
+
+class TokenBucket:
+    """
+    Provider plan rate limit: `rate` requests per second with `burst` capacity.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = asyncio.get_running_loop().time()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, deadline: float) -> bool:
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            self._refill(now)
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+
+            wait = (1 - self._tokens) / self.rate
+            if now + wait > deadline:
+                return False
+            await asyncio.sleep(wait)
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit for one (chain, RPC method) pair.
+    Grows by ~1 slot per window of successful calls, halves on provider rate limiting
+    at most once per window: calls that started before the last decrease are ignored.
+    Callers queue up to `max_queue` deep and are shed once the queue is full
+    or their deadline passes.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        max_queue: int,
+        bucket: Optional[TokenBucket] = None,
+    ) -> None:
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.bucket = bucket
+        self.in_flight = 0
+        self.waiting = 0
+        # Bumped on every decrease, calls record it when they get their slot
+        self.generation = 0
+        self._cond = asyncio.Condition()
+
+    def _has_capacity(self) -> bool:
+        return self.in_flight < int(self.limit)
+
+    def _shed(self, reason: str, timeout: float) -> UpstreamOverloaded:
+        logger.warning(f"Shedding {self.name} request: {reason}")
+        return UpstreamOverloaded(
+            f"Upstream {self.name} is overloaded, retry later",
+            retry_after=max(1, math.ceil(timeout)),
+        )
+
+    async def acquire(self, timeout: float) -> None:
+        if self.waiting >= self.max_queue and not self._has_capacity():
+            raise self._shed("queue is full", timeout)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        self.waiting += 1
+        try:
+            async with asyncio.timeout(timeout):
+                async with self._cond:
+                    await self._cond.wait_for(self._has_capacity)
+                    self.in_flight += 1
+        except TimeoutError:
+            raise self._shed("queue deadline exceeded", timeout)
+        finally:
+            self.waiting -= 1
+
+        try:
+            acquired = not self.bucket or await self.bucket.acquire(deadline)
+        except BaseException:
+            # Cancelled while waiting for a token (deadline, client gone)
+            await self.release()
+            raise
+
+        if not acquired:
+            await self.release()
+            raise self._shed("rate limit deadline exceeded", timeout)
+
+    async def release(self) -> None:
+        async with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def on_success(self) -> None:
+        self.limit = min(self.max_limit, self.limit + 1 / max(self.limit, 1))
+
+    def on_rate_limited(self, generation: int) -> None:
+        if generation != self.generation:
+            # Throttled by the same burst that already halved the limit
+            return
+
+        self.generation += 1
+        self.limit = max(self.min_limit, self.limit / 2)
+        logger.warning(
+            f"{self.name} rate limited, concurrency limit: {int(self.limit)}"
+        )
+
+    @asynccontextmanager
+    async def slot(self, timeout: float) -> AsyncIterator[None]:
+        await self.acquire(timeout=timeout)
+        generation = self.generation
+        try:
+            yield
+        except Exception as e:
+            if is_rate_limited(e):
+                self.on_rate_limited(generation)
+            raise
+        else:
+            self.on_success()
+        finally:
+            await self.release()
+
+
+_buckets: dict[int, TokenBucket] = {}
+_limiters: dict[tuple[int, str], AdaptiveLimiter] = {}
+
+
+def get_upstream_limiter(chain_id: int, method: str) -> AdaptiveLimiter:
+    key = (chain_id, method)
+    if key not in _limiters:
+        rate = settings.rpc_rate_limits.get(chain_id)
+        if rate and chain_id not in _buckets:
+            # Every worker has its own bucket, each gets an equal share of the plan
+            workers = max(1, settings.web_concurrency)
+            _buckets[chain_id] = TokenBucket(
+                rate=rate / workers,
+                burst=math.ceil((settings.rpc_burst or rate) / workers),
+            )
+
+        _limiters[key] = AdaptiveLimiter(
+            name=f"{chain_id}:{method}",
+            initial_limit=settings.rpc_initial_concurrency,
+            min_limit=settings.rpc_min_concurrency,
+            max_limit=settings.rpc_max_concurrency,
+            max_queue=settings.rpc_queue_size,
+            bucket=_buckets.get(chain_id),
+        )
+
+    return _limiters[key]
+
+
+@asynccontextmanager
+async def upstream_slot(chain_id: int, method: str) -> AsyncIterator[None]:
+    """
+    Limiter slot for one upstream call, bounded by the request deadline.
+    """
+    limiter = get_upstream_limiter(chain_id=chain_id, method=method)
+    async with request_deadline():
+        async with limiter.slot(timeout=settings.rpc_queue_timeout):
+            yield
+
+
+def reset_upstream_limiters() -> None:
+    _buckets.clear()
+    _limiters.clear()
@@ -1,10 +1,90 @@
+import asyncio
+from typing import Optional
+
+from aiohttp import ServerTimeoutError
 from eth_typing import BlockIdentifier, BlockNumber, ChecksumAddress
+from loguru import logger
 from web3 import AsyncWeb3
+from web3.exceptions import Web3RPCError
 from web3.types import FilterParams, LogReceipt
 
 from config import settings
+from core.block.limiter import is_rate_limited, upstream_slot
+from core.block.web3 import get_client_chain_id
 from core.exceptions.logs import MaxBlockRangeLimit
 
+# Provider errors meaning "ask for a smaller range" (result count / response size).
+# Nothing generic like "limit exceeded": throttling messages use it too.
+RANGE_TOO_LARGE_MARKERS = (
+    "returned more than",
+    "too many results",
+    "response size",
+    "range is too",
+    "range too",
+    "query timeout",
+)
+
+
+def is_range_too_large(exc: BaseException) -> bool:
+    if is_rate_limited(exc):
+        # Smaller ranges only mean more requests to a throttled provider
+        return False
+
+    if isinstance(exc, (asyncio.TimeoutError, ServerTimeoutError)):
+        return True
+
+    if isinstance(exc, Web3RPCError):
+        message = (exc.message or "").lower()
+        return any(marker in message for marker in RANGE_TOO_LARGE_MARKERS)
+
+    return False
+
+
+class ChunkSizer:
+    """
+    Per-chain eth_getLogs block span (to_block - from_block).
+    Halves on "too many results"/timeout errors, doubles when chunks come back sparse.
+    Growth bisects towards the last failing span; that cap relaxes by ~10% once
+    reached so one dense range doesn't pin the size forever.
+    """
+
+    def __init__(self, span: int, min_span: int, max_span: int) -> None:
+        self.span = span
+        self.min_span = min_span
+        self.max_span = max_span
+        self.ceiling = max_span
+
+    def shrink(self) -> bool:
+        if self.span <= self.min_span:
+            return False
+        self.ceiling = max(self.min_span, self.span - 1)
+        self.span = max(self.min_span, self.span // 2)
+        return True
+
+    def observe(self, results: int) -> None:
+        if results > settings.logs_target_results:
+            self.span = max(self.min_span, self.span // 2)
+        elif results < settings.logs_target_results // 4:
+            if self.span >= self.ceiling:
+                self.ceiling = min(self.max_span, self.ceiling + self.ceiling // 10 + 1)
+            span = self.span * 2 + 1
+            if span > self.ceiling:
+                span = self.span + (self.ceiling - self.span + 1) // 2
+            self.span = min(self.ceiling, span)
+
+
+_chunk_sizers: dict[Optional[int], ChunkSizer] = {}
+
+
+def get_chunk_sizer(chain_id: Optional[int]) -> ChunkSizer:
+    if chain_id not in _chunk_sizers:
+        _chunk_sizers[chain_id] = ChunkSizer(
+            span=settings.max_block_range,
+            min_span=min(settings.logs_min_block_span, settings.max_block_range),
+            max_span=settings.max_block_range,
+        )
+    return _chunk_sizers[chain_id]
+
 
 async def get_logs_by_block_period(
     web3: AsyncWeb3,
@@ -12,16 +92,42 @@ async def get_logs_by_block_period(
     from_block: BlockIdentifier,
     to_block: BlockIdentifier | None = None,
 ) -> list[LogReceipt]:
+    chain_id: Optional[int] = get_client_chain_id(web3)
     if to_block is None:
-        to_block: BlockNumber = await web3.eth.get_block_number()
+        async with upstream_slot(chain_id=chain_id, method="eth_blockNumber"):
+            to_block: BlockNumber = await web3.eth.get_block_number()
 
     if to_block - from_block > settings.max_block_range:
         raise MaxBlockRangeLimit(f"Max block range limit is {settings.max_block_range}")
 
-    filter_params: FilterParams = {
-        "address": address,
-        "fromBlock": from_block,
-        "toBlock": to_block,
-    }
+    sizer = get_chunk_sizer(chain_id=chain_id)
+    logs: list[LogReceipt] = []
+
+    start = from_block
+    while start <= to_block:
+        end = min(start + sizer.span, to_block)
+        filter_params: FilterParams = {
+            "address": address,
+            "fromBlock": start,
+            "toBlock": end,
+        }
+
+        try:
+            # One limiter slot (and rate limit token) per RPC call, not per range
+            async with upstream_slot(chain_id=chain_id, method="eth_getLogs"):
+                chunk: list[LogReceipt] = await web3.eth.get_logs(
+                    filter_params=filter_params
+                )
+        except Exception as e:
+            if is_range_too_large(e) and end > start and sizer.shrink():
+                logger.info(
+                    f"getLogs {start}-{end} too large, chunk span now {sizer.span}"
+                )
+                continue
+            raise
+
+        sizer.observe(results=len(chunk))
+        logs.extend(chunk)
+        start = end + 1
 
-    return await web3.eth.get_logs(filter_params=filter_params)
+    return logs
@@ -0,0 +1,82 @@
+import asyncio
+from typing import Optional
+
+import orjson
+from loguru import logger
+from web3.types import LogReceipt
+
+from config import settings
+from core.block.head import add_head_listener
+from core.block.logs import get_logs_by_block_period
+from core.block.web3 import DEFAULT_CHAIN_ID, get_web3_client
+from schemas.logs import LogResponse
+
+_subscribers: set[asyncio.Queue] = set()
+_last_block: Optional[int] = None
+
+
+def subscribe_logs() -> asyncio.Queue:
+    queue: asyncio.Queue = asyncio.Queue(maxsize=settings.logs_stream_queue_size)
+    _subscribers.add(queue)
+    logger.debug(f"Log stream subscriber added, total: {len(_subscribers)}")
+    return queue
+
+
+def unsubscribe_logs(queue: asyncio.Queue) -> None:
+    _subscribers.discard(queue)
+
+
+def format_logs_event(from_block: int, to_block: int, logs: list[LogReceipt]) -> bytes:
+    payload = LogResponse(logs=logs).model_dump(by_alias=True)
+    payload.update(from_block=from_block, to_block=to_block)
+    return b"id: %d\nevent: logs\ndata: %s\n\n" % (to_block, orjson.dumps(payload))
+
+
+def publish(event: Optional[bytes]) -> None:
+    for queue in list(_subscribers):
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Slow consumer: drop it instead of buffering without bound
+            logger.warning("Log stream subscriber is too slow, disconnecting")
+            _subscribers.discard(queue)
+            queue.get_nowait()
+            queue.put_nowait(None)
+
+
+async def broadcast_new_logs(chain_id: int, block_number: int) -> None:
+    """
+    One eth_getLogs per new head for all connected subscribers.
+    """
+    global _last_block
+
+    if chain_id != DEFAULT_CHAIN_ID:
+        return
+
+    if not _subscribers:
+        _last_block = block_number
+        return
+
+    from_block = block_number if _last_block is None else _last_block + 1
+    from_block = max(from_block, block_number - settings.max_block_range)
+    if from_block > block_number:
+        return
+
+    web3 = get_web3_client(chain_id=chain_id)
+    logs: list[LogReceipt] = await get_logs_by_block_period(
+        web3=web3,
+        address=settings.CONTRACT_ADDRESS,
+        from_block=from_block,
+        to_block=block_number,
+    )
+
+    _last_block = block_number
+    if logs:
+        publish(
+            format_logs_event(from_block=from_block, to_block=block_number, logs=logs)
+        )
+
+
+def init_log_stream() -> None:
+    if settings.logs_stream_enabled:
+        add_head_listener(broadcast_new_logs)
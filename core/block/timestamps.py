@@ -0,0 +1,205 @@
+import asyncio
+import bisect
+from typing import Literal, Optional
+
+from loguru import logger
+from redis.asyncio import Redis
+from web3 import AsyncWeb3
+
+from config import settings
+from core.block.limiter import upstream_slot
+from core.cache.utils import delete_cache, get_hash_cache, set_hash_cache
+from core.exceptions.timestamps import BlockTimestampNotFound
+
+
+class BlockTimeIndex:
+    """
+    Sampled (block_number, timestamp) pairs of one chain, sorted by block number.
+    Timestamps are resolved by interpolation search between the nearest samples;
+    every probed block becomes a sample, so repeated lookups need no RPC calls.
+    Past `max_samples` every other sample is dropped, evenly coarsening the index.
+    """
+
+    def __init__(self, chain_id: int, max_samples: int) -> None:
+        self.chain_id = chain_id
+        self.max_samples = max_samples
+        self.blocks: list[int] = []
+        self.timestamps: list[int] = []
+        self.loaded = False
+        # Set by thin() until the persisted samples are rewritten
+        self.thinned = False
+        # Guards the initial load only, lookups probe concurrently
+        self.lock = asyncio.Lock()
+
+    def add(self, block_number: int, timestamp: int) -> None:
+        position = bisect.bisect_left(self.blocks, block_number)
+        if position < len(self.blocks) and self.blocks[position] == block_number:
+            return
+        self.blocks.insert(position, block_number)
+        self.timestamps.insert(position, timestamp)
+
+    def thin(self) -> bool:
+        if len(self.blocks) <= self.max_samples:
+            return False
+
+        # Keep the first and the last sample: they bound every search
+        keep = [*range(0, len(self.blocks) - 1, 2), len(self.blocks) - 1]
+        self.blocks = [self.blocks[position] for position in keep]
+        self.timestamps = [self.timestamps[position] for position in keep]
+        self.thinned = True
+        return True
+
+    def bracket(self, timestamp: int) -> tuple[Optional[int], Optional[int]]:
+        """
+        Positions of the last sample at or before `timestamp` and the first after it.
+        """
+        position = bisect.bisect_right(self.timestamps, timestamp)
+        before = position - 1 if position > 0 else None
+        after = position if position < len(self.timestamps) else None
+        return before, after
+
+    @property
+    def cache_key(self) -> str:
+        return f"block_time:{self.chain_id}"
+
+
+_indexes: dict[int, BlockTimeIndex] = {}
+
+
+def get_block_time_index(chain_id: int) -> BlockTimeIndex:
+    if chain_id not in _indexes:
+        _indexes[chain_id] = BlockTimeIndex(
+            chain_id=chain_id, max_samples=settings.block_time_max_samples
+        )
+    return _indexes[chain_id]
+
+
+async def _block_timestamp(
+    web3: AsyncWeb3, chain_id: int, block_identifier: int | str
+) -> tuple[int, int]:
+    async with upstream_slot(chain_id=chain_id, method="eth_getBlockByNumber"):
+        block = await web3.eth.get_block(block_identifier)
+    return block["number"], block["timestamp"]
+
+
+async def _load(index: BlockTimeIndex, cache: Redis) -> None:
+    try:
+        samples: dict[str, str] = await get_hash_cache(
+            client=cache, key=index.cache_key
+        )
+    except Exception as e:
+        logger.warning(f"Block time index load failed for {index.chain_id}: {e}")
+        return
+
+    for block_number, timestamp in samples.items():
+        index.add(int(block_number), int(timestamp))
+    # Other workers keep adding to the hash, the first to load it past the cap thins it
+    index.thin()
+    index.loaded = True
+    logger.info(f"Block time index for {index.chain_id}: {len(samples)} samples")
+
+
+async def _save(index: BlockTimeIndex, cache: Redis, probed: dict[int, int]) -> None:
+    """
+    Add the probed samples to the shared hash, or replace it once thinned.
+    """
+    try:
+        if index.thinned:
+            index.thinned = False
+            await delete_cache(client=cache, key=index.cache_key)
+            probed = dict(zip(index.blocks, index.timestamps))
+            logger.info(
+                f"Block time index for {index.chain_id} thinned to {len(probed)} samples"
+            )
+        await set_hash_cache(client=cache, key=index.cache_key, mapping=probed)
+    except Exception as e:
+        logger.warning(f"Block time index save failed for {index.chain_id}: {e}")
+
+
+async def _resolve(
+    index: BlockTimeIndex, web3: AsyncWeb3, timestamp: int
+) -> tuple[Optional[int], dict[int, int]]:
+    """
+    Last block with block.timestamp <= timestamp (None if before genesis),
+    plus the samples probed on the way.
+    Runs concurrently with other lookups: the bracket is re-read after every probe.
+    """
+    probed: dict[int, int] = {}
+
+    async def probe(block_identifier: int | str) -> int:
+        block_number, block_timestamp = await _block_timestamp(
+            web3=web3, chain_id=index.chain_id, block_identifier=block_identifier
+        )
+        index.add(block_number, block_timestamp)
+        if block_identifier != "latest":  # head moves, keep it in memory only
+            probed[block_number] = block_timestamp
+        return block_number
+
+    before, after = index.bracket(timestamp)
+    if after is None:
+        await probe("latest")
+        before, after = index.bracket(timestamp)
+        if after is None:
+            return index.blocks[-1], probed
+
+    if before is None:
+        if index.blocks[0] == 0:
+            return None, probed
+        await probe(0)
+        before, after = index.bracket(timestamp)
+        if before is None:
+            return None, probed
+
+    for attempt in range(settings.block_time_max_probes):
+        low, high = index.blocks[before], index.blocks[after]
+        if high - low <= 1:
+            return low, probed
+
+        low_ts, high_ts = index.timestamps[before], index.timestamps[after]
+        guess = low + (timestamp - low_ts) * (high - low) // max(high_ts - low_ts, 1)
+        if attempt % 2:
+            guess = (guess + (low + high) // 2) // 2  # damp skewed block times
+        await probe(min(max(guess, low + 1), high - 1))
+        before, after = index.bracket(timestamp)
+
+    raise BlockTimestampNotFound(
+        f"Block for timestamp {timestamp} not found in {settings.block_time_max_probes} probes"
+    )
+
+
+async def get_block_by_timestamp(
+    web3: AsyncWeb3,
+    cache: Redis,
+    chain_id: int,
+    timestamp: int,
+    mode: Literal["before", "after"] = "before",
+) -> Optional[int]:
+    """
+    "before": last block with timestamp <= `timestamp` (state at that time).
+    "after": first block with timestamp >= `timestamp`.
+    None when no such block exists yet.
+    """
+    index = get_block_time_index(chain_id=chain_id)
+
+    if not index.loaded:
+        async with index.lock:
+            if not index.loaded:
+                await _load(index=index, cache=cache)
+
+    target = timestamp if mode == "before" else timestamp - 1
+    block_number, probed = await _resolve(index=index, web3=web3, timestamp=target)
+
+    if probed:
+        logger.debug(
+            f"Block time index {chain_id}: {len(probed)} probes for {timestamp}"
+        )
+        index.thin()
+        await _save(index=index, cache=cache, probed=probed)
+
+    if mode == "before":
+        return block_number
+
+    next_block = 0 if block_number is None else block_number + 1
+    if next_block > index.blocks[-1] and index.timestamps[-1] < timestamp:
+        return None
+    return next_block
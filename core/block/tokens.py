@@ -0,0 +1,122 @@
+import asyncio
+from typing import Optional, Sequence
+
+from eth_abi import decode, encode
+from eth_abi.exceptions import DecodingError
+from eth_typing import BlockNumber, ChecksumAddress
+from loguru import logger
+from web3 import AsyncWeb3
+from web3.exceptions import ContractLogicError
+
+from config import settings
+from core.block.limiter import upstream_slot
+from core.block.web3 import get_client_chain_id
+
+# Multicall3, same address on every EVM chain: https://www.multicall3.com
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+AGGREGATE3_SELECTOR = bytes.fromhex("82ad56cb")  # aggregate3((address,bool,bytes)[])
+BALANCE_OF_SELECTOR = bytes.fromhex("70a08231")  # balanceOf(address)
+
+TokenHolder = tuple[ChecksumAddress, ChecksumAddress]
+
+
+def _balance_of_calldata(holder: ChecksumAddress) -> bytes:
+    return BALANCE_OF_SELECTOR + encode(["address"], [holder])
+
+
+def _decode_balance(success: bool, data: bytes) -> Optional[int]:
+    # Non-ERC-20 or reverting token: no balance
+    if not success or len(data) < 32:
+        return None
+    return int.from_bytes(data[:32], "big")
+
+
+async def _aggregate_balances(
+    web3: AsyncWeb3, pairs: Sequence[TokenHolder], block_number: BlockNumber
+) -> list[Optional[int]]:
+    calls = [(token, True, _balance_of_calldata(holder)) for token, holder in pairs]
+    calldata = AGGREGATE3_SELECTOR + encode(["(address,bool,bytes)[]"], [calls])
+
+    async with upstream_slot(chain_id=get_client_chain_id(web3), method="eth_call"):
+        raw: bytes = await web3.eth.call(
+            {"to": MULTICALL3_ADDRESS, "data": calldata}, block_identifier=block_number
+        )
+    (results,) = decode(["(bool,bytes)[]"], raw)
+    return [_decode_balance(success, data) for success, data in results]
+
+
+async def _single_balance(
+    web3: AsyncWeb3,
+    token: ChecksumAddress,
+    holder: ChecksumAddress,
+    block_number: BlockNumber,
+    semaphore: asyncio.Semaphore,
+) -> Optional[int]:
+    try:
+        async with (
+            semaphore,
+            upstream_slot(chain_id=get_client_chain_id(web3), method="eth_call"),
+        ):
+            raw: bytes = await web3.eth.call(
+                {"to": token, "data": _balance_of_calldata(holder)},
+                block_identifier=block_number,
+            )
+    except ContractLogicError:
+        return None
+    return _decode_balance(True, raw)
+
+
+async def _has_multicall(web3: AsyncWeb3, block_number: BlockNumber) -> bool:
+    async with upstream_slot(chain_id=get_client_chain_id(web3), method="eth_getCode"):
+        code: bytes = await web3.eth.get_code(
+            MULTICALL3_ADDRESS, block_identifier=block_number
+        )
+    return len(code) > 0
+
+
+async def get_token_balances_by_block(
+    web3: AsyncWeb3, pairs: Sequence[TokenHolder], block_number: BlockNumber
+) -> list[Optional[int]]:
+    """
+    balanceOf for every (token, holder) pair, one Multicall3 eth_call per chunk.
+    Falls back to one eth_call per pair (token_balances_fallback_concurrency at a
+    time) only when Multicall3 is not deployed at that block; other RPC errors
+    (rate limits, pruned state) are raised.
+    """
+    balances: list[Optional[int]] = []
+    size = settings.token_balances_chunk_size
+
+    for start in range(0, len(pairs), size):
+        chunk = pairs[start : start + size]
+        try:
+            balances.extend(
+                await _aggregate_balances(
+                    web3=web3, pairs=chunk, block_number=block_number
+                )
+            )
+            continue
+        except (ContractLogicError, DecodingError):
+            # A call to an address without code returns no data
+            if await _has_multicall(web3=web3, block_number=block_number):
+                raise
+
+        logger.warning(
+            f"Multicall3 is not deployed at {block_number}, calling tokens directly"
+        )
+        semaphore = asyncio.Semaphore(settings.token_balances_fallback_concurrency)
+        balances.extend(
+            await asyncio.gather(
+                *(
+                    _single_balance(
+                        web3=web3,
+                        token=token,
+                        holder=holder,
+                        block_number=block_number,
+                        semaphore=semaphore,
+                    )
+                    for token, holder in chunk
+                )
+            )
+        )
+
+    return balances
@@ -5,6 +5,8 @@ from web3 import AsyncHTTPProvider, AsyncWeb3
 from config import settings
 from core.exceptions.client import EmptyClientsException
 
+DEFAULT_CHAIN_ID = 43114  # Avalanche
+
 AVAILABLE_CHAINS = {
     1: settings.ETH_RPC,
     43114: settings.AVAX_RPC,
@@ -33,7 +35,7 @@ async def shutdown_web3_pool() -> None:
 
 def get_web3_client(chain_id: Optional[int] = None) -> AsyncWeb3:
     if chain_id is None:
-        chain_id = 43114  # Default Avalanche
+        chain_id = DEFAULT_CHAIN_ID
 
     if not _web3_clients:
         raise RuntimeError("Web3 clients not initialized")
@@ -42,3 +44,14 @@ def get_web3_client(chain_id: Optional[int] = None) -> AsyncWeb3:
         raise ValueError(f"Chain ID {chain_id} is not supported")
 
     return _web3_clients[chain_id]
+
+
+def get_web3_clients() -> dict[int, AsyncWeb3]:
+    return dict(_web3_clients)
+
+
+def get_client_chain_id(web3: AsyncWeb3) -> Optional[int]:
+    for chain_id, client in _web3_clients.items():
+        if client is web3:
+            return chain_id
+    return None
@@ -0,0 +1,72 @@
+import time
+
+from loguru import logger
+
+from config import settings
+
+
+class CircuitBreaker:
+    """
+    Skips cache calls for `reset_timeout` seconds after `failure_threshold`
+    consecutive failures, then lets a single probe call through (half-open).
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        if self._opened_at is None:
+            return True
+
+        if self._probing:
+            return False
+
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._probing = True
+            return True
+
+        return False
+
+    def record_success(self) -> None:
+        if self._opened_at is not None:
+            logger.info("Cache circuit closed")
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def release_probe(self) -> None:
+        """
+        The probe ended without an answer from Redis (cancelled): let the next call probe.
+        """
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probing = False
+
+        if self._opened_at is not None or self._failures >= self.failure_threshold:
+            if self._opened_at is None:
+                logger.warning(
+                    f"Cache circuit opened after {self._failures} failures, "
+                    f"skipping cache for {self.reset_timeout}s"
+                )
+            self._opened_at = time.monotonic()
+
+    def reset(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+
+cache_breaker = CircuitBreaker(
+    failure_threshold=settings.redis_breaker_failure_threshold,
+    reset_timeout=settings.redis_breaker_reset_timeout,
+)
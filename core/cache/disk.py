@@ -0,0 +1,222 @@
+import asyncio
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Sequence
+
+from loguru import logger
+
+from config import settings
+
+# Entries are evicted down to this share of max_bytes, so eviction runs rarely
+EVICTION_LOW_WATERMARK = 0.9
+# Reads refresh the LRU timestamp at most this often (seconds), sparing writes
+ACCESS_RESOLUTION = 60.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE TABLE IF NOT EXISTS stats (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    size INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO stats (id, size) VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    UPDATE stats SET size = size + NEW.size;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries BEGIN
+    UPDATE stats SET size = size - OLD.size + NEW.size;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE stats SET size = size - OLD.size;
+END;
+"""
+
+
+class DiskCache:
+    """
+    SQLite tier below Redis for results that never change (finalized blocks).
+    Keys are the Redis keys (chain, method and params). Least recently read
+    entries are evicted once values exceed `max_bytes`.
+    Shared by all workers of the host through WAL mode.
+    """
+
+    def __init__(self, path: str, max_bytes: int) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            path, timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def get_many(self, keys: Sequence[str]) -> list[Optional[bytes]]:
+        if not keys:
+            return []
+
+        now = time.time()
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            rows = dict(
+                self._conn.execute(
+                    f"SELECT key, value FROM entries WHERE key IN ({placeholders})",
+                    keys,
+                ).fetchall()
+            )
+            if rows:
+                self._conn.execute(
+                    f"UPDATE entries SET accessed = ? "
+                    f"WHERE key IN ({','.join('?' * len(rows))}) AND accessed < ?",
+                    (now, *rows, now - ACCESS_RESOLUTION),
+                )
+        return [rows.get(key) for key in keys]
+
+    def set_many(self, values: dict[str, bytes]) -> None:
+        if not values:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO entries (key, value, size, accessed) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (key) DO UPDATE SET "
+                    "value = excluded.value, size = excluded.size, accessed = excluded.accessed",
+                    [(key, value, len(value), now) for key, value in values.items()],
+                )
+                self._evict()
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _size(self) -> int:
+        return self._conn.execute("SELECT size FROM stats WHERE id = 0").fetchone()[0]
+
+    def _evict(self) -> int:
+        size: int = self._size()
+        if size <= self.max_bytes:
+            return 0
+
+        excess = size - self.max_bytes * EVICTION_LOW_WATERMARK
+        keys: list[tuple[str]] = []
+        for key, entry_size in self._conn.execute(
+            "SELECT key, size FROM entries ORDER BY accessed"
+        ):
+            keys.append((key,))
+            excess -= entry_size
+            if excess <= 0:
+                break
+
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", keys)
+        logger.info(f"Disk cache evicted {len(keys)} entries")
+        return len(keys)
+
+    def stats(self) -> tuple[int, int]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            return entries, self._size()
+
+    def compact(self) -> None:
+        """
+        Recount sizes, evict down to the limit and give freed pages back to the disk.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "UPDATE stats SET size = (SELECT COALESCE(SUM(size), 0) FROM entries)"
+                )
+                self._evict()
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            self._conn.execute("VACUUM")
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_disk_cache: Optional[DiskCache] = None
+
+
+def init_disk_cache() -> None:
+    global _disk_cache
+    if settings.disk_cache_path:
+        _disk_cache = DiskCache(
+            path=settings.disk_cache_path, max_bytes=settings.disk_cache_max_bytes
+        )
+        logger.info(f"Disk cache at {settings.disk_cache_path}")
+
+
+def shutdown_disk_cache() -> None:
+    global _disk_cache
+    if _disk_cache is not None:
+        _disk_cache.close()
+        _disk_cache = None
+
+
+async def get_many_disk_cache(keys: Sequence[str]) -> list[Optional[bytes]]:
+    """
+    Never raises: the disk tier is an optimization, the request goes on without it.
+    """
+    if _disk_cache is None:
+        return [None] * len(keys)
+
+    try:
+        return await asyncio.to_thread(_disk_cache.get_many, keys)
+    except Exception as e:
+        logger.warning(f"Disk cache get failed: {e}")
+        return [None] * len(keys)
+
+
+async def get_disk_cache(key: str) -> Optional[bytes]:
+    return (await get_many_disk_cache([key]))[0]
+
+
+async def set_disk_cache(values: dict[str, bytes]) -> None:
+    if _disk_cache is None or not values:
+        return
+
+    try:
+        await asyncio.to_thread(_disk_cache.set_many, values)
+    except Exception as e:
+        logger.warning(f"Disk cache set failed for {len(values)} entries: {e}")
+
+
+def main() -> None:
+    """
+    python -m core.cache.disk [path]: compact the disk cache
+    """
+    path = sys.argv[1] if len(sys.argv) > 1 else settings.disk_cache_path
+    if not path:
+        sys.exit("Disk cache is disabled (DISK_CACHE_PATH is empty)")
+
+    cache = DiskCache(path=path, max_bytes=settings.disk_cache_max_bytes)
+    file_size = Path(path).stat().st_size
+    cache.compact()
+    entries, size = cache.stats()
+    cache.close()
+    print(
+        f"{path}: {entries} entries, {size} bytes of values, "
+        f"file {file_size} -> {Path(path).stat().st_size} bytes"
+    )
+
+
+if __name__ == "__main__":
+    main()
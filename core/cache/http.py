@@ -0,0 +1,64 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+from config import settings
+from core.block.head import get_tracked_head
+
+
+def build_etag(payload: bytes | str) -> str:
+    if isinstance(payload, str):
+        payload = payload.encode()
+    return f'"{hashlib.blake2b(payload, digest_size=16).hexdigest()}"'
+
+
+def is_finalized(chain_id: int, block_number: Optional[int]) -> bool:
+    if block_number is None:
+        return False
+
+    head: Optional[int] = get_tracked_head(chain_id=chain_id)
+    if head is None:
+        return False
+
+    depth: int = settings.finality_depth.get(chain_id, settings.default_finality_depth)
+    return block_number <= head - depth
+
+
+def build_cache_control(chain_id: int, block_number: Optional[int]) -> str:
+    """
+    Finalized blocks never change; anything near (or relative to) the head is short-lived.
+    """
+    if is_finalized(chain_id=chain_id, block_number=block_number):
+        return f"public, max-age={settings.http_finalized_max_age}, immutable"
+    return f"public, max-age={settings.http_head_max_age}"
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match: Optional[str] = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def cached_json_response(
+    request: Request, payload: bytes | str, cache_control: str
+) -> Response:
+    """
+    JSON response with ETag/Cache-Control, or an empty 304 when the client has it.
+    `payload` is sent as-is, so cached bodies are never deserialized.
+    """
+    etag: str = build_etag(payload)
+    headers: dict[str, str] = {"ETag": etag, "Cache-Control": cache_control}
+
+    if etag_matches(request=request, etag=etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=payload, media_type="application/json", headers=headers)
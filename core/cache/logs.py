@@ -0,0 +1,159 @@
+import bisect
+from typing import Any, Optional
+
+import orjson
+from loguru import logger
+from redis.asyncio import Redis
+from web3 import AsyncWeb3
+
+from config import settings
+from core.block.logs import get_logs_by_block_period
+from core.block.web3 import DEFAULT_CHAIN_ID
+from core.cache.disk import set_disk_cache
+from core.cache.http import is_finalized
+from core.cache.utils import (
+    build_logs_cache_key,
+    build_logs_segment_cache_key,
+    build_logs_segments_cache_key,
+    get_cache,
+    get_disk_backed_cache,
+    get_many_cache,
+    set_cache,
+    set_many_cache,
+)
+from schemas.logs import LogResponse
+
+
+async def get_logs_chunk(
+    web3: AsyncWeb3,
+    cache: Redis,
+    address: str,
+    from_block: int,
+    to_block: int,
+    write_disk: bool = True,
+) -> list[dict[str, Any]]:
+    """
+    Logs of one block range in aliased form, read through Redis and the disk tier
+    under the same keys as /logs. Misses are fetched and cached; `write_disk=False`
+    keeps bulk reads (exports) from evicting hot disk cache entries.
+    """
+    cache_key: str = build_logs_cache_key(
+        chain_id=DEFAULT_CHAIN_ID,
+        address=address,
+        from_block=from_block,
+        to_block=to_block,
+    )
+    cached: Optional[bytes | str] = None
+    try:
+        cached = await get_cache(client=cache, key=cache_key)
+    except Exception as e:
+        logger.warning(f"Cache get failed for {cache_key}: {e}")
+
+    finalized: bool = is_finalized(chain_id=DEFAULT_CHAIN_ID, block_number=to_block)
+    if not cached and finalized:
+        cached = await get_disk_backed_cache(client=cache, key=cache_key)
+
+    if cached:
+        return orjson.loads(cached)["logs"]
+
+    result = await get_logs_by_block_period(
+        web3=web3,
+        address=address,
+        from_block=from_block,
+        to_block=to_block,
+    )
+
+    response: dict[str, Any] = LogResponse(logs=result).model_dump(by_alias=True)
+    payload: bytes = orjson.dumps(response)
+    try:
+        await set_cache(
+            client=cache, key=cache_key, value=payload, ttl=settings.cache_ttl
+        )
+    except Exception as e:
+        logger.warning(f"Cache set failed for {cache_key}: {e}")
+
+    if finalized and write_disk:
+        await set_disk_cache({cache_key: payload})
+
+    return response["logs"]
+
+
+def log_position(log: dict[str, Any]) -> tuple[int, int]:
+    return log["blockNumber"], log["logIndex"]
+
+
+async def set_log_segments(
+    cache: Redis, cache_key: str, logs: list[dict[str, Any]]
+) -> None:
+    """
+    Store a /logs range as segments of logs_max_page_size logs plus an index of
+    their last positions, so a page is read without loading the whole range.
+    """
+    size: int = settings.logs_max_page_size
+    segments: list[list[dict[str, Any]]] = [
+        logs[start : start + size] for start in range(0, len(logs), size)
+    ]
+    values: dict[str, bytes] = {
+        build_logs_segment_cache_key(cache_key, index): orjson.dumps(segment)
+        for index, segment in enumerate(segments)
+    }
+    values[build_logs_segments_cache_key(cache_key)] = orjson.dumps(
+        {
+            "size": size,
+            "count": len(logs),
+            "ends": [log_position(segment[-1]) for segment in segments],
+        }
+    )
+
+    try:
+        await set_many_cache(client=cache, values=values, ttl=settings.cache_ttl)
+    except Exception as e:
+        logger.warning(f"Cache set failed for segments of {cache_key}: {e}")
+
+
+async def get_log_segments(
+    cache: Redis, cache_key: str, after: Optional[tuple[int, int]]
+) -> Optional[tuple[list[dict[str, Any]], int]]:
+    """
+    Logs following position `after` (block number, log index) from the segment
+    holding it and the next one (a page never spans more), and the number of logs
+    left in the range from there. None when the segments are not cached.
+    """
+    index_key: str = build_logs_segments_cache_key(cache_key)
+    try:
+        raw_index: Optional[bytes | str] = await get_cache(client=cache, key=index_key)
+    except Exception as e:
+        logger.warning(f"Cache get failed for {index_key}: {e}")
+        return None
+
+    if not raw_index:
+        return None
+
+    index: dict[str, Any] = orjson.loads(raw_index)
+    ends: list[tuple[int, int]] = [tuple(end) for end in index["ends"]]
+    first: int = 0 if after is None else bisect.bisect_right(ends, after)
+    keys: list[str] = [
+        build_logs_segment_cache_key(cache_key, segment)
+        for segment in range(first, min(first + 2, len(ends)))
+    ]
+    if not keys:
+        return [], 0
+
+    try:
+        segments: list[Optional[bytes | str]] = await get_many_cache(
+            client=cache, keys=keys
+        )
+    except Exception as e:
+        logger.warning(f"Cache get failed for segments of {cache_key}: {e}")
+        return None
+
+    if not all(segments):
+        return None
+
+    logs: list[dict[str, Any]] = [
+        log for segment in segments for log in orjson.loads(segment)
+    ]
+    start: int = (
+        0 if after is None else bisect.bisect_right(logs, after, key=log_position)
+    )
+    return logs[start:], index["count"] - first * index["size"] - start
@@ -1,19 +1,99 @@
-from typing import Optional
+from typing import Any, Optional
+from urllib.parse import unquote, urlsplit
 
 from redis import asyncio as redis_async
+from redis.asyncio.cluster import RedisCluster
+from redis.asyncio.sentinel import Sentinel
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import MaxConnectionsError
 
 from config import settings
 
+CLUSTER_SCHEMES = ("redis+cluster", "rediss+cluster")
+SENTINEL_SCHEMES = ("redis+sentinel", "rediss+sentinel")
+
+# Raised by the pools when every connection is in use
+POOL_EXHAUSTED_MESSAGES = ("Too many connections", "No connection available.")
+
 _redis_client: Optional[redis_async.Redis] = None
 
 
+def is_pool_exhausted(exc: BaseException) -> bool:
+    """
+    A traffic burst used up the pool: Redis itself is fine.
+    """
+    if isinstance(exc, MaxConnectionsError):
+        return True
+    return isinstance(exc, RedisConnectionError) and str(exc) in POOL_EXHAUSTED_MESSAGES
+
+
+def _connection_kwargs() -> dict[str, Any]:
+    return {
+        "encoding": "utf-8",
+        "decode_responses": True,
+        "max_connections": settings.redis_max_connections,
+        "socket_timeout": settings.redis_socket_timeout,
+        "socket_connect_timeout": settings.redis_socket_connect_timeout,
+        "health_check_interval": settings.redis_health_check_interval,
+    }
+
+
+def _build_sentinel_client(url: str) -> redis_async.Redis:
+    """
+    redis+sentinel://[:password@]host1:26379,host2:26379/service_name[/db]
+    """
+    parsed = urlsplit(url)
+    netloc = parsed.netloc.rsplit("@", 1)[-1]
+    password = unquote(parsed.password) if parsed.password else None
+
+    sentinels: list[tuple[str, int]] = []
+    for node in netloc.split(","):
+        host, _, port = node.partition(":")
+        sentinels.append((host, int(port or 26379)))
+
+    path = [part for part in parsed.path.split("/") if part]
+    if not path:
+        raise ValueError("Sentinel URL must contain service name")
+    service_name = path[0]
+    db = int(path[1]) if len(path) > 1 else 0
+
+    kwargs = _connection_kwargs()
+    kwargs.pop("health_check_interval")
+    sentinel = Sentinel(
+        sentinels,
+        socket_timeout=settings.redis_socket_timeout,
+        socket_connect_timeout=settings.redis_socket_connect_timeout,
+    )
+    return sentinel.master_for(
+        service_name,
+        db=db,
+        password=password,
+        ssl=parsed.scheme.startswith("rediss"),
+        **kwargs,
+    )
+
+
+def build_redis_client(url: str) -> redis_async.Redis:
+    scheme = urlsplit(url).scheme
+
+    if scheme in CLUSTER_SCHEMES:
+        return RedisCluster.from_url(
+            url.replace("+cluster", "", 1), **_connection_kwargs()
+        )
+
+    if scheme in SENTINEL_SCHEMES:
+        return _build_sentinel_client(url)
+
+    # Blocking pool: a burst waits briefly for a connection instead of failing
+    pool = redis_async.BlockingConnectionPool.from_url(
+        url, timeout=settings.redis_pool_timeout, **_connection_kwargs()
+    )
+    return redis_async.Redis.from_pool(pool)
+
+
 async def init_redis() -> None:
     global _redis_client
-    _redis_client = redis_async.from_url(
-        settings.REDIS_URL,
-        encoding="utf-8",
-        decode_responses=True,
-    )
+    _redis_client = build_redis_client(settings.REDIS_URL)
 
 
 async def get_redis_client() -> redis_async.Redis:
@@ -24,4 +104,4 @@ async def get_redis_client() -> redis_async.Redis:
 
 async def shutdown_redis() -> None:
     if _redis_client:
-        await _redis_client.close()
+        await _redis_client.aclose()
@@ -1,20 +1,217 @@
 import hashlib
-from typing import Optional
+from typing import Any, Awaitable, Callable, Optional, Sequence, TypeVar
 
+import orjson
+from loguru import logger
 from redis.asyncio import Redis
 
+from config import settings
+from core.block.errors import negative_cache_ttl
+from core.cache.breaker import cache_breaker
+from core.cache.disk import get_disk_cache
+from core.cache.redis import is_pool_exhausted
+from core.exceptions.request import DeadlineExceeded
+from core.request import request_deadline
+
+T = TypeVar("T")
+
+
+async def _guarded(call: Callable[[], Awaitable[T]], default: T) -> T:
+    """
+    Run a cache call through the circuit breaker, bounded by the request deadline.
+    Returns `default` without touching Redis while the circuit is open, and when
+    no pooled connection is free.
+    """
+    if not cache_breaker.allow():
+        return default
+
+    try:
+        async with request_deadline():
+            result = await call()
+    except DeadlineExceeded:
+        # The request ran out of time, Redis is not at fault
+        cache_breaker.release_probe()
+        raise
+    except Exception as e:
+        if is_pool_exhausted(e):
+            # Every pooled connection is busy (a burst), not a Redis failure
+            cache_breaker.release_probe()
+            logger.debug(f"Redis pool exhausted, skipping cache call: {e}")
+            return default
+        cache_breaker.record_failure()
+        raise
+    except BaseException:
+        cache_breaker.release_probe()
+        raise
+
+    cache_breaker.record_success()
+    return result
+
 
 async def get_cache(client: Redis, key: str) -> Optional[str]:
-    return await client.get(name=key)
+    return await _guarded(lambda: client.get(name=key), default=None)
 
 
 async def set_cache(client: Redis, key: str, value: bytes, ttl: int) -> bool:
-    return await client.setex(name=key, time=ttl, value=value)
+    return await _guarded(
+        lambda: client.setex(name=key, time=ttl, value=value), default=False
+    )
 
 
 async def delete_cache(client: Redis, key: str) -> None:
-    await client.delete(key)
+    await _guarded(lambda: client.delete(key), default=None)
+
+
+async def get_hash_cache(client: Redis, key: str) -> dict[str, str]:
+    return await _guarded(lambda: client.hgetall(key), default={})
+
+
+async def set_hash_cache(client: Redis, key: str, mapping: dict[Any, Any]) -> int:
+    return await _guarded(lambda: client.hset(key, mapping=mapping), default=0)
+
+
+async def acquire_cache_lock(client: Redis, key: str, ttl: int) -> bool:
+    return bool(
+        await _guarded(lambda: client.set(key, "1", nx=True, ex=ttl), default=False)
+    )
+
+
+async def get_many_cache(client: Redis, keys: Sequence[str]) -> list[Optional[str]]:
+    """
+    Fetch several keys in one round trip.
+    Pipeline (not MGET) so keys may live in different cluster slots.
+    """
+    if not keys:
+        return []
+
+    async def _call() -> list[Optional[str]]:
+        async with client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.get(key)
+            return await pipe.execute()
+
+    return await _guarded(_call, default=[None] * len(keys))
+
+
+async def set_many_cache(client: Redis, values: dict[str, bytes], ttl: int) -> bool:
+    if not values:
+        return True
+
+    async def _call() -> bool:
+        async with client.pipeline(transaction=False) as pipe:
+            for key, value in values.items():
+                pipe.setex(key, ttl, value)
+            results: list[Any] = await pipe.execute()
+        return all(results)
+
+    return await _guarded(_call, default=False)
+
+
+async def get_disk_backed_cache(client: Redis, key: str) -> Optional[bytes]:
+    """
+    Disk tier lookup for a finalized result missing from Redis.
+    Hits are copied back to Redis.
+    """
+    stored: Optional[bytes] = await get_disk_cache(key)
+    if stored is not None:
+        try:
+            await set_cache(
+                client=client, key=key, value=stored, ttl=settings.cache_ttl
+            )
+        except Exception as e:
+            logger.warning(f"Cache set failed for {key}: {e}")
+    return stored
+
+
+async def get_cache_with_error(
+    client: Redis, key: str
+) -> tuple[Optional[str], Optional[dict[str, Any]]]:
+    """
+    Cached value and cached (negative) error for `key`, in one round trip.
+    """
+    cached, error = await get_many_cache(
+        client=client, keys=[key, build_error_cache_key(key)]
+    )
+    return cached, orjson.loads(error) if error else None
+
+
+async def set_error_cache(
+    client: Redis, key: str, status_code: int, detail: str, ttl: int
+) -> bool:
+    value: bytes = orjson.dumps({"status_code": status_code, "detail": detail})
+    return await set_cache(
+        client=client, key=build_error_cache_key(key), value=value, ttl=ttl
+    )
+
+
+async def cache_rpc_error(
+    client: Redis, key: str, error: Exception, status_code: int
+) -> None:
+    """
+    Negative-cache deterministic RPC failures for `key`; transient ones are skipped.
+    """
+    ttl: Optional[int] = negative_cache_ttl(error)
+    if not ttl:
+        return
+
+    try:
+        await set_error_cache(
+            client=client,
+            key=key,
+            status_code=status_code,
+            detail=getattr(error, "message", str(error)),
+            ttl=ttl,
+        )
+        logger.debug(f"Cached RPC error for {key} for {ttl}s")
+    except Exception as e:
+        logger.warning(f"Cache set failed for {build_error_cache_key(key)}: {e}")
 
 
 def build_get_query_cache_key(prefix: str, url: str) -> str:
     return f"{prefix}:{hashlib.sha256(str(url).encode()).hexdigest()}"
+
+
+def build_error_cache_key(key: str) -> str:
+    return f"error:{key}"
+
+
+def build_balance_cache_key(chain_id: int, address: str, block_number: int) -> str:
+    return f"balance:{chain_id}:{address}:{block_number}"
+
+
+def build_token_balance_cache_key(
+    chain_id: int, token: str, holder: str, block_number: int
+) -> str:
+    return f"token_balance:{chain_id}:{token}:{holder}:{block_number}"
+
+
+def build_token_balances_cache_key(chain_id: int, block_number: int) -> str:
+    """
+    All token balance calls at a block; only used to negative-cache their failures.
+    """
+    return f"token_balances:{chain_id}:{block_number}"
+
+
+def build_logs_cache_key(
+    chain_id: int, address: str, from_block: int, to_block: Optional[int]
+) -> str:
+    return f"logs:{chain_id}:{address}:{from_block}:{'latest' if to_block is None else to_block}"
+
+
+def build_logs_segments_cache_key(logs_cache_key: str) -> str:
+    return f"{logs_cache_key}:segments"
+
+
+def build_logs_segment_cache_key(logs_cache_key: str, segment: int) -> str:
+    return f"{logs_cache_key}:segment:{segment}"
+
+
+def build_logs_aggregate_cache_key(
+    chain_id: int,
+    address: str,
+    from_block: int,
+    to_block: int,
+    group_by: str,
+    bucket_size: int,
+) -> str:
+    return f"logs_aggregate:{chain_id}:{address}:{from_block}:{to_block}:{group_by}:{bucket_size}"
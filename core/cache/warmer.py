@@ -0,0 +1,123 @@
+import asyncio
+from typing import Any
+
+import orjson
+from loguru import logger
+from web3.types import LogReceipt
+
+from config import settings
+from core.block.balance import get_balance_by_block
+from core.block.head import add_head_listener
+from core.block.limiter import upstream_slot
+from core.block.logs import get_logs_by_block_period
+from core.block.web3 import DEFAULT_CHAIN_ID, get_web3_client
+from core.cache.redis import get_redis_client
+from core.cache.utils import (
+    acquire_cache_lock,
+    build_balance_cache_key,
+    build_logs_cache_key,
+    set_many_cache,
+)
+from schemas.balance import BalanceResponse
+from schemas.logs import LogResponse
+
+# Newest log bucket per chain: (bucket start, last fetched block, logs)
+_log_buckets: dict[int, tuple[int, int, list[LogReceipt]]] = {}
+
+
+async def _warm_balance(chain_id: int, address: str, block_number: int) -> bytes:
+    web3 = get_web3_client(chain_id=chain_id)
+    async with upstream_slot(chain_id=chain_id, method="eth_getBalance"):
+        balance = await get_balance_by_block(
+            web3=web3, address=address, block_number=block_number
+        )
+    return orjson.dumps(BalanceResponse(address=address, balance=balance).model_dump())
+
+
+async def _warm_logs(chain_id: int, block_number: int) -> list[LogReceipt]:
+    """
+    Fetch only the blocks added since the previous head when still in the same bucket.
+    """
+    start = block_number - block_number % settings.warm_logs_bucket_size
+    cached_start, cached_end, logs = _log_buckets.get(chain_id, (-1, -1, []))
+
+    if cached_start == start and cached_end < block_number:
+        from_block, logs = cached_end + 1, list(logs)
+    else:
+        from_block, logs = start, []
+
+    web3 = get_web3_client(chain_id=chain_id)
+    logs.extend(
+        await get_logs_by_block_period(
+            web3=web3,
+            address=settings.CONTRACT_ADDRESS,
+            from_block=from_block,
+            to_block=block_number,
+        )
+    )
+
+    _log_buckets[chain_id] = (start, block_number, logs)
+    return logs
+
+
+async def warm_head(chain_id: int, block_number: int) -> None:
+    """
+    Prefetch watched balances and the newest contract log bucket at a new head.
+    A Redis lock makes a single worker warm each head.
+    """
+    cache = await get_redis_client()
+    if not await acquire_cache_lock(
+        client=cache, key=f"warm:{chain_id}:{block_number}", ttl=settings.cache_ttl
+    ):
+        return
+
+    values: dict[str, bytes] = {}
+
+    balances = await asyncio.gather(
+        *(
+            _warm_balance(chain_id=chain_id, address=address, block_number=block_number)
+            for address in settings.warm_addresses
+        ),
+        return_exceptions=True,
+    )
+    for address, balance in zip(settings.warm_addresses, balances):
+        if isinstance(balance, Exception):
+            logger.warning(
+                f"Warm balance failed for {address} at {block_number}: {balance}"
+            )
+            continue
+        key = build_balance_cache_key(
+            chain_id=chain_id, address=address, block_number=block_number
+        )
+        values[key] = balance
+
+    if settings.warm_logs and chain_id == DEFAULT_CHAIN_ID:
+        try:
+            logs = await _warm_logs(chain_id=chain_id, block_number=block_number)
+        except Exception as e:
+            logger.warning(f"Warm logs failed at {block_number}: {e}")
+        else:
+            response: dict[str, Any] = LogResponse(logs=logs).model_dump(by_alias=True)
+            payload = orjson.dumps(response)
+            start = _log_buckets[chain_id][0]
+            for to_block in (block_number, None):
+                key = build_logs_cache_key(
+                    chain_id=chain_id,
+                    address=settings.CONTRACT_ADDRESS,
+                    from_block=start,
+                    to_block=to_block,
+                )
+                values[key] = payload
+
+    if values:
+        await set_many_cache(client=cache, values=values, ttl=settings.cache_ttl)
+        logger.debug(f"Warmed {len(values)} cache entries at {chain_id}:{block_number}")
+
+
+def init_cache_warmer() -> None:
+    if settings.warm_addresses or settings.warm_logs:
+        add_head_listener(warm_head)
+        logger.info(
+            f"Cache warmer enabled: {len(settings.warm_addresses)} addresses, "
+            f"logs: {settings.warm_logs}"
+        )
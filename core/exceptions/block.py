@@ -0,0 +1,4 @@
+class BlockPastHead(Exception):
+    def __init__(self, message: str) -> None:
+        super().__init__(message)
+        self.message = message
@@ -0,0 +1,5 @@
+class UpstreamOverloaded(Exception):
+    def __init__(self, message: str, retry_after: int) -> None:
+        super().__init__(message)
+        self.message = message
+        self.retry_after = retry_after
@@ -0,0 +1,10 @@
+class DeadlineExceeded(Exception):
+    def __init__(self, message: str) -> None:
+        super().__init__(message)
+        self.message = message
+
+
+class ClientDisconnected(Exception):
+    def __init__(self, message: str) -> None:
+        super().__init__(message)
+        self.message = message
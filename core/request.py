@@ -0,0 +1,131 @@
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar, Token
+from typing import AsyncIterator, Awaitable, Optional, TypeVar
+
+from fastapi import Request
+from loguru import logger
+
+from config import settings
+from core.exceptions.request import ClientDisconnected, DeadlineExceeded
+
+T = TypeVar("T")
+
+# Absolute loop time by which the current request must be answered
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+# Work kept running after its client left, so its result still gets cached
+_background: set[asyncio.Task] = set()
+
+
+def get_request_timeout(path: str, header: Optional[str]) -> Optional[float]:
+    """
+    Endpoint default (longest matching path prefix), shortened by the client header.
+    None (or 0) means no deadline.
+    """
+    timeout: float = settings.default_request_timeout
+    for prefix in sorted(settings.request_timeouts, key=len, reverse=True):
+        if path.startswith(prefix):
+            timeout = settings.request_timeouts[prefix]
+            break
+
+    if not timeout:
+        return None
+
+    if header:
+        try:
+            requested = float(header)
+        except ValueError:
+            requested = 0
+        if requested > 0:
+            timeout = min(timeout, requested)
+
+    return timeout
+
+
+def set_request_deadline(timeout: Optional[float]) -> Token:
+    deadline = None
+    if timeout:
+        deadline = asyncio.get_running_loop().time() + timeout
+    return _deadline.set(deadline)
+
+
+def reset_request_deadline(token: Token) -> None:
+    _deadline.reset(token)
+
+
+def clear_request_deadline() -> None:
+    """
+    Detach background work started from a request from that request's deadline.
+    """
+    _deadline.set(None)
+
+
+def get_remaining_time() -> Optional[float]:
+    deadline: Optional[float] = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - asyncio.get_running_loop().time()
+
+
+@asynccontextmanager
+async def request_deadline() -> AsyncIterator[None]:
+    """
+    Bound the block by the current request deadline, if any.
+    """
+    deadline: Optional[float] = _deadline.get()
+    if deadline is None:
+        yield
+        return
+
+    if asyncio.get_running_loop().time() >= deadline:
+        raise DeadlineExceeded("Request deadline exceeded")
+
+    scope = asyncio.timeout_at(deadline)
+    try:
+        async with scope:
+            yield
+    except TimeoutError:
+        if scope.expired():
+            raise DeadlineExceeded("Request deadline exceeded")
+        raise
+
+
+def _log_background_result(task: asyncio.Task) -> None:
+    _background.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(
+            f"Background work of a closed request failed: {task.exception()}"
+        )
+
+
+async def cancel_on_disconnect(
+    request: Request, work: Awaitable[T], keep: bool = False
+) -> T:
+    """
+    Await `work`, cancelling it once the client disconnects.
+    With `keep`, it finishes in the background instead, so its result is still cached.
+    """
+    task: asyncio.Future = asyncio.ensure_future(work)
+    try:
+        while True:
+            done, _ = await asyncio.wait(
+                {task}, timeout=settings.disconnect_poll_interval
+            )
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                break
+    except BaseException:
+        task.cancel()
+        raise
+
+    if keep:
+        _background.add(task)
+        task.add_done_callback(_log_background_result)
+        logger.info(f"Client left {request.url.path}, finishing work to cache it")
+    else:
+        task.cancel()
+        logger.info(f"Client left {request.url.path}, upstream work cancelled")
+
+    raise ClientDisconnected("Client closed request")
@@ -0,0 +1,60 @@
+import math
+import os
+from pathlib import Path
+from typing import Optional
+
+from uvicorn.workers import UvicornWorker
+
+from config import settings
+
+
+def _cgroup_cpu_quota() -> Optional[float]:
+    """
+    CPU limit of the container from cgroup v2 (cpu.max) or v1 (cfs quota).
+    """
+    cpu_max = Path("/sys/fs/cgroup/cpu.max")
+    if cpu_max.exists():
+        quota, _, period = cpu_max.read_text().strip().partition(" ")
+        if quota != "max":
+            return int(quota) / int(period or 100_000)
+        return None
+
+    quota_file = Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+    period_file = Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+    if quota_file.exists() and period_file.exists():
+        quota = int(quota_file.read_text())
+        if quota > 0:
+            return quota / int(period_file.read_text())
+
+    return None
+
+
+def available_cpus() -> float:
+    try:
+        cpus: float = len(os.sched_getaffinity(0))
+    except AttributeError:  # macOS
+        cpus = os.cpu_count() or 1
+
+    try:
+        quota = _cgroup_cpu_quota()
+    except (OSError, ValueError):
+        quota = None
+
+    return min(cpus, quota) if quota else cpus
+
+
+def worker_count() -> int:
+    if settings.gunicorn_workers:
+        return settings.gunicorn_workers
+
+    workers = max(1, math.ceil(available_cpus() * settings.gunicorn_workers_per_core))
+    if settings.gunicorn_max_workers:
+        workers = min(workers, settings.gunicorn_max_workers)
+    return workers
+
+
+class RuntimeUvicornWorker(UvicornWorker):
+    CONFIG_KWARGS = {
+        "loop": settings.uvicorn_loop,
+        "http": settings.uvicorn_http,
+    }
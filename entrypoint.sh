@@ -3,6 +3,5 @@ set -e
 
 echo "Starting app..."
 
-exec gunicorn --workers 2 --worker-class uvicorn.workers.UvicornWorker \
-    --bind 0.0.0.0:8021 \
-    --worker-connections 1000 main:app
\ No newline at end of file
+# Workers, event loop, HTTP parser etc. come from Settings (see gunicorn.conf.py)
+exec gunicorn --config gunicorn.conf.py main:app
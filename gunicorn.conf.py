@@ -0,0 +1,30 @@
+import gc
+
+from config import settings
+from core.runtime import worker_count
+
+bind = settings.gunicorn_bind
+workers = worker_count()
+# Workers inherit this and split the provider plan's rpc_rate_limits between them
+settings.web_concurrency = workers
+worker_class = "core.runtime.RuntimeUvicornWorker"
+worker_connections = settings.gunicorn_worker_connections
+
+# Recycle workers, staggered so they don't all restart at once
+max_requests = settings.gunicorn_max_requests
+max_requests_jitter = settings.gunicorn_max_requests_jitter
+
+timeout = settings.gunicorn_timeout
+graceful_timeout = settings.gunicorn_graceful_timeout
+keepalive = settings.gunicorn_keepalive
+
+# Import the app once in the master; workers fork with web3/eth-abi already loaded
+# and share those pages copy-on-write.
+preload_app = settings.gunicorn_preload
+
+
+def when_ready(server) -> None:
+    server.log.info(f"Starting {workers} workers ({worker_class})")
+    if preload_app:
+        # Keep the GC from touching (and so copying) preloaded objects in workers
+        gc.freeze()
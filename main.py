@@ -3,14 +3,22 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from loguru import logger
 
+from api.balance import router as balance_router
 from api.block import router as block_router
+from api.export import router as export_router
 from api.logs import router as logs_router
 from api.health import health_check
+from core.cache.disk import init_disk_cache, shutdown_disk_cache
 from core.cache.redis import init_redis, shutdown_redis
+from core.cache.warmer import init_cache_warmer
+from core.block.export import start_export_workers, stop_export_workers
+from core.block.head import start_head_tracker, stop_head_tracker
+from core.block.stream import init_log_stream
 from core.block.web3 import init_web3_pool, shutdown_web3_pool
 from core.logging import configure_logging
 from middleware import (
     configure_cors_middleware,
+    configure_deadline_middleware,
     configure_exception_middleware,
 )
 
@@ -21,14 +29,24 @@ async def lifespan(app: FastAPI):
     logger.info("Starting application...")
 
     await init_redis()
+    init_disk_cache()
     await init_web3_pool()
     logger.info("Web3 clients initialized")
 
+    init_cache_warmer()
+    init_log_stream()
+    await start_head_tracker()
+    await start_export_workers()
+
     yield
 
     logger.info("Shutting down application...")
 
+    await stop_export_workers()
+    await stop_head_tracker()
+
     await shutdown_redis()
+    shutdown_disk_cache()
     await shutdown_web3_pool()
     logger.info("Web3 clients closed")
 
@@ -36,12 +54,15 @@ async def lifespan(app: FastAPI):
 def _configure_middleware(app: FastAPI) -> None:
     configure_cors_middleware(app)
     configure_exception_middleware(app)
+    configure_deadline_middleware(app)
 
 
 def _register_routes(app: FastAPI) -> None:
     app.add_api_route("/health", health_check, methods=["GET"])
     app.include_router(block_router)
+    app.include_router(balance_router)
     app.include_router(logs_router)
+    app.include_router(export_router)
 
 
 def create_app() -> FastAPI:
@@ -1,2 +1,3 @@
 from .cors import configure_cors_middleware  # noqa: F401
+from .deadline import configure_deadline_middleware  # noqa: F401
 from .exception import configure_exception_middleware  # noqa: F401
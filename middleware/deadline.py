@@ -0,0 +1,40 @@
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from config import settings
+from core.request import (
+    get_request_timeout,
+    reset_request_deadline,
+    set_request_deadline,
+)
+
+
+class DeadlineMiddleware:
+    """
+    Start the request deadline that RPC and Redis calls are bounded by.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.header = settings.request_timeout_header.lower().encode()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        header = next(
+            (value.decode() for name, value in scope["headers"] if name == self.header),
+            None,
+        )
+        token = set_request_deadline(
+            get_request_timeout(path=scope["path"], header=header)
+        )
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            reset_request_deadline(token)
+
+
+def configure_deadline_middleware(app: FastAPI) -> None:
+    app.add_middleware(DeadlineMiddleware)
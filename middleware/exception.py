@@ -8,6 +8,9 @@ from loguru import logger
 from pydantic import ValidationError as PydanticValidationError
 from starlette.requests import Request
 
+from core.exceptions.limiter import UpstreamOverloaded
+from core.exceptions.request import ClientDisconnected, DeadlineExceeded
+
 
 def configure_exception_middleware(app: FastAPI) -> None:
     @app.exception_handler(HTTPException)
@@ -31,6 +34,25 @@ def configure_exception_middleware(app: FastAPI) -> None:
         errors = jsonable_encoder(exc.errors())
         return JSONResponse(status_code=422, content={"detail": errors})
 
+    @app.exception_handler(DeadlineExceeded)
+    async def deadline_exceeded_handler(request: Request, exc: DeadlineExceeded):
+        logger.warning(f"Deadline exceeded: {request.method} {request.url.path}")
+        return JSONResponse(status_code=504, content={"detail": exc.message})
+
+    @app.exception_handler(UpstreamOverloaded)
+    async def upstream_overloaded_handler(request: Request, exc: UpstreamOverloaded):
+        logger.warning(f"Upstream overloaded: {exc.message}")
+        return JSONResponse(
+            status_code=503,
+            content={"detail": exc.message},
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+
+    @app.exception_handler(ClientDisconnected)
+    async def client_disconnected_handler(request: Request, exc: ClientDisconnected):
+        # Nobody reads it; 499 keeps closed requests apart in access logs
+        return JSONResponse(status_code=499, content={"detail": exc.message})
+
     @app.exception_handler(Exception)
     async def global_exception_handler(request: Request, exc: Exception):
         logger.error(
@@ -0,0 +1,29 @@
+from functools import lru_cache
+from typing import Optional
+
+from eth_utils import is_address, to_checksum_address
+
+from config import settings
+
+
+@lru_cache(maxsize=settings.address_cache_size)
+def _checksum(lowered: str) -> Optional[str]:
+    if not is_address(lowered):
+        return None
+    return to_checksum_address(lowered)
+
+
+def normalize_address(value: str) -> str:
+    """
+    Validate and checksum an address.
+    Keyed by the lowercased 0x-prefixed value, so keccak runs once per address
+    whatever its casing.
+    """
+    lowered = value.lower()
+    if not lowered.startswith("0x"):
+        lowered = f"0x{lowered}"
+
+    checksum = _checksum(lowered)
+    if checksum is None:
+        raise ValueError("Invalid Ethereum address")
+    return checksum
@@ -1,5 +1,9 @@
+from typing import Any
+
 from pydantic import BaseModel, Field, field_validator
-from web3 import AsyncWeb3
+
+from config import settings
+from schemas.address import normalize_address
 
 
 class BalanceRequest(BaseModel):
@@ -10,11 +14,98 @@ class BalanceRequest(BaseModel):
     @field_validator("address")
     @classmethod
     def check_checksum(cls, value: str) -> str:
-        if not AsyncWeb3.is_address(value):
-            raise ValueError("Invalid Ethereum address")
-        return AsyncWeb3.to_checksum_address(value)
+        return normalize_address(value)
 
 
 class BalanceResponse(BaseModel):
     address: str = Field(..., description="Address from request")
     balance: int = Field(..., description="Native balance in WEI")
+
+
+class TimestampBalanceRequest(BaseModel):
+    address: str
+    at_timestamp: int = Field(..., ge=0, description="Unix timestamp, seconds")
+    chain_id: int | None = Field(default=43114)  # Default Avalanche
+
+    @field_validator("address")
+    @classmethod
+    def check_checksum(cls, value: str) -> str:
+        return normalize_address(value)
+
+
+class TimestampBalanceResponse(BalanceResponse):
+    block_number: int = Field(..., description="Last block at or before the timestamp")
+
+
+class MultiChainBalanceRequest(BaseModel):
+    address: str
+    blocks: dict[int, int] = Field(
+        default_factory=dict, description="Block per chain, latest block otherwise"
+    )
+    at_timestamp: int | None = Field(
+        None, ge=0, description="Unix timestamp for chains without a given block"
+    )
+
+    @field_validator("address")
+    @classmethod
+    def check_checksum(cls, value: str) -> str:
+        return normalize_address(value)
+
+    @field_validator("blocks", mode="before")
+    @classmethod
+    def parse_blocks(cls, value: Any) -> Any:
+        if not isinstance(value, list):
+            return value
+
+        blocks: dict[int, int] = {}
+        for item in value:
+            chain_id, sep, block_number = str(item).partition(":")
+            if not sep or not chain_id.isdigit() or not block_number.isdigit():
+                raise ValueError(f"Expected chain_id:block_number, got {item!r}")
+            blocks[int(chain_id)] = int(block_number)
+        return blocks
+
+
+class ChainBalance(BaseModel):
+    chain_id: int
+    block_number: int | None = Field(None, description="Block the balance was read at")
+    balance: int | None = Field(None, description="Native balance in WEI")
+    error: str | None = Field(None, description="Why this chain has no balance")
+
+
+class MultiChainBalanceResponse(BaseModel):
+    address: str = Field(..., description="Address from request")
+    balances: list[ChainBalance]
+
+
+class TokenHolder(BaseModel):
+    token: str = Field(..., description="ERC-20 contract address")
+    holder: str
+
+    @field_validator("token", "holder")
+    @classmethod
+    def check_checksum(cls, value: str) -> str:
+        return normalize_address(value)
+
+
+class TokenBalancesRequest(BaseModel):
+    chain_id: int | None = Field(default=43114)  # Default Avalanche
+    pairs: list[TokenHolder] = Field(..., min_length=1)
+
+    @field_validator("pairs")
+    @classmethod
+    def check_pairs_limit(cls, value: list[TokenHolder]) -> list[TokenHolder]:
+        if len(value) > settings.max_token_pairs:
+            raise ValueError(f"Max pairs per request is {settings.max_token_pairs}")
+        return value
+
+
+class TokenBalance(TokenHolder):
+    balance: int | None = Field(
+        ..., description="Token balance in base units, null if balanceOf failed"
+    )
+
+
+class TokenBalancesResponse(BaseModel):
+    block_number: int
+    balances: list[TokenBalance]
@@ -0,0 +1,37 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field, computed_field, model_validator
+
+
+class ExportRequest(BaseModel):
+    from_block: int = Field(..., ge=0)
+    to_block: int = Field(..., ge=0)
+
+    @model_validator(mode="after")
+    def validate_block_range(self) -> "ExportRequest":
+        if self.to_block < self.from_block:
+            raise ValueError(
+                f"to_block ({self.to_block}) must be greater than or equal to from_block ({self.from_block})"
+            )
+        return self
+
+
+class ExportJob(BaseModel):
+    id: str
+    status: Literal["queued", "running", "done", "failed"]
+    chain_id: int
+    address: str
+    from_block: int
+    to_block: int
+    next_block: int = Field(..., description="First block not exported yet")
+    logs: int = Field(..., description="Logs exported so far")
+    size: int = Field(..., description="Output size in bytes (gzip NDJSON)")
+    error: str | None = None
+    created_at: float
+    updated_at: float
+
+    @computed_field
+    @property
+    def progress(self) -> float:
+        total = self.to_block - self.from_block + 1
+        return round((self.next_block - self.from_block) / total, 4)
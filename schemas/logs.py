@@ -1,16 +1,76 @@
-from typing import Any, Sequence
+import base64
+import binascii
+from typing import Any, Literal, NamedTuple, Sequence
 
 from hexbytes import HexBytes
 from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
+from config import settings
+
+
+class LogCursor(NamedTuple):
+    """
+    Position after the last log of a page. `anchor` is the first block of the
+    cached range the page was cut from, so the next page reads the same entry.
+    """
+
+    anchor: int
+    block_number: int
+    log_index: int
+
+    def encode(self) -> str:
+        raw = f"{self.anchor}:{self.block_number}:{self.log_index}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, value: str) -> "LogCursor":
+        try:
+            raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)).decode()
+            anchor, block_number, log_index = (int(part) for part in raw.split(":"))
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise ValueError("Invalid cursor")
+
+        if min(anchor, block_number, log_index) < 0 or block_number < anchor:
+            raise ValueError("Invalid cursor")
+        return cls(anchor=anchor, block_number=block_number, log_index=log_index)
+
 
 class LogRequest(BaseModel):
-    from_block: int = Field(..., ge=0)
+    from_block: int | None = Field(None, ge=0)
     to_block: int | None = Field(None, ge=0)
+    from_time: int | None = Field(None, ge=0, description="Unix timestamp, seconds")
+    to_time: int | None = Field(None, ge=0, description="Unix timestamp, seconds")
+    limit: int | None = Field(
+        None, ge=1, le=settings.logs_max_page_size, description="Logs per page"
+    )
+    cursor: str | None = Field(None, description="next_cursor of the previous page")
+
+    @field_validator("cursor")
+    @classmethod
+    def validate_cursor(cls, value: str | None) -> str | None:
+        if value is not None:
+            LogCursor.decode(value)
+        return value
 
     @model_validator(mode="after")
     def validate_block_range(self) -> "LogRequest":
-        if self.to_block is not None and self.to_block < self.from_block:
+        if (self.from_block is None) == (self.from_time is None):
+            raise ValueError("Exactly one of from_block or from_time is required")
+
+        if self.to_block is not None and self.to_time is not None:
+            raise ValueError("to_block and to_time are mutually exclusive")
+
+        if self.from_time is not None and self.to_time is not None:
+            if self.to_time < self.from_time:
+                raise ValueError(
+                    f"to_time ({self.to_time}) must be greater than or equal to from_time ({self.from_time})"
+                )
+
+        if (
+            self.from_block is not None
+            and self.to_block is not None
+            and self.to_block < self.from_block
+        ):
             raise ValueError(
                 f"to_block ({self.to_block}) must be greater than or equal to from_block ({self.from_block})"
             )
@@ -47,3 +107,47 @@ class LogReceipt(BaseModel):
 
 class LogResponse(BaseModel):
     logs: list[LogReceipt]
+
+
+class LogPage(LogResponse):
+    next_cursor: str | None = Field(
+        None, description="Cursor of the next page, set only when paginating"
+    )
+
+
+class LogAggregateRequest(BaseModel):
+    from_block: int = Field(..., ge=0)
+    to_block: int = Field(..., ge=0)
+    group_by: Literal["block", "topic0", "address"] = "block"
+    bucket_size: int = Field(
+        1000, ge=1, description="Blocks per bucket when grouping by block"
+    )
+
+    @model_validator(mode="after")
+    def validate_block_range(self) -> "LogAggregateRequest":
+        if self.to_block < self.from_block:
+            raise ValueError(
+                f"to_block ({self.to_block}) must be greater than or equal to from_block ({self.from_block})"
+            )
+        if self.to_block - self.from_block >= settings.logs_aggregate_max_range:
+            raise ValueError(
+                f"Max aggregation range is {settings.logs_aggregate_max_range} blocks"
+            )
+        return self
+
+
+class LogAggregateGroup(BaseModel):
+    key: int | str = Field(
+        ..., description="First block of the bucket, topic0 or emitting address"
+    )
+    count: int
+    min_block: int
+    max_block: int
+
+
+class LogAggregateResponse(BaseModel):
+    from_block: int
+    to_block: int
+    group_by: str
+    total: int
+    groups: list[LogAggregateGroup]
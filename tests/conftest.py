@@ -15,10 +15,40 @@ os.environ.setdefault("CONTRACT_ADDRESS", "0x66357dCaCe80431aee0A7507e2E361B7e24
 
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
+from core.block.limiter import reset_upstream_limiters
+from core.cache.breaker import cache_breaker
 from core.cache.redis import get_redis_client
 from main import app as fastapi_app
 
 
+class FakePipeline:
+    def __init__(self, redis: "FakeRedis") -> None:
+        self._redis = redis
+        self._commands: list[tuple[str, tuple]] = []
+
+    async def __aenter__(self) -> "FakePipeline":
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        self._commands.clear()
+
+    def get(self, name: str) -> "FakePipeline":
+        self._commands.append(("get", (name,)))
+        return self
+
+    def setex(self, name: str, time: int, value: str) -> "FakePipeline":
+        self._commands.append(("setex", (name, time, value)))
+        return self
+
+    async def execute(self) -> list:
+        results = [
+            await getattr(self._redis, command)(*args)
+            for command, args in self._commands
+        ]
+        self._commands.clear()
+        return results
+
+
 class FakeRedis:
     def __init__(self) -> None:
         self._store: dict[str, str] = {}
@@ -30,9 +60,27 @@ class FakeRedis:
         self._store[name] = value
         return True
 
+    async def set(
+        self, name: str, value: str, nx: bool = False, ex: int | None = None
+    ) -> bool | None:
+        if nx and name in self._store:
+            return None
+        self._store[name] = value
+        return True
+
+    async def hgetall(self, name: str) -> dict:
+        return dict(self._store.get(name, {}))
+
+    async def hset(self, name: str, mapping: dict) -> int:
+        self._store.setdefault(name, {}).update(mapping)
+        return len(mapping)
+
     async def delete(self, name: str) -> None:
         self._store.pop(name, None)
 
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
 
 @pytest.fixture(name="app")
 def app_fixture() -> FastAPI:
@@ -58,6 +106,20 @@ def override_redis_dependency(
     app.dependency_overrides.pop(get_redis_client, None)
 
 
+@pytest.fixture(autouse=True)
+def reset_cache_breaker() -> AsyncIterator[None]:
+    cache_breaker.reset()
+    yield
+    cache_breaker.reset()
+
+
+@pytest.fixture(autouse=True)
+def reset_limiters() -> AsyncIterator[None]:
+    reset_upstream_limiters()
+    yield
+    reset_upstream_limiters()
+
+
 @pytest.fixture(autouse=True)
 def fake_web3_clients(monkeypatch: pytest.MonkeyPatch) -> dict[int, object]:
     class _DummyEth:
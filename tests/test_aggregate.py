@@ -0,0 +1,144 @@
+import subprocess
+import sys
+
+import pytest
+
+from core.block.aggregate import aggregate_groups, aggregate_logs, merge_aggregates
+from core.request import get_request_timeout
+
+CONTRACT_ADDRESS = "0x66357dCaCe80431aee0A7507e2E361B7e2402370"
+OTHER_ADDRESS = "0x000000000000000000000000000000000000dEaD"
+
+
+def _log(block_number: int, topic0: str, address: str = CONTRACT_ADDRESS) -> dict:
+    return {
+        "address": address,
+        "blockHash": f"0x{block_number}",
+        "blockNumber": block_number,
+        "data": "0x0",
+        "logIndex": 0,
+        "removed": False,
+        "topics": [topic0, "0xother"],
+        "transactionHash": "0x2",
+        "transactionIndex": 0,
+    }
+
+
+def test_aggregate_by_block_bucket():
+    logs = [_log(3, "0xa"), _log(7, "0xb"), _log(12, "0xa"), _log(25, "0xa")]
+
+    groups = aggregate_groups(
+        aggregate_logs(
+            blocks=[log["blockNumber"] for log in logs],
+            keys=None,
+            group_by="block",
+            bucket_size=10,
+        )
+    )
+
+    assert groups == [
+        {"key": 0, "count": 2, "min_block": 3, "max_block": 7},
+        {"key": 10, "count": 1, "min_block": 12, "max_block": 12},
+        {"key": 20, "count": 1, "min_block": 25, "max_block": 25},
+    ]
+
+
+def test_merge_combines_groups_across_chunks():
+    first = aggregate_logs(
+        blocks=[1, 2],
+        keys=[CONTRACT_ADDRESS, OTHER_ADDRESS],
+        group_by="address",
+        bucket_size=1,
+    )
+    second = aggregate_logs(
+        blocks=[11, 15],
+        keys=[CONTRACT_ADDRESS, CONTRACT_ADDRESS],
+        group_by="address",
+        bucket_size=1,
+    )
+    empty = aggregate_logs(blocks=[], keys=[], group_by="address", bucket_size=1)
+
+    groups = aggregate_groups(
+        merge_aggregates([first, empty, second], group_by="address")
+    )
+
+    assert groups == [
+        {"key": OTHER_ADDRESS, "count": 1, "min_block": 2, "max_block": 2},
+        {"key": CONTRACT_ADDRESS, "count": 3, "min_block": 1, "max_block": 15},
+    ]
+    assert aggregate_groups(merge_aggregates([empty], group_by="topic0")) == []
+
+
+@pytest.mark.asyncio
+async def test_logs_aggregate_by_topic0(async_client, monkeypatch):
+    monkeypatch.setattr("config.settings.max_block_range", 10)
+    ranges: list[tuple[int, int]] = []
+
+    async def mock_get_logs(web3, address, from_block, to_block):
+        ranges.append((from_block, to_block))
+        return [_log(from_block, "0xa"), _log(to_block, "0xb")]
+
+    monkeypatch.setattr("core.cache.logs.get_logs_by_block_period", mock_get_logs)
+
+    response = await async_client.get(
+        "/logs/aggregate?from_block=5&to_block=25&group_by=topic0"
+    )
+
+    assert response.status_code == 200
+    assert sorted(ranges) == [(5, 9), (10, 19), (20, 25)]
+    assert response.json() == {
+        "from_block": 5,
+        "to_block": 25,
+        "group_by": "topic0",
+        "total": 6,
+        "groups": [
+            {"key": "0xa", "count": 3, "min_block": 5, "max_block": 20},
+            {"key": "0xb", "count": 3, "min_block": 9, "max_block": 25},
+        ],
+    }
+
+    again = await async_client.get(
+        "/logs/aggregate?from_block=5&to_block=25&group_by=topic0"
+    )
+    assert again.json() == response.json()
+    assert len(ranges) == 3
+
+
+@pytest.mark.asyncio
+async def test_logs_aggregate_reuses_cached_chunks(async_client, monkeypatch):
+    monkeypatch.setattr("config.settings.max_block_range", 10)
+    ranges: list[tuple[int, int]] = []
+
+    async def mock_get_logs(web3, address, from_block, to_block):
+        ranges.append((from_block, to_block))
+        return [_log(from_block, "0xa")]
+
+    monkeypatch.setattr("core.cache.logs.get_logs_by_block_period", mock_get_logs)
+
+    await async_client.get("/logs/aggregate?from_block=0&to_block=19")
+    response = await async_client.get(
+        "/logs/aggregate?from_block=0&to_block=19&group_by=address"
+    )
+
+    assert response.json()["total"] == 2
+    assert sorted(ranges) == [(0, 9), (10, 19)]
+
+
+@pytest.mark.asyncio
+async def test_logs_aggregate_range_limit(async_client, monkeypatch):
+    monkeypatch.setattr("config.settings.logs_aggregate_max_range", 100)
+
+    response = await async_client.get("/logs/aggregate?from_block=0&to_block=100")
+
+    assert response.status_code == 422
+
+
+def test_app_start_does_not_load_numpy():
+    code = "import sys, main; sys.exit('numpy' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
+
+
+def test_aggregate_has_its_own_timeout():
+    assert get_request_timeout(path="/logs/aggregate", header=None) > (
+        get_request_timeout(path="/logs", header=None)
+    )
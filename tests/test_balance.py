@@ -0,0 +1,121 @@
+import asyncio
+
+import aiohttp
+import pytest
+from web3.exceptions import Web3RPCError
+
+VALID_ADDRESS = "0x000000000000000000000000000000000000dEaD"
+
+
+@pytest.mark.asyncio
+async def test_balance_across_chains_at_given_blocks(
+    async_client, monkeypatch, fake_web3_clients
+):
+    async def mock_get_balance(web3, address, block_number):
+        return {100: 1, 200: 43114}[block_number]
+
+    monkeypatch.setattr("api.balance.get_balance_by_block", mock_get_balance)
+
+    response = await async_client.get(
+        f"/balance/{VALID_ADDRESS.lower()}/?block=1:100&block=43114:200"
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "address": VALID_ADDRESS,
+        "balances": [
+            {"chain_id": 1, "block_number": 100, "balance": 1, "error": None},
+            {"chain_id": 43114, "block_number": 200, "balance": 43114, "error": None},
+        ],
+    }
+
+
+@pytest.mark.asyncio
+async def test_balance_across_chains_latest_block(
+    async_client, monkeypatch, fake_web3_clients
+):
+    async def mock_get_balance(web3, address, block_number):
+        assert block_number == 0  # dummy client's head
+        return 5
+
+    monkeypatch.setattr("api.balance.get_balance_by_block", mock_get_balance)
+
+    response = await async_client.get(f"/balance/{VALID_ADDRESS}/")
+
+    assert response.status_code == 200
+    assert [item["balance"] for item in response.json()["balances"]] == [5, 5]
+
+
+@pytest.mark.asyncio
+async def test_balance_across_chains_partial_results(
+    async_client, monkeypatch, fake_web3_clients
+):
+    async def mock_get_balance(web3, address, block_number):
+        if web3 is fake_web3_clients[1]:
+            await asyncio.sleep(1)
+        if web3 is fake_web3_clients[43114]:
+            raise Web3RPCError("missing trie node")
+        return 1
+
+    monkeypatch.setattr("api.balance.get_balance_by_block", mock_get_balance)
+    monkeypatch.setattr("config.settings.fanout_chain_timeout", 0.05)
+
+    response = await async_client.get(
+        f"/balance/{VALID_ADDRESS}/?block=1:1&block=43114:1"
+    )
+
+    assert response.status_code == 200
+    eth, avax = response.json()["balances"]
+    assert eth["balance"] is None and "Timed out" in eth["error"]
+    assert avax["balance"] is None and avax["error"] == "missing trie node"
+
+
+@pytest.mark.asyncio
+async def test_balance_across_chains_unreachable_rpc(
+    async_client, monkeypatch, fake_web3_clients
+):
+    async def mock_get_balance(web3, address, block_number):
+        if web3 is fake_web3_clients[1]:
+            raise aiohttp.ClientConnectionError("Cannot connect to host")
+        return 1
+
+    monkeypatch.setattr("api.balance.get_balance_by_block", mock_get_balance)
+
+    response = await async_client.get(
+        f"/balance/{VALID_ADDRESS}/?block=1:1&block=43114:1"
+    )
+
+    assert response.status_code == 200
+    eth, avax = response.json()["balances"]
+    assert eth["balance"] is None and eth["error"] == "Cannot connect to host"
+    assert avax["balance"] == 1 and avax["error"] is None
+
+
+@pytest.mark.asyncio
+async def test_balance_across_chains_shares_block_cache(
+    async_client, monkeypatch, fake_web3_clients
+):
+    calls = {"count": 0}
+
+    async def mock_get_balance(web3, address, block_number):
+        calls["count"] += 1
+        return 7
+
+    monkeypatch.setattr("api.balance.get_balance_by_block", mock_get_balance)
+    monkeypatch.setattr("api.block.get_balance_by_block", mock_get_balance)
+
+    await async_client.get(f"/balance/{VALID_ADDRESS}/?block=1:10&block=43114:10")
+    assert calls["count"] == 2
+
+    response = await async_client.get(f"/block/10/balance/{VALID_ADDRESS}/?chain_id=1")
+    assert response.json()["balance"] == 7
+    await async_client.get(f"/balance/{VALID_ADDRESS}/?block=1:10&block=43114:10")
+    assert calls["count"] == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("block", ["1", "1:abc", "99999:1"])
+async def test_balance_across_chains_invalid_blocks(async_client, block):
+    response = await async_client.get(f"/balance/{VALID_ADDRESS}/?block={block}")
+
+    assert response.status_code in (404, 422)
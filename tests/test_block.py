@@ -1,6 +1,8 @@
 import pytest
 from web3.exceptions import Web3RPCError
 
+from schemas.address import _checksum, normalize_address
+
 
 VALID_ADDRESS = "0x000000000000000000000000000000000000dEaD"
 CHECKSUM_ADDRESS = "0x000000000000000000000000000000000000dEaD"
@@ -204,3 +206,14 @@ async def test_balance_by_block_different_blocks_no_cache(
     assert response2.status_code == 200
     assert call_count["count"] == 2
     assert response1.json()["balance"] != response2.json()["balance"]
+
+
+def test_normalize_address_is_memoized_across_casings():
+    _checksum.cache_clear()
+
+    assert normalize_address(VALID_ADDRESS.lower()) == CHECKSUM_ADDRESS
+    assert normalize_address(VALID_ADDRESS.upper()[2:]) == CHECKSUM_ADDRESS
+    assert normalize_address(CHECKSUM_ADDRESS) == CHECKSUM_ADDRESS
+
+    info = _checksum.cache_info()
+    assert (info.misses, info.hits) == (1, 2)
@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+from redis.asyncio import BlockingConnectionPool
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from core.cache.breaker import CircuitBreaker, cache_breaker
+from core.cache.redis import build_redis_client
+from core.cache.utils import get_cache, get_many_cache, set_cache, set_many_cache
+
+
+class FailingRedis:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def get(self, name: str) -> str | None:
+        self.calls += 1
+        raise ConnectionError("redis is down")
+
+
+@pytest.mark.asyncio
+async def test_get_set_many_cache_roundtrip(fake_redis):
+    assert await set_many_cache(fake_redis, {"a": b"1", "b": b"2"}, ttl=10)
+
+    assert await get_many_cache(fake_redis, ["a", "missing", "b"]) == [
+        b"1",
+        None,
+        b"2",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_and_skips_redis(monkeypatch):
+    monkeypatch.setattr(cache_breaker, "failure_threshold", 2)
+    client = FailingRedis()
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            await get_cache(client, "key")
+
+    assert cache_breaker.is_open
+    assert await get_cache(client, "key") is None
+    assert await set_cache(client, "key", b"value", ttl=10) is False
+    assert client.calls == 2
+
+
+def test_circuit_half_open_probe(monkeypatch):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5)
+    now = {"value": 100.0}
+    monkeypatch.setattr("core.cache.breaker.time.monotonic", lambda: now["value"])
+
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    now["value"] += 5
+    assert breaker.allow()
+    assert not breaker.allow()  # single probe at a time
+
+    breaker.record_success()
+    assert not breaker.is_open
+    assert breaker.allow()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_releases_circuit(monkeypatch):
+    class _SlowRedis:
+        async def get(self, name):
+            await asyncio.sleep(5)
+
+    monkeypatch.setattr(cache_breaker, "failure_threshold", 1)
+    monkeypatch.setattr(cache_breaker, "reset_timeout", 0)
+    cache_breaker.record_failure()
+
+    probe = asyncio.create_task(get_cache(_SlowRedis(), "key"))
+    await asyncio.sleep(0)
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    assert not cache_breaker._probing
+    assert cache_breaker.allow()
+
+
+@pytest.mark.asyncio
+async def test_pool_exhaustion_does_not_open_circuit(monkeypatch):
+    monkeypatch.setattr(cache_breaker, "failure_threshold", 1)
+
+    class _BusyRedis:
+        async def get(self, name):
+            raise RedisConnectionError("Too many connections")
+
+    assert await get_cache(_BusyRedis(), "key") is None
+    assert not cache_breaker.is_open
+
+
+def test_redis_pool_limits(monkeypatch):
+    monkeypatch.setattr("config.settings.redis_max_connections", 7)
+
+    client = build_redis_client("redis://localhost:6379/0")
+    assert isinstance(client.connection_pool, BlockingConnectionPool)
+    assert client.connection_pool.max_connections == 7
+
+    sentinel = build_redis_client("redis+sentinel://localhost:26379/mymaster")
+    assert sentinel.connection_pool.max_connections == 7
+
+
+@pytest.mark.parametrize(
+    ("url", "class_name"),
+    [
+        ("redis://localhost:6379/0", "Redis"),
+        ("redis+cluster://localhost:7000", "RedisCluster"),
+        ("redis+sentinel://localhost:26379,other:26380/mymaster/1", "Redis"),
+    ],
+)
+def test_build_redis_client_by_scheme(url, class_name):
+    assert type(build_redis_client(url)).__name__ == class_name
@@ -0,0 +1,164 @@
+import asyncio
+
+import pytest
+
+from core.block.limiter import AdaptiveLimiter, TokenBucket
+from core.cache.breaker import cache_breaker
+from core.cache.utils import get_cache
+from core.exceptions.request import ClientDisconnected, DeadlineExceeded
+from core.request import (
+    cancel_on_disconnect,
+    get_request_timeout,
+    reset_request_deadline,
+    set_request_deadline,
+)
+
+VALID_ADDRESS = "0x000000000000000000000000000000000000dEaD"
+
+
+class _Request:
+    class url:
+        path = "/test"
+
+    def __init__(self, disconnected: bool) -> None:
+        self.disconnected = disconnected
+
+    async def is_disconnected(self) -> bool:
+        return self.disconnected
+
+
+def test_request_timeout_by_path_and_header(monkeypatch):
+    monkeypatch.setattr(
+        "config.settings.request_timeouts", {"/logs": 15.0, "/logs/stream": 0}
+    )
+    monkeypatch.setattr("config.settings.default_request_timeout", 10.0)
+
+    assert get_request_timeout(path="/logs/", header=None) == 15.0
+    assert get_request_timeout(path="/logs/stream", header="1") is None
+    assert get_request_timeout(path="/block/1/", header=None) == 10.0
+    assert get_request_timeout(path="/logs/", header="2.5") == 2.5
+    assert get_request_timeout(path="/logs/", header="60") == 15.0  # never longer
+    assert get_request_timeout(path="/logs/", header="soon") == 15.0
+
+
+@pytest.mark.asyncio
+async def test_slow_rpc_returns_504_at_deadline(async_client, monkeypatch):
+    async def mock_get_balance(web3, address, block_number):
+        await asyncio.sleep(5)
+        return 1
+
+    monkeypatch.setattr("api.block.get_balance_by_block", mock_get_balance)
+
+    response = await async_client.get(
+        f"/block/100/balance/{VALID_ADDRESS}/",
+        headers={"X-Request-Timeout": "0.05"},
+    )
+
+    assert response.status_code == 504
+
+
+@pytest.mark.asyncio
+async def test_redis_deadline_does_not_count_as_failure():
+    class _SlowRedis:
+        async def get(self, name):
+            await asyncio.sleep(5)
+
+    token = set_request_deadline(0.01)
+    try:
+        with pytest.raises(DeadlineExceeded):
+            await get_cache(client=_SlowRedis(), key="key")
+    finally:
+        reset_request_deadline(token)
+
+    assert cache_breaker._failures == 0
+
+
+@pytest.mark.asyncio
+async def test_redis_deadline_releases_probe(monkeypatch):
+    class _SlowRedis:
+        async def get(self, name):
+            await asyncio.sleep(5)
+
+    monkeypatch.setattr(cache_breaker, "failure_threshold", 1)
+    monkeypatch.setattr(cache_breaker, "reset_timeout", 0)
+    cache_breaker.record_failure()
+
+    token = set_request_deadline(0.01)
+    try:
+        with pytest.raises(DeadlineExceeded):
+            await get_cache(client=_SlowRedis(), key="key")
+    finally:
+        reset_request_deadline(token)
+
+    assert not cache_breaker._probing
+    assert cache_breaker.allow()
+
+
+@pytest.mark.asyncio
+async def test_disconnect_cancels_work(monkeypatch):
+    monkeypatch.setattr("config.settings.disconnect_poll_interval", 0.01)
+    cancelled = asyncio.Event()
+
+    async def work():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(ClientDisconnected):
+        await cancel_on_disconnect(request=_Request(disconnected=True), work=work())
+
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_disconnect_keeps_work_worth_caching(monkeypatch):
+    monkeypatch.setattr("config.settings.disconnect_poll_interval", 0.01)
+    finished = asyncio.Event()
+
+    async def work():
+        await asyncio.sleep(0.05)
+        finished.set()
+
+    with pytest.raises(ClientDisconnected):
+        await cancel_on_disconnect(
+            request=_Request(disconnected=True), work=work(), keep=True
+        )
+
+    await asyncio.wait_for(finished.wait(), timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_work_result_returned_while_connected(monkeypatch):
+    monkeypatch.setattr("config.settings.disconnect_poll_interval", 0.01)
+
+    async def work():
+        await asyncio.sleep(0.03)
+        return 42
+
+    assert (
+        await cancel_on_disconnect(request=_Request(disconnected=False), work=work())
+        == 42
+    )
+
+
+@pytest.mark.asyncio
+async def test_limiter_releases_slot_when_cancelled_on_bucket():
+    limiter = AdaptiveLimiter(
+        name="test",
+        initial_limit=4,
+        min_limit=1,
+        max_limit=8,
+        max_queue=10,
+        bucket=TokenBucket(rate=1, burst=1),
+    )
+    await limiter.acquire(timeout=5)
+
+    waiter = asyncio.create_task(limiter.acquire(timeout=5))
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert limiter.in_flight == 1
@@ -0,0 +1,120 @@
+import itertools
+
+import pytest
+
+from core.cache.disk import DiskCache
+from core.cache.utils import build_balance_cache_key
+
+VALID_ADDRESS = "0x000000000000000000000000000000000000dEaD"
+
+
+@pytest.fixture
+def disk_cache(monkeypatch, tmp_path):
+    cache = DiskCache(path=str(tmp_path / "cache.sqlite3"), max_bytes=1000)
+    monkeypatch.setattr("core.cache.disk._disk_cache", cache)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    ticks = itertools.count(1_000_000)
+    monkeypatch.setattr("core.cache.disk.time.time", lambda: next(ticks))
+    monkeypatch.setattr("core.cache.disk.ACCESS_RESOLUTION", 0)
+
+
+def test_disk_cache_roundtrip(disk_cache):
+    disk_cache.set_many({"a": b"1", "b": b"22"})
+
+    assert disk_cache.get_many(["a", "missing", "b"]) == [b"1", None, b"22"]
+    assert disk_cache.stats() == (2, 3)
+
+
+def test_disk_cache_evicts_least_recently_read(disk_cache, clock):
+    for index in range(10):
+        disk_cache.set_many({f"key:{index}": b"x" * 100})
+    disk_cache.get_many(["key:0"])  # recently read, survives eviction
+
+    disk_cache.set_many({"key:10": b"x" * 100})
+
+    entries, size = disk_cache.stats()
+    assert size <= disk_cache.max_bytes * 0.9
+    assert disk_cache.get_many(["key:0", "key:1", "key:10"]) == [
+        b"x" * 100,
+        None,
+        b"x" * 100,
+    ]
+
+
+def test_disk_cache_compact(disk_cache):
+    disk_cache.set_many({f"key:{index}": b"x" * 50 for index in range(10)})
+    disk_cache.max_bytes = 200
+
+    disk_cache.compact()
+
+    entries, size = disk_cache.stats()
+    assert size <= 200
+    assert entries == size // 50
+
+
+@pytest.mark.asyncio
+async def test_finalized_balance_survives_redis_flush(
+    async_client, monkeypatch, fake_redis, disk_cache
+):
+    monkeypatch.setattr("core.block.head._heads", {43114: 1000})
+    calls = {"count": 0}
+
+    async def mock_get_balance(web3, address, block_number):
+        calls["count"] += 1
+        return 5
+
+    monkeypatch.setattr("api.block.get_balance_by_block", mock_get_balance)
+
+    first = await async_client.get(f"/block/100/balance/{VALID_ADDRESS}/")
+    fake_redis._store.clear()
+    second = await async_client.get(f"/block/100/balance/{VALID_ADDRESS}/")
+
+    assert first.json() == second.json() == {"address": VALID_ADDRESS, "balance": 5}
+    assert calls["count"] == 1
+    key = build_balance_cache_key(
+        chain_id=43114, address=VALID_ADDRESS, block_number=100
+    )
+    assert key in fake_redis._store  # copied back to Redis
+
+
+@pytest.mark.asyncio
+async def test_unfinalized_balance_not_stored_on_disk(
+    async_client, monkeypatch, disk_cache
+):
+    monkeypatch.setattr("core.block.head._heads", {43114: 1000})
+
+    async def mock_get_balance(web3, address, block_number):
+        return 5
+
+    monkeypatch.setattr("api.block.get_balance_by_block", mock_get_balance)
+
+    await async_client.get(f"/block/1000/balance/{VALID_ADDRESS}/")
+
+    assert disk_cache.stats() == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_failure_does_not_fail_request(async_client, monkeypatch):
+    class _BrokenDiskCache:
+        def get_many(self, keys):
+            raise OSError("disk I/O error")
+
+        def set_many(self, values):
+            raise OSError("disk I/O error")
+
+    monkeypatch.setattr("core.cache.disk._disk_cache", _BrokenDiskCache())
+    monkeypatch.setattr("core.block.head._heads", {43114: 1000})
+
+    async def mock_get_balance(web3, address, block_number):
+        return 5
+
+    monkeypatch.setattr("api.block.get_balance_by_block", mock_get_balance)
+
+    response = await async_client.get(f"/block/100/balance/{VALID_ADDRESS}/")
+
+    assert response.status_code == 200
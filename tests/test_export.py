@@ -0,0 +1,246 @@
+import gzip
+import time
+
+import aiohttp
+import orjson
+import pytest
+from web3.exceptions import Web3RPCError
+
+from core.block import export
+from core.block.export import get_export_file, start_export_workers
+
+CONTRACT_ADDRESS = "0x66357dCaCe80431aee0A7507e2E361B7e2402370"
+
+
+def _log(block_number: int) -> dict:
+    return {
+        "address": CONTRACT_ADDRESS,
+        "blockHash": f"0x{block_number:064x}",
+        "blockNumber": block_number,
+        "data": "0x0",
+        "logIndex": 0,
+        "removed": False,
+        "topics": ["0xtopic"],
+        "transactionHash": "0x123",
+        "transactionIndex": 0,
+    }
+
+
+@pytest.fixture(autouse=True)
+def export_settings(monkeypatch, tmp_path, fake_redis):
+    async def _get_redis_client():
+        return fake_redis
+
+    monkeypatch.setattr("core.block.export.get_redis_client", _get_redis_client)
+    monkeypatch.setattr("config.settings.export_dir", str(tmp_path))
+    monkeypatch.setattr("config.settings.max_block_range", 10)
+    monkeypatch.setattr("config.settings.export_concurrency", 2)
+
+
+async def _no_sleep(delay: float) -> None:
+    pass
+
+
+async def _wait(job_id: str) -> None:
+    task = export._tasks.get(job_id)
+    if task is not None:
+        await task
+
+
+@pytest.mark.asyncio
+async def test_export_job_writes_ordered_ndjson(async_client, monkeypatch):
+    ranges: list[tuple[int, int]] = []
+
+    async def mock_get_logs(web3, address, from_block, to_block):
+        ranges.append((from_block, to_block))
+        return [_log(from_block)]
+
+    monkeypatch.setattr("core.cache.logs.get_logs_by_block_period", mock_get_logs)
+
+    response = await async_client.post(
+        "/export/logs/", json={"from_block": 0, "to_block": 44}
+    )
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+
+    await _wait(job_id)
+
+    job = (await async_client.get(f"/export/logs/{job_id}")).json()
+    assert job["status"] == "done"
+    assert job["logs"] == 5
+    assert job["progress"] == 1.0
+    assert sorted(ranges) == [(0, 9), (10, 19), (20, 29), (30, 39), (40, 44)]
+
+    download = await async_client.get(f"/export/logs/{job_id}/download")
+    assert download.status_code == 200
+    lines = gzip.decompress(download.content).splitlines()
+    assert [orjson.loads(line)["blockNumber"] for line in lines] == [0, 10, 20, 30, 40]
+
+
+@pytest.mark.asyncio
+async def test_export_resumes_from_checkpoint(monkeypatch, tmp_path):
+    ranges: list[tuple[int, int]] = []
+
+    async def mock_get_logs(web3, address, from_block, to_block):
+        ranges.append((from_block, to_block))
+        return [_log(from_block)]
+
+    monkeypatch.setattr("core.cache.logs.get_logs_by_block_period", mock_get_logs)
+
+    job_id = "a" * 32
+    checkpoint = gzip.compress(orjson.dumps(_log(0), option=orjson.OPT_APPEND_NEWLINE))
+    # Bytes written after the checkpoint by an interrupted worker are dropped
+    get_export_file(job_id).write_bytes(checkpoint + b"partial")
+    (tmp_path / f"{job_id}.json").write_bytes(
+        orjson.dumps(
+            {
+                "id": job_id,
+                "status": "running",
+                "chain_id": 43114,
+                "address": CONTRACT_ADDRESS,
+                "from_block": 0,
+                "to_block": 19,
+                "next_block": 10,
+                "logs": 1,
+                "size": len(checkpoint),
+                "error": None,
+                "created_at": time.time(),
+                "updated_at": time.time(),
+            }
+        )
+    )
+
+    await start_export_workers()
+    await _wait(job_id)
+
+    job = export.load_export_job(job_id)
+    assert job["status"] == "done"
+    assert job["logs"] == 2
+    assert ranges == [(10, 19)]
+
+    lines = gzip.decompress(get_export_file(job_id).read_bytes()).splitlines()
+    assert [orjson.loads(line)["blockNumber"] for line in lines] == [0, 10]
+
+
+@pytest.mark.asyncio
+async def test_export_job_fails_after_retries(async_client, monkeypatch):
+    monkeypatch.setattr("config.settings.export_retries", 0)
+
+    async def mock_get_logs(web3, address, from_block, to_block):
+        raise Web3RPCError("missing trie node")
+
+    monkeypatch.setattr("core.cache.logs.get_logs_by_block_period", mock_get_logs)
+
+    response = await async_client.post(
+        "/export/logs/", json={"from_block": 0, "to_block": 5}
+    )
+    job_id = response.json()["id"]
+    await _wait(job_id)
+
+    job = (await async_client.get(f"/export/logs/{job_id}")).json()
+    assert job["status"] == "failed"
+    assert job["error"] == "missing trie node"
+
+    download = await async_client.get(f"/export/logs/{job_id}/download")
+    assert download.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_export_retries_transport_errors(async_client, monkeypatch):
+    monkeypatch.setattr("core.block.export.asyncio.sleep", _no_sleep)
+    failures = {"left": 2}
+
+    async def mock_get_logs(web3, address, from_block, to_block):
+        if failures["left"]:
+            failures["left"] -= 1
+            raise aiohttp.ClientConnectionError("Connection reset by peer")
+        return [_log(from_block)]
+
+    monkeypatch.setattr("core.cache.logs.get_logs_by_block_period", mock_get_logs)
+
+    response = await async_client.post(
+        "/export/logs/", json={"from_block": 0, "to_block": 5}
+    )
+    job_id = response.json()["id"]
+    await _wait(job_id)
+
+    job = (await async_client.get(f"/export/logs/{job_id}")).json()
+    assert job["status"] == "done"
+    assert job["logs"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_export_resumes_from_checkpoint(async_client, monkeypatch):
+    monkeypatch.setattr("config.settings.export_retries", 0)
+    monkeypatch.setattr("config.settings.export_concurrency", 1)
+    ranges: list[tuple[int, int]] = []
+    down = {"value": False}
+
+    async def mock_get_logs(web3, address, from_block, to_block):
+        if from_block >= 10 and down["value"] is False:
+            down["value"] = True
+            raise aiohttp.ClientConnectionError("Cannot connect to host")
+        ranges.append((from_block, to_block))
+        return [_log(from_block)]
+
+    monkeypatch.setattr("core.cache.logs.get_logs_by_block_period", mock_get_logs)
+
+    response = await async_client.post(
+        "/export/logs/", json={"from_block": 0, "to_block": 19}
+    )
+    job_id = response.json()["id"]
+    await _wait(job_id)
+    assert (await async_client.get(f"/export/logs/{job_id}")).json()["status"] == (
+        "failed"
+    )
+
+    resumed = await async_client.post(f"/export/logs/{job_id}/resume")
+    assert resumed.status_code == 202
+    await _wait(job_id)
+
+    job = (await async_client.get(f"/export/logs/{job_id}")).json()
+    assert job["status"] == "done"
+    assert job["logs"] == 2
+    assert ranges == [(0, 9), (10, 19)]
+
+    again = await async_client.post(f"/export/logs/{job_id}/resume")
+    assert again.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_export_does_not_fill_disk_cache(async_client, monkeypatch):
+    monkeypatch.setattr("core.block.head._heads", {43114: 1000})
+    written: list[dict] = []
+
+    async def mock_set_disk_cache(values):
+        written.append(values)
+
+    async def mock_get_logs(web3, address, from_block, to_block):
+        return [_log(from_block)]
+
+    monkeypatch.setattr("core.cache.logs.set_disk_cache", mock_set_disk_cache)
+    monkeypatch.setattr("core.cache.logs.get_logs_by_block_period", mock_get_logs)
+
+    response = await async_client.post(
+        "/export/logs/", json={"from_block": 0, "to_block": 19}
+    )
+    await _wait(response.json()["id"])
+
+    assert written == []
+
+
+@pytest.mark.asyncio
+async def test_export_unknown_job(async_client):
+    response = await async_client.get(f"/export/logs/{'b' * 32}")
+    assert response.status_code == 404
+
+    response = await async_client.get("/export/logs/..%2Fsecret")
+    assert response.status_code in (404, 422)
+
+
+@pytest.mark.asyncio
+async def test_export_invalid_range(async_client):
+    response = await async_client.post(
+        "/export/logs/", json={"from_block": 10, "to_block": 5}
+    )
+    assert response.status_code == 422
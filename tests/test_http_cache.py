@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+
+from core.block.head import get_tracked_head, start_head_tracker, stop_head_tracker
+
+VALID_ADDRESS = "0x000000000000000000000000000000000000dEaD"
+
+
+@pytest.fixture
+def tracked_heads(monkeypatch):
+    heads: dict[int, int] = {43114: 1000, 1: 1000}
+    monkeypatch.setattr("core.block.head._heads", heads)
+    return heads
+
+
+@pytest.mark.asyncio
+async def test_finalized_balance_is_immutable(async_client, monkeypatch, tracked_heads):
+    async def mock_get_balance(web3, address, block_number):
+        return 1
+
+    monkeypatch.setattr("api.block.get_balance_by_block", mock_get_balance)
+
+    response = await async_client.get(f"/block/100/balance/{VALID_ADDRESS}/")
+
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"].endswith("immutable")
+    assert response.headers["ETag"].startswith('"')
+
+
+@pytest.mark.asyncio
+async def test_balance_near_head_is_short_lived(
+    async_client, monkeypatch, tracked_heads
+):
+    async def mock_get_balance(web3, address, block_number):
+        return 1
+
+    monkeypatch.setattr("api.block.get_balance_by_block", mock_get_balance)
+
+    response = await async_client.get(
+        f"/block/990/balance/{VALID_ADDRESS}/?chain_id=1"  # within 64 blocks
+    )
+
+    assert response.headers["Cache-Control"] == "public, max-age=2"
+
+
+@pytest.mark.asyncio
+async def test_balance_if_none_match(async_client, monkeypatch):
+    calls = {"count": 0}
+
+    async def mock_get_balance(web3, address, block_number):
+        calls["count"] += 1
+        return 1
+
+    monkeypatch.setattr("api.block.get_balance_by_block", mock_get_balance)
+
+    response = await async_client.get(f"/block/100/balance/{VALID_ADDRESS}/")
+    etag = response.headers["ETag"]
+
+    not_modified = await async_client.get(
+        f"/block/100/balance/{VALID_ADDRESS}/", headers={"If-None-Match": etag}
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag
+
+    modified = await async_client.get(
+        f"/block/100/balance/{VALID_ADDRESS}/", headers={"If-None-Match": '"stale"'}
+    )
+    assert modified.status_code == 200
+    assert calls["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_logs_etag_stable_across_cache_hit(async_client, monkeypatch):
+    sample_logs = [
+        {
+            "address": "0x66357dCaCe80431aee0A7507e2E361B7e2402370",
+            "blockHash": "0x1",
+            "blockNumber": 10,
+            "data": "0x0",
+            "logIndex": 0,
+            "removed": False,
+            "topics": ["0xabc"],
+            "transactionHash": "0x2",
+            "transactionIndex": 0,
+        }
+    ]
+
+    async def mock_get_logs(web3, address, from_block, to_block):
+        return sample_logs
+
+    monkeypatch.setattr("api.logs.get_logs_by_block_period", mock_get_logs)
+
+    first = await async_client.get("/logs/?from_block=5&to_block=15")
+    second = await async_client.get("/logs/?from_block=5&to_block=15")
+
+    assert first.headers["ETag"] == second.headers["ETag"]
+    assert second.json()["logs"] == sample_logs
+
+    not_modified = await async_client.get(
+        "/logs/?from_block=5&to_block=15",
+        headers={"If-None-Match": f'W/{first.headers["ETag"]}, "other"'},
+    )
+    assert not_modified.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_head_tracker_runs_without_listeners(monkeypatch, fake_web3_clients):
+    monkeypatch.setattr("core.block.head._listeners", [])
+    monkeypatch.setattr("core.block.head._heads", {})
+
+    await start_head_tracker()
+    try:
+        await asyncio.sleep(0.01)
+        assert get_tracked_head(chain_id=43114) == 0
+    finally:
+        await stop_head_tracker()
@@ -0,0 +1,151 @@
+import asyncio
+
+import pytest
+from web3.exceptions import Web3RPCError
+
+from core.block.limiter import (
+    AdaptiveLimiter,
+    TokenBucket,
+    get_upstream_limiter,
+    is_rate_limited,
+)
+from core.exceptions.limiter import UpstreamOverloaded
+
+VALID_ADDRESS = "0x000000000000000000000000000000000000dEaD"
+
+
+def _limiter(**kwargs) -> AdaptiveLimiter:
+    options = {
+        "name": "test",
+        "initial_limit": 4,
+        "min_limit": 1,
+        "max_limit": 8,
+        "max_queue": 10,
+    }
+    options.update(kwargs)
+    return AdaptiveLimiter(**options)
+
+
+@pytest.mark.asyncio
+async def test_limiter_aimd():
+    limiter = _limiter()
+
+    with pytest.raises(Web3RPCError):
+        async with limiter.slot(timeout=1):
+            raise Web3RPCError("Too Many Requests")
+    assert limiter.limit == 2
+
+    for _ in range(10):
+        async with limiter.slot(timeout=1):
+            pass
+    assert 2 < limiter.limit <= 8
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_halves_once_per_burst():
+    limiter = _limiter(initial_limit=16, max_limit=16)
+    started = asyncio.Event()
+
+    async def call():
+        async with limiter.slot(timeout=1):
+            await started.wait()
+            raise Web3RPCError("Too Many Requests")
+
+    calls = [asyncio.create_task(call()) for _ in range(16)]
+    await asyncio.sleep(0)
+    started.set()
+    results = await asyncio.gather(*calls, return_exceptions=True)
+
+    assert all(isinstance(result, Web3RPCError) for result in results)
+    assert limiter.limit == 8
+
+    with pytest.raises(Web3RPCError):
+        async with limiter.slot(timeout=1):
+            raise Web3RPCError("Too Many Requests")
+    assert limiter.limit == 4
+
+
+@pytest.mark.parametrize(
+    ("message", "rate_limited"),
+    [
+        ("rate limit exceeded", True),
+        ("daily request limit exceeded", True),
+        ("query returned more than 10000 results", False),
+        ("response size exceeded", False),
+    ],
+)
+def test_is_rate_limited(message, rate_limited):
+    assert is_rate_limited(Web3RPCError(message)) is rate_limited
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_split_between_workers(monkeypatch):
+    monkeypatch.setattr("config.settings.rpc_rate_limits", {1: 100.0})
+    monkeypatch.setattr("config.settings.web_concurrency", 16)
+
+    bucket = get_upstream_limiter(chain_id=1, method="eth_getBalance").bucket
+
+    assert bucket.rate == 6.25
+    assert bucket.burst == 7
+
+
+@pytest.mark.asyncio
+async def test_limiter_sheds_when_queue_full():
+    limiter = _limiter(initial_limit=1, max_queue=0)
+
+    async with limiter.slot(timeout=1):
+        with pytest.raises(UpstreamOverloaded) as exc_info:
+            await limiter.acquire(timeout=1)
+
+    assert exc_info.value.retry_after == 1
+
+
+@pytest.mark.asyncio
+async def test_limiter_sheds_after_deadline():
+    limiter = _limiter(initial_limit=1)
+
+    async with limiter.slot(timeout=1):
+        with pytest.raises(UpstreamOverloaded):
+            await limiter.acquire(timeout=0.01)
+
+    assert limiter.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_respects_deadline():
+    bucket = TokenBucket(rate=1, burst=1)
+    loop = asyncio.get_running_loop()
+
+    assert await bucket.acquire(deadline=loop.time() + 0.01)
+    assert not await bucket.acquire(deadline=loop.time() + 0.01)
+
+
+@pytest.mark.asyncio
+async def test_balance_by_block_load_shedding(async_client, monkeypatch):
+    async def mock_get_balance(web3, address, block_number):
+        return 1
+
+    monkeypatch.setattr("api.block.get_balance_by_block", mock_get_balance)
+    monkeypatch.setattr("config.settings.rpc_initial_concurrency", 0)
+    monkeypatch.setattr("config.settings.rpc_min_concurrency", 0)
+    monkeypatch.setattr("config.settings.rpc_queue_size", 0)
+
+    response = await async_client.get(f"/block/100/balance/{VALID_ADDRESS}/")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
+
+
+@pytest.mark.asyncio
+async def test_logs_load_shedding(async_client, monkeypatch):
+    async def mock_get_logs(web3, address, from_block, to_block):
+        raise UpstreamOverloaded("Upstream busy, retry later", retry_after=7)
+
+    monkeypatch.setattr("api.logs.get_logs_by_block_period", mock_get_logs)
+
+    response = await async_client.get("/logs/?from_block=0&to_block=10")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "7"
+    assert response.json() == {"detail": "Upstream busy, retry later"}
@@ -1,8 +1,17 @@
+from contextlib import asynccontextmanager
 from typing import Any
 
 import pytest
-
+from web3.exceptions import Web3RPCError
+
+from core.block.logs import (
+    get_chunk_sizer,
+    get_logs_by_block_period,
+    is_range_too_large,
+)
+from core.cache.utils import build_logs_cache_key
 from core.exceptions.logs import MaxBlockRangeLimit
+from schemas.logs import LogCursor
 
 
 @pytest.mark.asyncio
@@ -227,3 +236,260 @@ async def test_logs_by_block_period_caching(
     assert response2.status_code == 200
     assert call_count["count"] == 1
     assert response1.json() == response2.json()
+
+
+def _page_log(block_number: int, log_index: int) -> dict[str, Any]:
+    return {
+        "address": "0x66357dCaCe80431aee0A7507e2E361B7e2402370",
+        "blockHash": f"0x{block_number}",
+        "blockNumber": block_number,
+        "data": "0x0",
+        "logIndex": log_index,
+        "removed": False,
+        "topics": ["0xabc"],
+        "transactionHash": "0x2",
+        "transactionIndex": 0,
+    }
+
+
+PAGED_LOGS = [_page_log(10, 0), _page_log(10, 1), _page_log(11, 0), _page_log(12, 3)]
+
+
+@pytest.mark.asyncio
+async def test_logs_pages_are_served_from_cached_range(async_client, monkeypatch):
+    ranges: list[tuple[int, int]] = []
+
+    async def mock_get_logs(web3, address, from_block, to_block):
+        ranges.append((from_block, to_block))
+        return PAGED_LOGS
+
+    monkeypatch.setattr("api.logs.get_logs_by_block_period", mock_get_logs)
+
+    logs: list[dict[str, Any]] = []
+    cursor = None
+    for _ in range(3):
+        query = "/logs/?from_block=5&to_block=20&limit=3"
+        if cursor:
+            query += f"&cursor={cursor}"
+        response = await async_client.get(query)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["logs"]) <= 3
+        logs.extend(page["logs"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert logs == PAGED_LOGS
+    assert cursor is None
+    assert ranges == [(5, 20)]
+
+
+@pytest.mark.asyncio
+async def test_logs_pages_read_only_their_segments(
+    async_client, monkeypatch, fake_redis
+):
+    monkeypatch.setattr("config.settings.logs_max_page_size", 2)
+
+    async def mock_get_logs(web3, address, from_block, to_block):
+        return PAGED_LOGS
+
+    monkeypatch.setattr("api.logs.get_logs_by_block_period", mock_get_logs)
+
+    first = await async_client.get("/logs/?from_block=5&to_block=20&limit=1")
+    range_key = build_logs_cache_key(
+        chain_id=43114,
+        address="0x66357dCaCe80431aee0A7507e2E361B7e2402370",
+        from_block=5,
+        to_block=20,
+    )
+    # Later pages don't need the whole range
+    del fake_redis._store[range_key]
+
+    cursor = LogCursor.decode(first.json()["next_cursor"])
+    second = await async_client.get(
+        f"/logs/?from_block=5&to_block=20&limit=2&cursor={cursor.encode()}"
+    )
+
+    assert second.json()["logs"] == PAGED_LOGS[1:3]
+    assert second.json()["next_cursor"] is not None
+    assert range_key not in fake_redis._store
+
+
+@pytest.mark.asyncio
+async def test_logs_default_page_size(async_client, monkeypatch):
+    monkeypatch.setattr("config.settings.logs_default_page_size", 3)
+
+    async def mock_get_logs(web3, address, from_block, to_block):
+        return PAGED_LOGS
+
+    monkeypatch.setattr("api.logs.get_logs_by_block_period", mock_get_logs)
+
+    response = await async_client.get("/logs/?from_block=5&to_block=20")
+
+    assert response.json()["logs"] == PAGED_LOGS[:3]
+    assert response.json()["next_cursor"] is not None
+
+
+@pytest.mark.asyncio
+async def test_logs_page_after_cache_expiry_fetches_rest_only(
+    async_client, monkeypatch, fake_redis
+):
+    ranges: list[tuple[int, int]] = []
+
+    async def mock_get_logs(web3, address, from_block, to_block):
+        ranges.append((from_block, to_block))
+        return [log for log in PAGED_LOGS if log["blockNumber"] >= from_block]
+
+    monkeypatch.setattr("api.logs.get_logs_by_block_period", mock_get_logs)
+
+    first = await async_client.get("/logs/?from_block=5&to_block=20&limit=2")
+    fake_redis._store.clear()
+    second = await async_client.get(
+        f"/logs/?from_block=5&to_block=20&limit=2&cursor={first.json()['next_cursor']}"
+    )
+
+    assert second.status_code == 200
+    assert second.json()["logs"] == PAGED_LOGS[2:]
+    assert second.json()["next_cursor"] is None
+    assert ranges == [(5, 20), (10, 20)]
+
+
+@pytest.mark.asyncio
+async def test_logs_without_limit_are_not_paged(async_client, monkeypatch):
+    async def mock_get_logs(web3, address, from_block, to_block):
+        return PAGED_LOGS
+
+    monkeypatch.setattr("api.logs.get_logs_by_block_period", mock_get_logs)
+
+    response = await async_client.get("/logs/?from_block=5&to_block=20")
+
+    assert response.json() == {"logs": PAGED_LOGS}
+
+
+@pytest.mark.asyncio
+async def test_logs_invalid_cursor(async_client):
+    response = await async_client.get("/logs/?from_block=5&to_block=20&cursor=abc")
+    assert response.status_code == 422
+
+    other_range = LogCursor(anchor=100, block_number=110, log_index=0).encode()
+    response = await async_client.get(
+        f"/logs/?from_block=5&to_block=20&cursor={other_range}"
+    )
+    assert response.status_code == 400
+
+
+class _ChunkedEth:
+    def __init__(self, max_span: int) -> None:
+        self.max_span = max_span
+        self.calls: list[tuple[int, int]] = []
+
+    async def get_logs(self, filter_params):
+        from_block, to_block = filter_params["fromBlock"], filter_params["toBlock"]
+        self.calls.append((from_block, to_block))
+        if to_block - from_block > self.max_span:
+            raise Web3RPCError("query returned more than 10000 results")
+        return [{"blockNumber": block} for block in range(from_block, to_block + 1)]
+
+
+class _ChunkedWeb3:
+    def __init__(self, max_span: int) -> None:
+        self.eth = _ChunkedEth(max_span=max_span)
+
+
+@pytest.mark.asyncio
+async def test_get_logs_shrinks_chunk_on_too_many_results(monkeypatch):
+    monkeypatch.setattr("core.block.logs._chunk_sizers", {})
+    web3 = _ChunkedWeb3(max_span=500)
+
+    logs = await get_logs_by_block_period(
+        web3=web3, address="0x0", from_block=0, to_block=3000
+    )
+
+    assert [log["blockNumber"] for log in logs] == list(range(3001))
+    failed = [call for call in web3.eth.calls if call[1] - call[0] > 500]
+    assert len(failed) < len(web3.eth.calls) / 2
+    assert get_chunk_sizer(chain_id=None).ceiling < 3000
+
+
+@pytest.mark.asyncio
+async def test_get_logs_takes_a_limiter_slot_per_call(monkeypatch):
+    monkeypatch.setattr("core.block.logs._chunk_sizers", {})
+    web3 = _ChunkedWeb3(max_span=500)
+    slots: list[str] = []
+
+    @asynccontextmanager
+    async def counting_slot(chain_id, method):
+        slots.append(method)
+        yield
+
+    monkeypatch.setattr("core.block.logs.upstream_slot", counting_slot)
+
+    await get_logs_by_block_period(
+        web3=web3, address="0x0", from_block=0, to_block=3000
+    )
+
+    assert slots == ["eth_getLogs"] * len(web3.eth.calls)
+
+
+@pytest.mark.asyncio
+async def test_get_logs_remembers_chunk_size(monkeypatch):
+    monkeypatch.setattr("core.block.logs._chunk_sizers", {})
+    monkeypatch.setattr("config.settings.logs_target_results", 10_000)
+    web3 = _ChunkedWeb3(max_span=100)
+
+    await get_logs_by_block_period(web3=web3, address="0x0", from_block=0, to_block=0)
+    web3.eth.calls.clear()
+    get_chunk_sizer(chain_id=None).span = 100
+
+    await get_logs_by_block_period(web3=web3, address="0x0", from_block=0, to_block=200)
+
+    assert web3.eth.calls[0] == (0, 100)
+
+
+@pytest.mark.parametrize(
+    ("message", "too_large"),
+    [
+        ("query returned more than 10000 results", True),
+        ("Log response size exceeded", True),
+        ("rate limit exceeded", False),
+        ("daily request limit exceeded", False),
+    ],
+)
+def test_is_range_too_large(message, too_large):
+    assert is_range_too_large(Web3RPCError(message)) is too_large
+
+
+@pytest.mark.asyncio
+async def test_get_logs_does_not_shrink_when_throttled(monkeypatch):
+    monkeypatch.setattr("core.block.logs._chunk_sizers", {})
+    web3 = _ChunkedWeb3(max_span=500)
+
+    async def throttled(filter_params):
+        web3.eth.calls.append((filter_params["fromBlock"], filter_params["toBlock"]))
+        raise Web3RPCError("rate limit exceeded")
+
+    web3.eth.get_logs = throttled
+
+    with pytest.raises(Web3RPCError):
+        await get_logs_by_block_period(
+            web3=web3, address="0x0", from_block=0, to_block=3000
+        )
+
+    assert len(web3.eth.calls) == 1
+    assert get_chunk_sizer(chain_id=None).span == 3000
+
+
+@pytest.mark.asyncio
+async def test_get_logs_chunk_span_floor(monkeypatch):
+    monkeypatch.setattr("core.block.logs._chunk_sizers", {})
+    monkeypatch.setattr("config.settings.logs_min_block_span", 10)
+    web3 = _ChunkedWeb3(max_span=0)
+
+    with pytest.raises(Web3RPCError):
+        await get_logs_by_block_period(
+            web3=web3, address="0x0", from_block=0, to_block=100
+        )
+
+    assert get_chunk_sizer(chain_id=None).span == 10
+    assert min(end - start for start, end in web3.eth.calls) == 10
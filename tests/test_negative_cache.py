@@ -0,0 +1,190 @@
+import time
+
+import pytest
+from web3.exceptions import Web3RPCError
+
+from core.block.errors import classify_rpc_error, negative_cache_ttl
+from core.cache.utils import build_balance_cache_key, build_error_cache_key
+
+VALID_ADDRESS = "0x000000000000000000000000000000000000dEaD"
+
+
+def test_classify_rpc_error():
+    assert classify_rpc_error(Web3RPCError("missing trie node abc")) == "pruned"
+    assert classify_rpc_error(Web3RPCError("header not found")) == "unknown_block"
+    assert classify_rpc_error(Web3RPCError("invalid argument 0")) == "invalid"
+    assert classify_rpc_error(Web3RPCError("connection reset by peer")) is None
+    assert classify_rpc_error(ValueError("missing trie node")) is None
+
+
+def test_negative_cache_ttl_by_kind(monkeypatch):
+    monkeypatch.setattr(
+        "config.settings.negative_cache_ttls", {"pruned": 60, "unknown_block": 1}
+    )
+
+    assert negative_cache_ttl(Web3RPCError("missing trie node")) == 60
+    assert negative_cache_ttl(Web3RPCError("unknown block")) == 1
+    assert negative_cache_ttl(Web3RPCError("invalid params")) is None
+    assert negative_cache_ttl(Web3RPCError("timeout")) is None
+
+
+@pytest.mark.asyncio
+async def test_deterministic_rpc_error_is_cached(async_client, monkeypatch, fake_redis):
+    calls = {"count": 0}
+
+    async def mock_get_balance(web3, address, block_number):
+        calls["count"] += 1
+        raise Web3RPCError("missing trie node")
+
+    monkeypatch.setattr("api.block.get_balance_by_block", mock_get_balance)
+
+    response1 = await async_client.get(f"/block/100/balance/{VALID_ADDRESS}/")
+    response2 = await async_client.get(f"/block/100/balance/{VALID_ADDRESS}/")
+
+    assert response1.status_code == 502
+    assert response2.status_code == 502
+    assert response2.json() == response1.json()
+    assert calls["count"] == 1
+
+    key = build_balance_cache_key(
+        chain_id=43114, address=VALID_ADDRESS, block_number=100
+    )
+    assert build_error_cache_key(key) in fake_redis._store
+
+
+@pytest.mark.asyncio
+async def test_transient_rpc_error_is_not_cached(async_client, monkeypatch):
+    calls = {"count": 0}
+
+    async def mock_get_balance(web3, address, block_number):
+        calls["count"] += 1
+        raise Web3RPCError("upstream connect error")
+
+    monkeypatch.setattr("api.block.get_balance_by_block", mock_get_balance)
+
+    await async_client.get(f"/block/100/balance/{VALID_ADDRESS}/")
+    response = await async_client.get(f"/block/100/balance/{VALID_ADDRESS}/")
+
+    assert response.status_code == 502
+    assert calls["count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_logs_deterministic_rpc_error_is_cached(async_client, monkeypatch):
+    calls = {"count": 0}
+
+    async def mock_get_logs(web3, address, from_block, to_block):
+        calls["count"] += 1
+        raise Web3RPCError("invalid params")
+
+    monkeypatch.setattr("api.logs.get_logs_by_block_period", mock_get_logs)
+
+    await async_client.get("/logs/?from_block=50&to_block=60")
+    response = await async_client.get("/logs/?from_block=50&to_block=60")
+
+    assert response.status_code == 502
+    assert calls["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_block_past_head_rejected_without_rpc(async_client, monkeypatch):
+    monkeypatch.setattr("core.block.head._heads", {43114: 1000})
+    monkeypatch.setattr("core.block.head._head_updated", {43114: time.monotonic()})
+    monkeypatch.setattr("config.settings.future_block_tolerance", 5)
+
+    async def mock_get_balance(web3, address, block_number):
+        raise AssertionError("RPC must not be called")
+
+    async def mock_get_logs(web3, address, from_block, to_block):
+        raise AssertionError("RPC must not be called")
+
+    monkeypatch.setattr("api.block.get_balance_by_block", mock_get_balance)
+    monkeypatch.setattr("api.logs.get_logs_by_block_period", mock_get_logs)
+
+    balance = await async_client.get(f"/block/1006/balance/{VALID_ADDRESS}/")
+    logs = await async_client.get("/logs/?from_block=900&to_block=2000")
+
+    assert balance.status_code == 400
+    assert logs.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_block_within_head_tolerance_allowed(async_client, monkeypatch):
+    monkeypatch.setattr("core.block.head._heads", {43114: 1000})
+    monkeypatch.setattr("config.settings.future_block_tolerance", 5)
+
+    async def mock_get_balance(web3, address, block_number):
+        return 7
+
+    monkeypatch.setattr("api.block.get_balance_by_block", mock_get_balance)
+
+    response = await async_client.get(f"/block/1005/balance/{VALID_ADDRESS}/")
+
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_stale_head_not_trusted(async_client, monkeypatch):
+    monkeypatch.setattr("core.block.head._heads", {43114: 1000})
+    monkeypatch.setattr("core.block.head._head_updated", {43114: time.monotonic() - 60})
+    monkeypatch.setattr("config.settings.head_max_age", 30)
+
+    async def mock_get_balance(web3, address, block_number):
+        return 7
+
+    monkeypatch.setattr("api.block.get_balance_by_block", mock_get_balance)
+
+    response = await async_client.get(f"/block/1100/balance/{VALID_ADDRESS}/")
+
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_token_balances_past_head_and_negative_cache(async_client, monkeypatch):
+    monkeypatch.setattr("core.block.head._heads", {43114: 1000})
+    monkeypatch.setattr("core.block.head._head_updated", {43114: time.monotonic()})
+    calls = {"count": 0}
+
+    async def mock_get_token_balances(web3, pairs, block_number):
+        calls["count"] += 1
+        raise Web3RPCError("missing trie node abc")
+
+    monkeypatch.setattr(
+        "api.block.get_token_balances_by_block", mock_get_token_balances
+    )
+    body = {"pairs": [{"token": VALID_ADDRESS, "holder": VALID_ADDRESS}]}
+
+    past_head = await async_client.post("/block/1006/token-balances/", json=body)
+    first = await async_client.post("/block/100/token-balances/", json=body)
+    second = await async_client.post("/block/100/token-balances/", json=body)
+
+    assert past_head.status_code == 400
+    assert first.status_code == second.status_code == 502
+    assert calls["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_balance_fan_out_past_head_and_negative_cache(
+    async_client, monkeypatch, fake_web3_clients
+):
+    monkeypatch.setattr("core.block.head._heads", {43114: 1000, 1: 1000})
+    monkeypatch.setattr(
+        "core.block.head._head_updated", {43114: time.monotonic(), 1: time.monotonic()}
+    )
+    calls = {"count": 0}
+
+    async def mock_get_balance(web3, address, block_number):
+        calls["count"] += 1
+        raise Web3RPCError("missing trie node abc")
+
+    monkeypatch.setattr("api.balance.get_balance_by_block", mock_get_balance)
+
+    for _ in range(2):
+        response = await async_client.get(
+            f"/balance/{VALID_ADDRESS}/?block=1:100&block=43114:1006"
+        )
+        eth, avax = response.json()["balances"]
+        assert eth["error"] == "missing trie node abc"
+        assert "past the chain head" in avax["error"]
+
+    assert calls["count"] == 1
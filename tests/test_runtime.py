@@ -0,0 +1,29 @@
+import pytest
+
+from core.runtime import worker_count
+
+
+@pytest.fixture
+def cpus(monkeypatch):
+    def _set(value: float) -> None:
+        monkeypatch.setattr("core.runtime.available_cpus", lambda: value)
+
+    return _set
+
+
+def test_worker_count_follows_cpus(cpus, monkeypatch):
+    cpus(16)
+    assert worker_count() == 16
+
+    cpus(1.5)  # fractional cgroup quota
+    assert worker_count() == 2
+
+
+def test_worker_count_settings(cpus, monkeypatch):
+    cpus(16)
+    monkeypatch.setattr("config.settings.gunicorn_workers_per_core", 0.5)
+    monkeypatch.setattr("config.settings.gunicorn_max_workers", 4)
+    assert worker_count() == 4
+
+    monkeypatch.setattr("config.settings.gunicorn_workers", 3)
+    assert worker_count() == 3
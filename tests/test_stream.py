@@ -0,0 +1,73 @@
+import orjson
+import pytest
+
+from core.block.stream import broadcast_new_logs, subscribe_logs, unsubscribe_logs
+
+SAMPLE_LOG = {
+    "address": "0x66357dCaCe80431aee0A7507e2E361B7e2402370",
+    "blockHash": "0x1",
+    "blockNumber": 11,
+    "data": "0x0",
+    "logIndex": 0,
+    "removed": False,
+    "topics": ["0xabc"],
+    "transactionHash": "0x2",
+    "transactionIndex": 0,
+}
+
+
+@pytest.fixture(autouse=True)
+def reset_stream(monkeypatch):
+    monkeypatch.setattr("core.block.stream._subscribers", set())
+    monkeypatch.setattr("core.block.stream._last_block", None)
+
+
+@pytest.mark.asyncio
+async def test_one_fetch_fans_out_to_all_subscribers(monkeypatch):
+    ranges: list[tuple[int, int]] = []
+
+    async def mock_get_logs(web3, address, from_block, to_block):
+        ranges.append((from_block, to_block))
+        return [SAMPLE_LOG]
+
+    monkeypatch.setattr("core.block.stream.get_logs_by_block_period", mock_get_logs)
+    queues = [subscribe_logs() for _ in range(3)]
+
+    await broadcast_new_logs(chain_id=43114, block_number=10)
+    await broadcast_new_logs(chain_id=43114, block_number=12)
+
+    assert ranges == [(10, 10), (11, 12)]
+    for queue in queues:
+        assert queue.qsize() == 2
+        queue.get_nowait()
+        event: bytes = queue.get_nowait()
+        assert event.startswith(b"id: 12\nevent: logs\n")
+        data = orjson.loads(event.split(b"data: ", 1)[1])
+        assert data["logs"] == [SAMPLE_LOG]
+        assert (data["from_block"], data["to_block"]) == (11, 12)
+        unsubscribe_logs(queue)
+
+
+@pytest.mark.asyncio
+async def test_no_fetch_without_subscribers(monkeypatch):
+    async def mock_get_logs(*_, **__):
+        raise AssertionError("should not fetch")
+
+    monkeypatch.setattr("core.block.stream.get_logs_by_block_period", mock_get_logs)
+
+    await broadcast_new_logs(chain_id=43114, block_number=10)
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_is_dropped(monkeypatch):
+    async def mock_get_logs(web3, address, from_block, to_block):
+        return [SAMPLE_LOG]
+
+    monkeypatch.setattr("core.block.stream.get_logs_by_block_period", mock_get_logs)
+    monkeypatch.setattr("config.settings.logs_stream_queue_size", 1)
+    queue = subscribe_logs()
+
+    await broadcast_new_logs(chain_id=43114, block_number=10)
+    await broadcast_new_logs(chain_id=43114, block_number=11)
+
+    assert queue.get_nowait() is None
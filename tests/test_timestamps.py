@@ -0,0 +1,239 @@
+import asyncio
+
+import pytest
+
+from core.block.timestamps import (
+    BlockTimeIndex,
+    get_block_by_timestamp,
+    get_block_time_index,
+)
+
+GENESIS_TIMESTAMP = 1_600_000_000
+HEAD = 100_000
+VALID_ADDRESS = "0x000000000000000000000000000000000000dEaD"
+
+
+def block_timestamp(block_number: int) -> int:
+    # ~2s blocks with a slower stretch in the middle, several blocks per second at times
+    if block_number < 40_000:
+        return GENESIS_TIMESTAMP + 2 * block_number
+    if block_number < 60_000:
+        return GENESIS_TIMESTAMP + 80_000 + 5 * (block_number - 40_000)
+    return GENESIS_TIMESTAMP + 180_000 + (block_number - 60_000) // 3
+
+
+class _ChainEth:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def get_block(self, block_identifier):
+        self.calls += 1
+        number = HEAD if block_identifier == "latest" else block_identifier
+        return {"number": number, "timestamp": block_timestamp(number)}
+
+
+class _ChainWeb3:
+    def __init__(self) -> None:
+        self.eth = _ChainEth()
+
+
+def expected_before(timestamp: int) -> int | None:
+    low, high = 0, HEAD
+    if block_timestamp(0) > timestamp:
+        return None
+    while low < high:
+        mid = (low + high + 1) // 2
+        if block_timestamp(mid) <= timestamp:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+@pytest.fixture(autouse=True)
+def reset_indexes(monkeypatch):
+    monkeypatch.setattr("core.block.timestamps._indexes", {})
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "timestamp",
+    [
+        GENESIS_TIMESTAMP - 1,
+        GENESIS_TIMESTAMP,
+        GENESIS_TIMESTAMP + 12_345,
+        GENESIS_TIMESTAMP + 150_003,
+        GENESIS_TIMESTAMP + 185_000,
+        GENESIS_TIMESTAMP + 10**9,
+    ],
+)
+async def test_block_before_timestamp(fake_redis, timestamp):
+    web3 = _ChainWeb3()
+
+    block_number = await get_block_by_timestamp(
+        web3=web3, cache=fake_redis, chain_id=43114, timestamp=timestamp
+    )
+
+    assert block_number == expected_before(timestamp)
+    assert web3.eth.calls <= 40
+
+
+@pytest.mark.asyncio
+async def test_block_after_timestamp(fake_redis):
+    web3 = _ChainWeb3()
+    timestamp = GENESIS_TIMESTAMP + 185_000  # 3 blocks per second here
+
+    block_number = await get_block_by_timestamp(
+        web3=web3, cache=fake_redis, chain_id=43114, timestamp=timestamp, mode="after"
+    )
+
+    assert block_timestamp(block_number) >= timestamp
+    assert block_timestamp(block_number - 1) < timestamp
+    assert (
+        await get_block_by_timestamp(
+            web3=web3,
+            cache=fake_redis,
+            chain_id=43114,
+            timestamp=GENESIS_TIMESTAMP + 10**9,
+            mode="after",
+        )
+        is None
+    )
+
+
+@pytest.mark.asyncio
+async def test_resolved_timestamps_are_persisted(fake_redis, monkeypatch):
+    web3 = _ChainWeb3()
+    timestamp = GENESIS_TIMESTAMP + 12_345
+
+    first = await get_block_by_timestamp(
+        web3=web3, cache=fake_redis, chain_id=43114, timestamp=timestamp
+    )
+    calls = web3.eth.calls
+
+    # Fresh worker: index is loaded from Redis
+    monkeypatch.setattr("core.block.timestamps._indexes", {})
+    second = await get_block_by_timestamp(
+        web3=web3, cache=fake_redis, chain_id=43114, timestamp=timestamp
+    )
+
+    assert first == second
+    assert web3.eth.calls == calls
+
+
+@pytest.mark.asyncio
+async def test_lookups_probe_concurrently(fake_redis):
+    in_flight = {"now": 0, "max": 0}
+
+    class _SlowEth(_ChainEth):
+        async def get_block(self, block_identifier):
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(0.001)
+            in_flight["now"] -= 1
+            return await super().get_block(block_identifier)
+
+    web3 = _ChainWeb3()
+    web3.eth = _SlowEth()
+    timestamps = [GENESIS_TIMESTAMP + 12_345, GENESIS_TIMESTAMP + 150_003]
+
+    results = await asyncio.gather(
+        *(
+            get_block_by_timestamp(
+                web3=web3, cache=fake_redis, chain_id=43114, timestamp=timestamp
+            )
+            for timestamp in timestamps
+        )
+    )
+
+    assert results == [expected_before(timestamp) for timestamp in timestamps]
+    assert in_flight["max"] > 1
+
+
+@pytest.mark.asyncio
+async def test_index_samples_are_capped(fake_redis, monkeypatch):
+    monkeypatch.setattr("config.settings.block_time_max_samples", 20)
+    web3 = _ChainWeb3()
+
+    for offset in range(0, 180_000, 15_000):
+        assert await get_block_by_timestamp(
+            web3=web3,
+            cache=fake_redis,
+            chain_id=43114,
+            timestamp=GENESIS_TIMESTAMP + offset,
+        ) == expected_before(GENESIS_TIMESTAMP + offset)
+
+    assert len(get_block_time_index(chain_id=43114).blocks) <= 20
+    assert len(fake_redis._store["block_time:43114"]) <= 20
+
+
+def test_index_bracket():
+    index = BlockTimeIndex(chain_id=1, max_samples=100)
+    for block_number in (0, 10, 20):
+        index.add(block_number, block_number * 2)
+
+    assert index.bracket(21) == (1, 2)
+    assert index.bracket(40) == (2, None)
+    assert index.bracket(-1) == (None, 0)
+
+
+@pytest.mark.asyncio
+async def test_balance_at_timestamp(async_client, monkeypatch, fake_web3_clients):
+    fake_web3_clients[43114].eth = _ChainEth()
+    timestamp = GENESIS_TIMESTAMP + 12_345
+
+    async def mock_get_balance(web3, address, block_number):
+        assert block_number == expected_before(timestamp)
+        return 9
+
+    monkeypatch.setattr("api.block.get_balance_by_block", mock_get_balance)
+
+    response = await async_client.get(
+        f"/block/balance/{VALID_ADDRESS}/?at_timestamp={timestamp}"
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "address": VALID_ADDRESS,
+        "balance": 9,
+        "block_number": expected_before(timestamp),
+    }
+
+
+@pytest.mark.asyncio
+async def test_balance_at_timestamp_before_genesis(async_client, fake_web3_clients):
+    fake_web3_clients[43114].eth = _ChainEth()
+
+    response = await async_client.get(
+        f"/block/balance/{VALID_ADDRESS}/?at_timestamp={GENESIS_TIMESTAMP - 1}"
+    )
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_logs_by_time_window(async_client, monkeypatch, fake_web3_clients):
+    fake_web3_clients[43114].eth = _ChainEth()
+
+    async def mock_get_logs(web3, address, from_block, to_block):
+        assert (from_block, to_block) == (50, 100)
+        return []
+
+    monkeypatch.setattr("api.logs.get_logs_by_block_period", mock_get_logs)
+
+    response = await async_client.get(
+        f"/logs/?from_time={GENESIS_TIMESTAMP + 99}&to_time={GENESIS_TIMESTAMP + 201}"
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"logs": []}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "query", ["to_time=10", "from_block=1&from_time=1", "from_time=5&to_time=1"]
+)
+async def test_logs_invalid_time_window(async_client, query):
+    response = await async_client.get(f"/logs/?{query}")
+
+    assert response.status_code == 422
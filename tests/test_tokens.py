@@ -0,0 +1,135 @@
+import pytest
+from eth_abi import decode, encode
+from web3.exceptions import Web3RPCError
+
+from core.block.tokens import (
+    AGGREGATE3_SELECTOR,
+    MULTICALL3_ADDRESS,
+    get_token_balances_by_block,
+)
+
+TOKEN = "0xB97EF9Ef8734C71904D8002F8b6Bc66Dd9c48a6E"
+HOLDER = "0x000000000000000000000000000000000000dEaD"
+OTHER_HOLDER = "0x0000000000000000000000000000000000000001"
+
+
+class _MulticallEth:
+    """Answers balanceOf with the holder's last byte, 'reverts' for holder 0x...01."""
+
+    def __init__(self, multicall: bool = True, error: Exception | None = None) -> None:
+        self.multicall = multicall
+        self.error = error
+        self.calls = 0
+
+    def _balance(self, data: bytes) -> tuple[bool, bytes]:
+        (holder,) = decode(["address"], data[4:])
+        if holder.endswith("01"):
+            return False, b""
+        return True, encode(["uint256"], [int(holder[-2:], 16)])
+
+    async def call(self, transaction, block_identifier):
+        self.calls += 1
+        if transaction["to"] != MULTICALL3_ADDRESS:
+            success, data = self._balance(transaction["data"])
+            return data
+        if self.error is not None:
+            raise self.error
+        if not self.multicall:
+            return b""  # no code at the address
+
+        assert transaction["data"][:4] == AGGREGATE3_SELECTOR
+        (calls,) = decode(["(address,bool,bytes)[]"], transaction["data"][4:])
+        results = [self._balance(data) for _, _, data in calls]
+        return encode(["(bool,bytes)[]"], [results])
+
+    async def get_code(self, address, block_identifier):
+        return b"\x60\x80" if self.multicall else b""
+
+
+class _Web3:
+    def __init__(self, eth: _MulticallEth) -> None:
+        self.eth = eth
+
+
+@pytest.mark.asyncio
+async def test_token_balances_are_chunked_multicalls(monkeypatch):
+    monkeypatch.setattr("config.settings.token_balances_chunk_size", 2)
+    web3 = _Web3(_MulticallEth())
+
+    balances = await get_token_balances_by_block(
+        web3=web3,
+        pairs=[(TOKEN, HOLDER), (TOKEN, OTHER_HOLDER), (TOKEN, HOLDER)],
+        block_number=100,
+    )
+
+    assert balances == [0xAD, None, 0xAD]
+    assert web3.eth.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_token_balances_fall_back_without_multicall():
+    web3 = _Web3(_MulticallEth(multicall=False))
+
+    balances = await get_token_balances_by_block(
+        web3=web3, pairs=[(TOKEN, HOLDER), (TOKEN, OTHER_HOLDER)], block_number=100
+    )
+
+    assert balances == [0xAD, None]
+
+
+@pytest.mark.asyncio
+async def test_token_balances_rpc_errors_do_not_fall_back():
+    web3 = _Web3(_MulticallEth(error=Web3RPCError("rate limit exceeded")))
+
+    with pytest.raises(Web3RPCError):
+        await get_token_balances_by_block(
+            web3=web3, pairs=[(TOKEN, HOLDER)] * 10, block_number=100
+        )
+
+    assert web3.eth.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_token_balances_endpoint_caches_pairs(async_client, monkeypatch):
+    fetched: list[list[tuple[str, str]]] = []
+
+    async def mock_get_token_balances(web3, pairs, block_number):
+        fetched.append(list(pairs))
+        return [7 if holder == HOLDER else None for _, holder in pairs]
+
+    monkeypatch.setattr(
+        "api.block.get_token_balances_by_block", mock_get_token_balances
+    )
+    body = {
+        "pairs": [
+            {"token": TOKEN.lower(), "holder": HOLDER},
+            {"token": TOKEN, "holder": OTHER_HOLDER},
+        ]
+    }
+
+    response = await async_client.post("/block/100/token-balances/", json=body)
+    assert response.status_code == 200
+    assert response.json() == {
+        "block_number": 100,
+        "balances": [
+            {"token": TOKEN, "holder": HOLDER, "balance": 7},
+            {"token": TOKEN, "holder": OTHER_HOLDER, "balance": None},
+        ],
+    }
+
+    await async_client.post("/block/100/token-balances/", json=body)
+    # Only the failed pair is fetched again
+    assert fetched == [
+        [(TOKEN, HOLDER), (TOKEN, OTHER_HOLDER)],
+        [(TOKEN, OTHER_HOLDER)],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_token_balances_endpoint_limits_pairs(async_client, monkeypatch):
+    monkeypatch.setattr("config.settings.max_token_pairs", 1)
+    body = {"pairs": [{"token": TOKEN, "holder": HOLDER}] * 2}
+
+    response = await async_client.post("/block/100/token-balances/", json=body)
+
+    assert response.status_code == 422
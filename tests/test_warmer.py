@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+from pydantic import ValidationError
+
+from config import Settings
+from core.block import head
+from core.block.head import notify_new_head
+
+from core.cache.warmer import warm_head
+
+WATCHED_ADDRESS = "0x000000000000000000000000000000000000dEaD"
+
+
+@pytest.fixture(autouse=True)
+def warmer_redis(monkeypatch, fake_redis):
+    async def _get_redis_client():
+        return fake_redis
+
+    monkeypatch.setattr("core.cache.warmer.get_redis_client", _get_redis_client)
+    monkeypatch.setattr("core.cache.warmer._log_buckets", {})
+    monkeypatch.setattr("config.settings.warm_addresses", [WATCHED_ADDRESS])
+
+
+@pytest.mark.asyncio
+async def test_warmed_balance_is_served_from_cache(async_client, monkeypatch):
+    calls = {"count": 0}
+
+    async def mock_get_balance(web3, address, block_number):
+        calls["count"] += 1
+        return 10
+
+    monkeypatch.setattr("core.cache.warmer.get_balance_by_block", mock_get_balance)
+    monkeypatch.setattr("api.block.get_balance_by_block", mock_get_balance)
+
+    await warm_head(chain_id=43114, block_number=500)
+    await warm_head(chain_id=43114, block_number=500)  # locked, no refetch
+    assert calls["count"] == 1
+
+    response = await async_client.get(f"/block/500/balance/{WATCHED_ADDRESS}/")
+
+    assert response.status_code == 200
+    assert response.json()["balance"] == 10
+    assert calls["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_warm_logs_fetches_only_new_blocks(async_client, monkeypatch):
+    ranges: list[tuple[int, int]] = []
+
+    async def mock_get_logs(web3, address, from_block, to_block):
+        ranges.append((from_block, to_block))
+        return []
+
+    monkeypatch.setattr("core.cache.warmer.get_logs_by_block_period", mock_get_logs)
+    monkeypatch.setattr("config.settings.warm_addresses", [])
+    monkeypatch.setattr("config.settings.warm_logs", True)
+
+    await warm_head(chain_id=43114, block_number=205)
+    await warm_head(chain_id=43114, block_number=207)
+
+    assert ranges == [(200, 205), (206, 207)]
+
+    async def fail_get_logs(*_, **__):
+        raise AssertionError("served from cache")
+
+    monkeypatch.setattr("api.logs.get_logs_by_block_period", fail_get_logs)
+
+    response = await async_client.get("/logs/?from_block=200")
+    assert response.status_code == 200
+    assert response.json() == {"logs": []}
+
+
+@pytest.mark.asyncio
+async def test_slow_listener_does_not_block_head_updates(monkeypatch):
+    release = asyncio.Event()
+    seen: list[int] = []
+
+    async def slow_listener(chain_id, block_number):
+        seen.append(block_number)
+        await release.wait()
+
+    monkeypatch.setattr("core.block.head._heads", {})
+    monkeypatch.setattr("core.block.head._head_updated", {})
+    monkeypatch.setattr("core.block.head._listeners", [slow_listener])
+
+    for block_number in (1, 2, 3):
+        notify_new_head(chain_id=43114, block_number=block_number)
+        await asyncio.sleep(0)
+
+    release.set()
+    while task := head._notifying.get(43114):
+        await task
+
+    assert seen == [1, 3]  # heads 2 and 3 coalesced into one run
+
+
+def test_warm_logs_bucket_must_fit_block_range():
+    with pytest.raises(ValidationError, match="warm_logs_bucket_size"):
+        Settings(max_block_range=100, warm_logs_bucket_size=500)
+
+    assert Settings(max_block_range=100, warm_logs_bucket_size=100)